@@ -0,0 +1,193 @@
+"""Benchmarks de los caminos críticos de simulación, análisis y gráficos.
+
+Uso:
+    python benchmark.py                                  # 10^3..10^8 lanzamientos
+    python benchmark.py --exponentes 3 4 5 --salida base.json
+    python benchmark.py --comparar base.json --tolerancia 0.2
+
+Cada medición guarda segundos, lanzamientos/s y pico de memoria (tracemalloc,
+que también registra los arreglos de numpy). Los tiempos se toman sin
+tracemalloc, que ralentiza varias veces el código con muchas asignaciones; el
+pico se mide en una pasada aparte. Cada operación se repite hasta sumar al
+menos TIEMPO_MINIMO segundos (y --repeticiones intentos) y se guarda el mejor
+intento. Con --comparar se marca como regresión toda operación cuyo
+rendimiento caiga más de la tolerancia respecto a la línea base y que además
+tarde más de --minimo-absoluto segundos extra (por debajo de un milisegundo
+el ruido del reloj domina), y el proceso termina con código 1.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+
+from dice_simulator import DiceSimulator
+
+
+# Operaciones en Python puro o de dibujo: por encima de este tamaño no se miden
+LIMITE_LENTO = 10 ** 6
+# Tiempo total mínimo que se cronometra cada operación: las de microsegundos se repiten más
+TIEMPO_MINIMO = 0.2
+# Diferencia absoluta por debajo de la cual un cambio no cuenta como regresión
+MINIMO_ABSOLUTO = 1e-3
+
+
+def medir(funcion, repeticiones: int = 1):
+    """(segundos del mejor intento, pico de memoria en bytes)
+
+    Se hacen al menos `repeticiones` intentos y se sigue hasta sumar
+    TIEMPO_MINIMO segundos. Los intentos cronometrados corren sin
+    tracemalloc; el pico de memoria sale de una pasada adicional con
+    tracemalloc activo.
+    """
+    mejor = float('inf')
+    intentos = 0
+    total = 0.0
+    while intentos < repeticiones or total < TIEMPO_MINIMO:
+        inicio = time.perf_counter()
+        funcion()
+        segundos = time.perf_counter() - inicio
+        mejor = min(mejor, segundos)
+        total += segundos
+        intentos += 1
+    tracemalloc.start()
+    try:
+        funcion()
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return mejor, pico
+
+
+def _graph_manager_agg():
+    """GraphManager dibujando sobre un lienzo Agg, sin ventana de Tk."""
+    from graph_manager import GraphManager
+    # Los colores solo se usan en los widgets de Tk
+    return GraphManager(None, {})
+
+
+def _redibujar_completo(gm, simulador):
+    gm.clear_all_graphs()
+    gm.update_graphs(simulador)
+
+
+def _redibujar_incremental(gm, simulador):
+    # Olvida las firmas para forzar el refresco, pero conserva barras y etiquetas
+    gm.firmas.clear()
+    gm.update_graphs(simulador)
+
+
+def ejecutar(exponentes, num_dados: int, repeticiones: int):
+    resultados = []
+
+    def registrar(operacion, lanzamientos, funcion):
+        segundos, pico = medir(funcion, repeticiones)
+        resultados.append({
+            'operacion': operacion,
+            'lanzamientos': lanzamientos,
+            'segundos': segundos,
+            'lanzamientos_por_segundo': lanzamientos / segundos if segundos > 0 else float('inf'),
+            'pico_memoria_bytes': pico,
+        })
+        print(f"{operacion:<40} {lanzamientos:>12,} {segundos:>10.4f} s "
+              f"{resultados[-1]['lanzamientos_por_segundo']:>16,.0f} lanz/s {pico / 2**20:>10.1f} MiB")
+
+    for exponente in exponentes:
+        n = 10 ** exponente
+        simulador = DiceSimulator()
+        simulador.establecer_semilla(12345)
+
+        def simular():
+            simulador.limpiar_resultados()
+            simulador.simular_dados_vectorizado(n, num_dados)
+
+        registrar('simular_dados_vectorizado', n, simular)
+        # Las demás configuraciones también necesitan datos para analizar_* y los gráficos
+        for otros in (1, 2, 3):
+            if otros != num_dados:
+                simulador.simular_dados_vectorizado(n, otros)
+
+        if n <= LIMITE_LENTO:
+            registrar('simular_dados', n, lambda: DiceSimulator().simular_dados(n, num_dados))
+            lista = simulador.version(num_dados).valores.tolist()
+            registrar('calcular_estadisticas_avanzadas', n, lambda: simulador.calcular_estadisticas_avanzadas(lista))
+
+        registrar('analizar_un_dado', n, simulador.analizar_un_dado)
+        registrar('analizar_dos_dados', n, simulador.analizar_dos_dados)
+        registrar('analizar_tres_dados', n, simulador.analizar_tres_dados)
+        registrar('DiceSimulator.analisis', n, simulador.analisis)
+        # Lo que actualizar_tablas_mejoradas recibe ya formateado (insertar en el Treeview es Tk puro)
+        registrar('filas_tablas', n, lambda: simulador.filas_tablas(num_dados))
+        gm = _graph_manager_agg()
+        registrar('GraphManager.update_graphs', n, lambda: _redibujar_completo(gm, simulador))
+        registrar('GraphManager.update_graphs incremental', n, lambda: _redibujar_incremental(gm, simulador))
+
+    return resultados
+
+
+def comparar(actuales, base, tolerancia: float, minimo_absoluto: float = MINIMO_ABSOLUTO):
+    """Lista de regresiones: operaciones más lentas que la base por encima de la tolerancia.
+
+    Un cambio relativo grande en una operación de microsegundos es ruido: solo
+    cuenta si además tarda más de `minimo_absoluto` segundos que la base.
+    """
+    referencia = {(r['operacion'], r['lanzamientos']): r for r in base['resultados']}
+    regresiones = []
+    for r in actuales:
+        anterior = referencia.get((r['operacion'], r['lanzamientos']))
+        if anterior is None:
+            continue
+        cambio = r['lanzamientos_por_segundo'] / anterior['lanzamientos_por_segundo'] - 1
+        if cambio < -tolerancia and r['segundos'] - anterior['segundos'] > minimo_absoluto:
+            regresiones.append({**r, 'cambio_rendimiento': cambio})
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del simulador de dados")
+    parser.add_argument('--exponentes', type=int, nargs='+', default=list(range(3, 9)),
+                        help="tamaños como potencias de 10 (por defecto 3..8)")
+    parser.add_argument('--dados', type=int, default=3, choices=[1, 2, 3])
+    parser.add_argument('--repeticiones', type=int, default=3,
+                        help=f"intentos mínimos (y al menos {TIEMPO_MINIMO} s en total); se guarda el mejor")
+    parser.add_argument('--salida', default='benchmark_resultados.json')
+    parser.add_argument('--comparar', metavar='BASE', help="JSON de una ejecución anterior")
+    parser.add_argument('--tolerancia', type=float, default=0.2,
+                        help="caída relativa de rendimiento tolerada (0.2 = 20%%)")
+    parser.add_argument('--minimo-absoluto', type=float, default=MINIMO_ABSOLUTO,
+                        help="segundos extra por debajo de los cuales no hay regresión (por defecto 0.001)")
+    args = parser.parse_args(argv)
+
+    resultados = ejecutar(args.exponentes, args.dados, args.repeticiones)
+    informe = {
+        'timestamp': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'dados': args.dados,
+        'resultados': resultados,
+    }
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(informe, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            base = json.load(f)
+        regresiones = comparar(resultados, base, args.tolerancia, args.minimo_absoluto)
+        for r in regresiones:
+            print(f"REGRESIÓN {r['operacion']} ({r['lanzamientos']:,}): {r['cambio_rendimiento']:+.1%}")
+        if regresiones:
+            return 1
+        print("Sin regresiones respecto a la línea base.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
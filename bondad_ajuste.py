@@ -0,0 +1,215 @@
+from math import lgamma
+from typing import Dict
+
+import numpy as np
+
+
+# Frecuencia esperada mínima por categoría en chi-cuadrado y G: las categorías
+# contiguas con menos se agrupan para que la aproximación chi-cuadrado valga
+MINIMO_ESPERADO = 5.0
+# Nivel de significación con el que se informa de los rechazos
+NIVEL_SIGNIFICACION = 0.05
+PRUEBAS = ('chi_cuadrado', 'g', 'ks')
+# Tolerancia relativa de la serie y la fracción continua (unos pocos eps: pedir eps exacto puede no cumplirse nunca)
+_TOLERANCIA = 1e-15
+_MINIMO_FLOTANTE = np.finfo(np.float64).tiny / np.finfo(np.float64).eps
+_MAXIMO_ITERACIONES = 100000
+
+
+def _gamma_superior_regularizada(a: float, x: np.ndarray) -> np.ndarray:
+    """Q(a, x) = Γ(a, x) / Γ(a) para un `a` fijo y un arreglo de x, sin scipy.
+
+    Serie de la gamma inferior para x < a + 1 y fracción continua de Lentz
+    para el resto (Numerical Recipes, gammq); todos los elementos avanzan a
+    la vez y cada uno deja de cambiar al converger.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    resultado = np.where(np.isinf(x), 0.0, 1.0)
+    positivos = (x > 0) & np.isfinite(x)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        prefactor = np.exp(-x + a * np.log(x) - lgamma(a))
+
+    serie = positivos & (x < a + 1)
+    if serie.any():
+        xs = x[serie]
+        termino = np.full_like(xs, 1.0 / a)
+        suma = termino.copy()
+        for n in range(1, _MAXIMO_ITERACIONES):
+            termino *= xs / (a + n)
+            suma += termino
+            if np.all(np.abs(termino) < np.abs(suma) * _TOLERANCIA):
+                break
+        resultado[serie] = 1.0 - suma * prefactor[serie]
+
+    fraccion = positivos & ~serie
+    if fraccion.any():
+        xf = x[fraccion]
+        b = xf + 1.0 - a
+        c = np.full_like(xf, 1.0 / _MINIMO_FLOTANTE)
+        d = 1.0 / b
+        h = d.copy()
+        for i in range(1, _MAXIMO_ITERACIONES):
+            an = -i * (i - a)
+            b += 2.0
+            d = an * d + b
+            d[np.abs(d) < _MINIMO_FLOTANTE] = _MINIMO_FLOTANTE
+            c = b + an / c
+            c[np.abs(c) < _MINIMO_FLOTANTE] = _MINIMO_FLOTANTE
+            d = 1.0 / d
+            delta = d * c
+            h *= delta
+            if np.all(np.abs(delta - 1.0) < _TOLERANCIA):
+                break
+        resultado[fraccion] = prefactor[fraccion] * h
+    return np.clip(resultado, 0.0, 1.0)
+
+
+def probabilidad_chi_cuadrado(estadistico: np.ndarray, grados_libertad: int) -> np.ndarray:
+    """P(χ² con `grados_libertad` ≥ estadístico): el p-valor de chi-cuadrado y de G."""
+    estadistico = np.asarray(estadistico, dtype=np.float64)
+    if grados_libertad <= 0:
+        return np.where(estadistico > 0, 0.0, 1.0)
+    return _gamma_superior_regularizada(grados_libertad / 2, estadistico / 2)
+
+
+def probabilidad_kolmogorov(lam: np.ndarray) -> np.ndarray:
+    """P(K ≥ λ) de la distribución de Kolmogorov: 2 Σ (-1)^(k-1) exp(-2 k² λ²).
+
+    Por debajo de λ = 0.2 la serie converge mal y el valor es 1 en doble precisión.
+    """
+    lam = np.asarray(lam, dtype=np.float64)
+    k = np.arange(1, 101)
+    signos = np.where(k % 2, 1.0, -1.0)
+    with np.errstate(over='ignore'):
+        serie = 2 * (signos * np.exp(-2 * np.multiply.outer(lam ** 2, k ** 2))).sum(axis=-1)
+    return np.where(lam < 0.2, 1.0, np.clip(serie, 0.0, 1.0))
+
+
+def _inicios_grupos(esperados: np.ndarray) -> np.ndarray:
+    """Primera categoría de cada grupo de categorías contiguas con al menos MINIMO_ESPERADO esperados.
+
+    Lo que sobra al final se une al último grupo; O(categorías).
+    """
+    inicios = [0]
+    acumulado = 0.0
+    for i, esperado in enumerate(esperados):
+        if acumulado >= MINIMO_ESPERADO:
+            inicios.append(i)
+            acumulado = 0.0
+        acumulado += esperado
+    if acumulado < MINIMO_ESPERADO and len(inicios) > 1:
+        inicios.pop()
+    return np.array(inicios, dtype=np.intp)
+
+
+def pruebas_bondad_lote(conteos, probabilidades) -> Dict[str, np.ndarray]:
+    """Chi-cuadrado, G y Kolmogorov-Smirnov de muchas réplicas en una sola llamada vectorizada.
+
+    `conteos` es una matriz (réplicas x categorías) o un histograma, con el
+    mismo índice que `probabilidades` (las categorías van en orden, como
+    caras o número de seises, para que KS tenga sentido). Todo se calcula
+    desde los conteos, en O(categorías) por réplica:
+      - chi-cuadrado Σ (O - E)² / E y G = 2 Σ O ln(O / E), agrupando categorías
+        contiguas hasta MINIMO_ESPERADO esperados, con p-valor χ²;
+      - KS: máxima diferencia entre las funciones de distribución acumuladas,
+        con p-valor de Kolmogorov (conservador en distribuciones discretas:
+        rechaza menos de lo que indica el nivel).
+    Observar una categoría de probabilidad 0 da estadísticos infinitos y p-valor 0.
+    """
+    conteos = np.atleast_2d(np.asarray(conteos, dtype=np.float64))
+    probabilidades = np.asarray(probabilidades, dtype=np.float64)
+    if conteos.shape[1] != len(probabilidades):
+        raise ValueError(f"Hay {conteos.shape[1]} categorías en los conteos y {len(probabilidades)} probabilidades")
+    probabilidades = probabilidades / probabilidades.sum()
+    totales = conteos.sum(axis=1)
+    if np.any(totales <= 0):
+        raise ValueError("Cada réplica necesita al menos un lanzamiento")
+
+    posibles = probabilidades > 0
+    imposibles = conteos[:, ~posibles].sum(axis=1) > 0
+    # La agrupación depende solo de los esperados: la misma para todas las réplicas (la del menor total)
+    inicios = _inicios_grupos(probabilidades[posibles] * totales.min())
+    observados = np.add.reduceat(conteos[:, posibles], inicios, axis=1)
+    esperados = np.multiply.outer(totales, np.add.reduceat(probabilidades[posibles], inicios))
+    grados_libertad = len(inicios) - 1
+
+    chi = ((observados - esperados) ** 2 / esperados).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        g = 2 * np.where(observados > 0, observados * np.log(observados / esperados), 0.0).sum(axis=1)
+    g = np.maximum(g, 0.0)
+    chi[imposibles] = np.inf
+    g[imposibles] = np.inf
+
+    acumulada = np.cumsum(conteos, axis=1) / totales[:, None]
+    ks = np.abs(acumulada - np.cumsum(probabilidades)).max(axis=1)
+    # Corrección de Stephens para muestras finitas
+    raiz = np.sqrt(totales)
+    p_ks = probabilidad_kolmogorov((raiz + 0.12 + 0.11 / raiz) * ks)
+    p_ks[imposibles] = 0.0
+
+    return {
+        'lanzamientos': totales.astype(np.int64),
+        'categorias': len(inicios),
+        'grados_libertad': grados_libertad,
+        'chi_cuadrado': chi,
+        'p_chi_cuadrado': probabilidad_chi_cuadrado(chi, grados_libertad),
+        'g': g,
+        'p_g': probabilidad_chi_cuadrado(g, grados_libertad),
+        'ks': ks,
+        'p_ks': p_ks,
+    }
+
+
+def pruebas_bondad(conteos, probabilidades) -> Dict[str, float]:
+    """pruebas_bondad_lote para un solo histograma, con valores escalares."""
+    lote = pruebas_bondad_lote(np.asarray(conteos)[None, :], probabilidades)
+    return {clave: valor[0].item() if isinstance(valor, np.ndarray) else valor for clave, valor in lote.items()}
+
+
+def resumen_replicas(lote: Dict[str, np.ndarray], nivel: float = NIVEL_SIGNIFICACION) -> Dict[str, Dict[str, float]]:
+    """Proporción de réplicas rechazadas al `nivel` y p-valor medio de cada prueba.
+
+    Si los dados siguen la distribución teórica, los p-valores de chi-cuadrado
+    y G son aproximadamente uniformes y se rechaza cerca de un `nivel` de las réplicas.
+    """
+    return {
+        prueba: {
+            'rechazos': float(np.mean(lote[f'p_{prueba}'] < nivel)),
+            'p_medio': float(np.mean(lote[f'p_{prueba}'])),
+        }
+        for prueba in PRUEBAS
+    }
+
+
+def texto_bondad(resultado: Dict[str, float], etiqueta: str, nivel: float = NIVEL_SIGNIFICACION) -> str:
+    """Bloque del informe de análisis con el resultado de pruebas_bondad."""
+    def veredicto(p):
+        return "se rechaza el ajuste" if p < nivel else "compatible con la teoría"
+
+    texto = f" BONDAD DE AJUSTE - {etiqueta} ({resultado['lanzamientos']:,} lanzamientos)\n"
+    texto += "─" * 50 + "\n"
+    texto += (f"   Chi-cuadrado: {resultado['chi_cuadrado']:10.3f} | gl {resultado['grados_libertad']:>3} | "
+              f"p = {resultado['p_chi_cuadrado']:.4f} ({veredicto(resultado['p_chi_cuadrado'])})\n")
+    texto += (f"   Prueba G:     {resultado['g']:10.3f} | gl {resultado['grados_libertad']:>3} | "
+              f"p = {resultado['p_g']:.4f} ({veredicto(resultado['p_g'])})\n")
+    texto += (f"   KS (D máx.):  {resultado['ks']:10.5f} |        | "
+              f"p = {resultado['p_ks']:.4f} ({veredicto(resultado['p_ks'])})\n")
+    texto += f"   Nivel de significación: {nivel:.0%}\n"
+    texto += "\n"
+    return texto
+
+
+def texto_replicas(resumen: Dict, nivel: float = NIVEL_SIGNIFICACION) -> str:
+    """Bloque del informe con el resumen de las pruebas sobre réplicas independientes."""
+    texto = (f" BONDAD DE AJUSTE EN RÉPLICAS - {resumen['dados']} "
+             f"({resumen['replicas']:,} réplicas de {resumen['lanzamientos']:,} lanzamientos)\n")
+    texto += "─" * 50 + "\n"
+    nombres = {'chi_cuadrado': 'Chi-cuadrado', 'g': 'Prueba G', 'ks': 'KS'}
+    for prueba in PRUEBAS:
+        datos = resumen['pruebas'][prueba]
+        # KS es conservadora con distribuciones discretas: rechaza menos que el nivel
+        esperado = f"≤ {nivel:.0%}" if prueba == 'ks' else f"≈ {nivel:.0%}"
+        texto += (f"   {nombres[prueba] + ':':<13} rechazadas {datos['rechazos']:6.2%} "
+                  f"(esperado {esperado}) | p-valor medio {datos['p_medio']:.3f}\n")
+    texto += "\n"
+    return texto
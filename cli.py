@@ -0,0 +1,183 @@
+"""Ejecución por lotes del simulador desde la línea de comandos (sin Tk).
+
+Ejemplos:
+    python cli.py 1000000 --dados 3 --semilla 42
+    python cli.py 1000000000000 --dados 3 --modo agregado --formato json --salida resumen.json
+    python cli.py 100000000 --dados 2 --modo paralelo --exportar-binario sesion/
+    python cli.py 1000000 --dados 3d20 2d6:1,1,1,1,1,3 --modo agregado
+    python cli.py 1000000 --dados 10 --evento-raro 10 --error-relativo 0.01
+    python cli.py 100000 --dados 3 --modo vectorizado --muestreo estratificado_caras
+    python cli.py 1000 --dados 1 3 --replicas-bondad 10000
+
+matplotlib solo se importa si se pide --grafico.
+"""
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+from dice_simulator import DiceSimulator
+from especificacion import EspecificacionDados
+from generadores import GENERADORES_BITS, GENERADOR_POR_DEFECTO
+from reduccion_varianza import MUESTREOS
+
+
+MODOS = ('bloques', 'vectorizado', 'agregado', 'paralelo')
+
+
+def simular(simulador: DiceSimulator, lanzamientos: int, dados, modo: str, procesos=None,
+            muestreo: str = 'simple') -> bool:
+    if modo == 'bloques':
+        return simulador.simular_por_bloques(lanzamientos, dados, muestreo=muestreo) == lanzamientos
+    if modo == 'vectorizado':
+        return simulador.simular_dados_vectorizado(lanzamientos, dados, muestreo)
+    if modo == 'agregado':
+        return simulador.simular_dados_agregado(lanzamientos, dados)
+    return simulador.simular_dados_paralelo(lanzamientos, dados, procesos=procesos)
+
+
+def resumen_texto(simulador: DiceSimulator) -> str:
+    return simulador.texto_analisis()
+
+
+def resumen_json(simulador: DiceSimulator) -> dict:
+    configuraciones = {}
+    for clave, store in simulador.almacenes.items():
+        if not store.total:
+            continue
+        configuraciones[clave] = {
+            'total_lanzamientos': store.total,
+            'conteo_valores': store.estadisticas.conteos.tolist(),
+            'conteo_caras': store.conteo_caras()[1:].tolist(),
+            'conteo_seises': store.conteo_seises().tolist(),
+            'conteo_sumas': store.conteo_sumas().tolist(),
+            'estadisticas': store.estadisticas.resumen(),
+            'dados': str(store.especificacion),
+            'probabilidades_teoricas': simulador.calcular_probabilidades_teoricas(store.especificacion),
+            'bondad_ajuste': simulador.bondad_ajuste(store.especificacion),
+        }
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'semilla': simulador.semilla_random,
+        'generador': simulador.generador_bits,
+        'configuraciones': configuraciones,
+        'eventos_raros': simulador.eventos_raros,
+        'reducciones_varianza': simulador.reducciones_varianza,
+        'replicas_bondad': simulador.replicas_bondad,
+        'historial_simulaciones': simulador.historial_simulaciones,
+    }
+
+
+def guardar_grafico(simulador: DiceSimulator, ruta: str):
+    """Frecuencias experimentales frente a las esperadas, una gráfica por configuración."""
+    from matplotlib.figure import Figure
+
+    claves = [clave for clave, store in simulador.almacenes.items() if store.total]
+    fig = Figure(figsize=(5 * max(len(claves), 1), 4))
+    for i, clave in enumerate(claves, start=1):
+        ax = fig.add_subplot(1, len(claves), i)
+        store = simulador.almacenes[clave]
+        conteos = store.estadisticas.conteos
+        teoricas = simulador.calcular_probabilidades_teoricas(store.especificacion)
+        if store.num_dados == 1:
+            valores = list(range(1, store.num_caras + 1))
+            esperados = [teoricas[f"sacar_{v}"] * store.total for v in valores]
+            ax.set_xlabel('Resultado del dado')
+        else:
+            valores = list(range(store.num_dados + 1))
+            esperados = [teoricas[f"{v}_seises"] * store.total for v in valores]
+            ax.set_xlabel(f'Numero de {store.num_caras} por lanzamiento')
+        ax.bar([v - 0.2 for v in valores], [int(conteos[v]) for v in valores], 0.4, label='Experimental')
+        ax.bar([v + 0.2 for v in valores], esperados, 0.4, label='Teorica')
+        ax.set_title(f"{store.especificacion} - {store.total:,} lanzamientos")
+        if len(valores) <= 20:
+            ax.set_xticks(valores)
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(ruta)
+
+
+def ruta_por_configuracion(ruta: str, especificacion: EspecificacionDados, varias: bool) -> str:
+    """Con varias configuraciones, 'conv.csv' pasa a 'conv_3_dados.csv' o 'conv_3d20_dados.csv' ({dados} también vale)."""
+    if '{dados}' in ruta:
+        return ruta.format(dados=especificacion.clave)
+    if not varias:
+        return ruta
+    base, extension = os.path.splitext(ruta)
+    return f"{base}_{especificacion.clave}_dados{extension}"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Simulador de dados por lotes (sin interfaz gráfica)")
+    parser.add_argument('lanzamientos', type=int)
+    parser.add_argument('--dados', type=EspecificacionDados.desde_texto, nargs='+', default=['3'],
+                        help="configuraciones a simular: N, NdC o NdC:pesos (se pueden dar varias)")
+    parser.add_argument('--semilla', type=int)
+    parser.add_argument('--generador', default=GENERADOR_POR_DEFECTO, choices=list(GENERADORES_BITS))
+    parser.add_argument('--modo', default='bloques', choices=MODOS,
+                        help="bloques (por defecto), vectorizado, agregado (solo conteos) o paralelo")
+    parser.add_argument('--procesos', type=int, help="procesos para --modo paralelo")
+    parser.add_argument('--muestreo', default='simple', choices=MUESTREOS,
+                        help="reducción de varianza para --modo bloques o vectorizado")
+    parser.add_argument('--directorio', help="guardar los lanzamientos en un almacén en disco")
+    parser.add_argument('--formato', default='texto', choices=['texto', 'json'])
+    parser.add_argument('--salida', help="archivo para el análisis (por defecto, la salida estándar)")
+    parser.add_argument('--exportar-binario', metavar='RUTA', help="exportación completa de la sesión")
+    parser.add_argument('--comprimir', action='store_true', help="exportación binaria como .npz comprimido")
+    parser.add_argument('--exportar-json', metavar='RUTA', help="resumen JSON (últimos 1000 resultados)")
+    parser.add_argument('--grafico', metavar='RUTA', help="guardar una gráfica PNG/PDF/SVG")
+    parser.add_argument('--exportar-convergencia', metavar='RUTA',
+                        help="CSV con la proporción acumulada de cada valor en puntos logarítmicos")
+    parser.add_argument('--evento-raro', type=int, metavar='K',
+                        help="estimar P(al menos K seises) por muestreo por importancia en cada configuración")
+    parser.add_argument('--error-relativo', type=float, default=0.01,
+                        help="error relativo objetivo de --evento-raro (hasta 'lanzamientos' como máximo)")
+    parser.add_argument('--replicas-bondad', type=int, metavar='R',
+                        help="pruebas de bondad de ajuste sobre R réplicas de 'lanzamientos' en cada configuración")
+    args = parser.parse_args(argv)
+
+    if args.lanzamientos <= 0:
+        parser.error("el número de lanzamientos debe ser positivo")
+    if args.muestreo != 'simple' and args.modo not in ('bloques', 'vectorizado'):
+        parser.error("--muestreo solo se aplica a --modo bloques o vectorizado")
+
+    simulador = DiceSimulator(args.generador, directorio=args.directorio)
+    simulador.establecer_semilla(args.semilla)
+    for especificacion in args.dados:
+        if not simular(simulador, args.lanzamientos, especificacion, args.modo, args.procesos, args.muestreo):
+            print(f"Error simulando {especificacion}", file=sys.stderr)
+            return 1
+        if args.evento_raro is not None and simulador.estimar_evento_raro(
+                args.evento_raro, especificacion, args.lanzamientos, args.error_relativo) is None:
+            return 1
+        if args.replicas_bondad and simulador.bondad_ajuste_replicas(
+                args.lanzamientos, especificacion, args.replicas_bondad) is None:
+            return 1
+
+    if args.formato == 'json':
+        salida = json.dumps(resumen_json(simulador), indent=2, ensure_ascii=False, default=str)
+    else:
+        salida = resumen_texto(simulador)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.write(salida)
+    else:
+        print(salida)
+
+    ok = True
+    if args.exportar_binario:
+        ok &= simulador.exportar_resultados_binario(args.exportar_binario, args.comprimir)
+    if args.exportar_json:
+        ok &= simulador.exportar_resultados(args.exportar_json)
+    if args.exportar_convergencia:
+        for especificacion in args.dados:
+            ruta = ruta_por_configuracion(args.exportar_convergencia, especificacion, len(args.dados) > 1)
+            ok &= simulador.exportar_convergencia(ruta, especificacion)
+    if args.grafico:
+        guardar_grafico(simulador, args.grafico)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+from typing import Iterable, Tuple, Union
+
+import numpy as np
+
+
+# Puntos de muestreo por década: 10^9 lanzamientos quedan en unos 1.500 puntos
+PUNTOS_POR_DECADA = 200
+# Lanzamientos procesados de una vez: acota la memoria temporal con lotes grandes
+TAMANO_TROZO = 1 << 20
+
+
+def rejilla_logaritmica(hasta: int, puntos_por_decada: int = PUNTOS_POR_DECADA) -> np.ndarray:
+    """Números de lanzamiento 1..hasta espaciados logarítmicamente (sin repetidos)."""
+    if hasta < 1:
+        return np.zeros(0, dtype=np.int64)
+    exponentes = np.arange(int(np.ceil(np.log10(hasta) * puntos_por_decada)) + 1) / puntos_por_decada
+    puntos = np.unique(np.floor(10.0 ** exponentes).astype(np.int64))
+    return puntos[puntos <= hasta]
+
+
+def valores_evento(num_dados: int, caras: int = 6) -> Tuple[int, ...]:
+    """Evento mostrado por defecto: sacar la cara más alta con 1 dado, al menos una con más."""
+    return (caras,) if num_dados == 1 else tuple(range(1, num_dados + 1))
+
+
+def proporcion(lanzamientos: np.ndarray, conteos: np.ndarray,
+               valores: Union[int, Iterable[int]]) -> np.ndarray:
+    """Proporción acumulada del evento `valores` (uno o varios valores) en cada punto."""
+    columnas = [valores] if isinstance(valores, (int, np.integer)) else list(valores)
+    return conteos[:, columnas].sum(axis=1) / np.maximum(lanzamientos, 1)
+
+
+class TrayectoriaConvergencia:
+    """Conteos acumulados por valor en puntos espaciados logarítmicamente.
+
+    Con cada bloque de lanzamientos se guarda, para los puntos de la rejilla
+    que caen dentro del bloque, cuántas veces salió cada valor hasta ese
+    lanzamiento: un único np.bincount por bloque, sin recorrer lanzamientos
+    en Python. La proporción de cualquier valor o evento (unión de valores)
+    frente al número de lanzamientos sale de esos conteos.
+
+    Los arreglos se reemplazan al agregar, nunca se modifican en el sitio, así
+    que una copia superficial (copy.copy) sirve de instantánea.
+    """
+
+    def __init__(self, num_valores: int, puntos_por_decada: int = PUNTOS_POR_DECADA):
+        self.num_valores = num_valores
+        self.puntos_por_decada = puntos_por_decada
+        self.lanzamientos = np.zeros(0, dtype=np.int64)
+        self.conteos = np.zeros((0, num_valores), dtype=np.int64)
+        # Conteos acumulados hasta el último lanzamiento agregado
+        self.acumulado = np.zeros(num_valores, dtype=np.int64)
+        self.total = 0
+
+    def agregar(self, valores: np.ndarray):
+        """Suma un bloque de valores observados, en el orden en que se lanzaron."""
+        valores = np.asarray(valores).ravel()
+        for inicio in range(0, len(valores), TAMANO_TROZO):
+            self._agregar_trozo(valores[inicio:inicio + TAMANO_TROZO])
+
+    def _agregar_trozo(self, valores: np.ndarray):
+        m = len(valores)
+        rejilla = rejilla_logaritmica(self.total + m, self.puntos_por_decada)
+        # Posición (1..m) dentro del bloque de los puntos de muestreo que caen en él
+        puntos = rejilla[rejilla > self.total] - self.total
+        # Segmento de cada lanzamiento: los que van hasta cada punto, y un último resto
+        segmento = np.repeat(np.arange(len(puntos) + 1), np.diff(np.concatenate(([0], puntos, [m]))))
+        por_segmento = np.bincount(segmento * self.num_valores + valores,
+                                   minlength=(len(puntos) + 1) * self.num_valores)
+        acumulados = self.acumulado + np.cumsum(por_segmento.reshape(-1, self.num_valores), axis=0)
+        self._guardar_puntos(puntos + self.total, acumulados[:-1])
+        self.acumulado = acumulados[-1]
+        self.total += m
+
+    def agregar_conteos(self, conteos: np.ndarray):
+        """Suma un histograma sin orden (simulación agregada): solo se conoce el punto final."""
+        conteos = np.asarray(conteos, dtype=np.int64)
+        if conteos.sum() == 0:
+            return
+        self.acumulado = self.acumulado + conteos[:self.num_valores]
+        self.total += int(conteos.sum())
+        self._guardar_puntos(np.array([self.total]), self.acumulado[None, :])
+
+    def _guardar_puntos(self, lanzamientos: np.ndarray, conteos: np.ndarray):
+        if len(lanzamientos):
+            self.lanzamientos = np.concatenate((self.lanzamientos, lanzamientos))
+            self.conteos = np.concatenate((self.conteos, conteos))
+
+    def curva(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(lanzamientos, conteos acumulados) de los puntos guardados, hasta el último lanzamiento."""
+        if self.total and (not len(self.lanzamientos) or self.lanzamientos[-1] != self.total):
+            return (np.append(self.lanzamientos, self.total),
+                    np.concatenate((self.conteos, self.acumulado[None, :])))
+        return self.lanzamientos.copy(), self.conteos.copy()
+
+    def restaurar(self, lanzamientos: np.ndarray, conteos: np.ndarray, acumulado: np.ndarray):
+        self.lanzamientos = np.asarray(lanzamientos, dtype=np.int64).copy()
+        self.conteos = np.asarray(conteos, dtype=np.int64).reshape(-1, self.num_valores).copy()
+        self.acumulado = np.asarray(acumulado, dtype=np.int64).copy()
+        self.total = int(self.acumulado.sum())
+
+    def limpiar(self):
+        self.lanzamientos = np.zeros(0, dtype=np.int64)
+        self.conteos = np.zeros((0, self.num_valores), dtype=np.int64)
+        self.acumulado = np.zeros(self.num_valores, dtype=np.int64)
+        self.total = 0
@@ -0,0 +1,269 @@
+import itertools
+import tkinter as tk
+from tkinter import ttk
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+# Operadores del filtro por número de seises
+OPERADORES = {'=': np.equal, '>=': np.greater_equal, '<=': np.less_equal}
+# Filas que existen en la tabla: solo las visibles, se rellenan al desplazarse
+FILAS_VISIBLES = 25
+
+
+class VistaLanzamientos:
+    """Lanzamientos guardados de un ResultStore o VersionAlmacen, filtrados y leídos por páginas.
+
+    El filtro (número de seises y/o una cara presente) se evalúa con máscaras
+    de numpy bloque a bloque y solo se guarda cuántas filas coinciden en cada
+    bloque; una página vuelve a calcular la máscara de los bloques que toca.
+    La memoria no depende del número de lanzamientos ni de coincidencias. La
+    longitud se fija al crear la vista, así que los lanzamientos que se
+    agreguen después no la alteran.
+
+    Con diferida=True el recuento se hace por partes con avanzar(), para
+    repartirlo entre varias llamadas de after() sin bloquear la interfaz;
+    la vista se puede usar cuando `lista` es True.
+    """
+
+    def __init__(self, store, seises: Optional[Tuple[str, int]] = None, cara: Optional[int] = None,
+                 diferida: bool = False):
+        self.store = store
+        self.seises = seises
+        self.cara = cara
+        self.lanzamientos = len(store)
+        self._acumulado = None
+        self._conteos = []
+        self._procesados = 0
+        self._pendientes = self._bloques()
+        if self.filtrada and not diferida:
+            self.avanzar(None)
+
+    @property
+    def filtrada(self) -> bool:
+        return self.seises is not None or self.cara is not None
+
+    @property
+    def lista(self) -> bool:
+        return not self.filtrada or self._acumulado is not None
+
+    @property
+    def progreso(self) -> float:
+        """Fracción de los lanzamientos ya recorridos por el filtro."""
+        return 1.0 if self.lista else self._procesados / self.lanzamientos
+
+    def avanzar(self, bloques: Optional[int] = 1) -> bool:
+        """Cuenta las coincidencias de los siguientes `bloques` (todos con None); True si la vista está lista."""
+        if self.lista:
+            return True
+        for _, caras, seises in itertools.islice(self._pendientes, bloques):
+            self._conteos.append(np.count_nonzero(self._mascara(caras, seises)))
+            self._procesados += len(seises)
+        if self._procesados >= self.lanzamientos:
+            # _acumulado[b] = coincidencias antes del bloque b
+            self._acumulado = np.concatenate(([0], np.cumsum(self._conteos, dtype=np.int64)))
+        return self.lista
+
+    def __len__(self) -> int:
+        return int(self._acumulado[-1]) if self.filtrada else self.lanzamientos
+
+    def _mascara(self, caras: np.ndarray, seises: np.ndarray) -> np.ndarray:
+        mascara = np.ones(len(seises), dtype=bool)
+        if self.seises is not None:
+            operador, valor = self.seises
+            mascara &= OPERADORES[operador](seises, valor)
+        if self.cara is not None:
+            mascara &= (caras == self.cara).any(axis=1)
+        return mascara
+
+    def _bloques(self):
+        """(primer índice, caras, seises) de cada bloque, hasta la longitud de la vista."""
+        inicio = 0
+        for caras, seises in zip(self.store.caras.iter_bloques(), self.store.seises.iter_bloques()):
+            if inicio >= self.lanzamientos:
+                break
+            n = min(len(seises), self.lanzamientos - inicio)
+            yield inicio, caras[:n], seises[:n]
+            inicio += n
+
+    def indices(self, desde: int, cuantas: int) -> np.ndarray:
+        """Índices en el almacén de las filas [desde, desde + cuantas) de la vista."""
+        desde = max(desde, 0)
+        hasta = min(desde + cuantas, len(self))
+        if desde >= hasta:
+            return np.zeros(0, dtype=np.int64)
+        if not self.filtrada:
+            return np.arange(desde, hasta)
+        primero = int(np.searchsorted(self._acumulado, desde, side='right')) - 1
+        partes = []
+        for b, (inicio, caras, seises) in enumerate(self._bloques()):
+            if b < primero:
+                continue
+            if self._acumulado[b] >= hasta:
+                break
+            coincidencias = np.flatnonzero(self._mascara(caras, seises)) + inicio
+            partes.append(coincidencias[max(desde - self._acumulado[b], 0):hasta - self._acumulado[b]])
+        return np.concatenate(partes)
+
+    def pagina(self, desde: int, cuantas: int) -> List[dict]:
+        """Filas de la vista como dicts de resultados_detallados."""
+        return [self.store.detalle(int(i)) for i in self.indices(desde, cuantas)]
+
+    def posicion(self, lanzamiento: int) -> int:
+        """Fila de la vista del lanzamiento (1..n) o, si no pasa el filtro, del siguiente que pasa."""
+        indice = min(max(lanzamiento - 1, 0), self.lanzamientos)
+        if not self.filtrada:
+            return min(indice, max(self.lanzamientos - 1, 0))
+        for b, (inicio, caras, seises) in enumerate(self._bloques()):
+            if indice < inicio + len(seises):
+                previas = np.count_nonzero(self._mascara(caras[:indice - inicio], seises[:indice - inicio]))
+                return int(self._acumulado[b] + previas)
+        return len(self)
+
+
+class TablaLanzamientos(tk.Frame):
+    """Tabla virtual de los lanzamientos guardados.
+
+    El Treeview tiene siempre FILAS_VISIBLES filas; desplazarse solo cambia
+    sus valores con la página correspondiente de VistaLanzamientos, así que
+    el coste no depende de cuántos lanzamientos haya.
+    """
+
+    def __init__(self, parent, colores):
+        super().__init__(parent, bg=colores['bg_secundario'])
+        self.colores = colores
+        self.store = None
+        self.vista = None
+        self.desde = 0
+        # after() del filtro que se está calculando por partes
+        self._trabajo_filtro = None
+        self._crear_controles()
+        self._crear_tabla()
+
+    def _crear_controles(self):
+        controles = tk.Frame(self, bg=self.colores['bg_secundario'])
+        controles.pack(fill=tk.X, padx=10, pady=5)
+        estilo = {'bg': self.colores['bg_secundario'], 'fg': 'white', 'font': ('Segoe UI', 9, 'bold')}
+
+        tk.Label(controles, text="Ir al lanzamiento:", **estilo).pack(side=tk.LEFT, padx=(0, 5))
+        self.entry_ir = tk.Entry(controles, width=14)
+        self.entry_ir.pack(side=tk.LEFT)
+        self.entry_ir.bind('<Return>', lambda e: self.ir_a_lanzamiento())
+        tk.Button(controles, text="Ir", command=self.ir_a_lanzamiento).pack(side=tk.LEFT, padx=5)
+
+        tk.Label(controles, text="Seises:", **estilo).pack(side=tk.LEFT, padx=(20, 5))
+        self.combo_seises = ttk.Combobox(controles, state='readonly', width=8)
+        self.combo_seises.pack(side=tk.LEFT)
+        self.combo_seises.bind('<<ComboboxSelected>>', lambda e: self.aplicar_filtro())
+
+        tk.Label(controles, text="Con la cara:", **estilo).pack(side=tk.LEFT, padx=(20, 5))
+        self.combo_cara = ttk.Combobox(controles, values=["Cualquiera"] + list(range(1, 7)), state='readonly', width=10)
+        self.combo_cara.set("Cualquiera")
+        self.combo_cara.pack(side=tk.LEFT)
+        self.combo_cara.bind('<<ComboboxSelected>>', lambda e: self.aplicar_filtro())
+
+        self.info_var = tk.StringVar(value="Sin lanzamientos guardados")
+        tk.Label(controles, textvariable=self.info_var, **estilo).pack(side=tk.RIGHT)
+
+    def _crear_tabla(self):
+        marco = tk.Frame(self, bg=self.colores['bg_secundario'])
+        marco.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        columnas = ["Lanzamiento", "Dados", "Seises"]
+        self.tree = ttk.Treeview(marco, columns=columnas, show='headings', height=FILAS_VISIBLES)
+        for col in columnas:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, anchor=tk.CENTER, minwidth=100, width=200)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = ttk.Scrollbar(marco, orient='vertical', command=self._desplazar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Las filas se crean una vez y luego solo cambian sus valores
+        self.filas = [self.tree.insert('', tk.END, values=('', '', '')) for _ in range(FILAS_VISIBLES)]
+
+        self.tree.bind('<MouseWheel>', lambda e: self._mover(-3 if e.delta > 0 else 3))
+        self.tree.bind('<Button-4>', lambda e: self._mover(-3))
+        self.tree.bind('<Button-5>', lambda e: self._mover(3))
+        self.tree.bind('<Prior>', lambda e: self._mover(-FILAS_VISIBLES))
+        self.tree.bind('<Next>', lambda e: self._mover(FILAS_VISIBLES))
+
+    def mostrar(self, store):
+        """Mostrar los lanzamientos de `store` (mejor una VersionAlmacen) con el filtro actual."""
+        self.store = store
+        opciones = ["Todos"] + [f"{op} {k}" for k in range(store.num_dados + 1) for op in ('=', '>=')]
+        self.combo_seises.configure(values=opciones)
+        if self.combo_seises.get() not in opciones:
+            self.combo_seises.set("Todos")
+        caras = ["Cualquiera"] + [str(c) for c in range(1, store.num_caras + 1)]
+        self.combo_cara.configure(values=caras)
+        if self.combo_cara.get() not in caras:
+            self.combo_cara.set("Cualquiera")
+        self.aplicar_filtro()
+
+    def aplicar_filtro(self):
+        if self.store is None:
+            return
+        seises = None
+        if self.combo_seises.get() not in ("", "Todos"):
+            operador, valor = self.combo_seises.get().split()
+            seises = (operador, int(valor))
+        cara = None if self.combo_cara.get() == "Cualquiera" else int(self.combo_cara.get())
+        if self._trabajo_filtro is not None:
+            self.after_cancel(self._trabajo_filtro)
+            self._trabajo_filtro = None
+        # El recuento del filtro recorre todos los lanzamientos: un bloque por turno de after()
+        self._continuar_filtro(VistaLanzamientos(self.store, seises=seises, cara=cara, diferida=True))
+
+    def _continuar_filtro(self, vista):
+        if not vista.avanzar():
+            self.info_var.set(f"Filtrando... {vista.progreso:.0%}")
+            self._trabajo_filtro = self.after(1, self._continuar_filtro, vista)
+            return
+        self._trabajo_filtro = None
+        self.vista = vista
+        if self.vista.filtrada:
+            self.info_var.set(f"{len(self.vista):,} de {self.vista.lanzamientos:,} lanzamientos")
+        else:
+            self.info_var.set(f"{self.vista.lanzamientos:,} lanzamientos guardados")
+        self.desde = 0
+        self.refrescar()
+
+    def ir_a_lanzamiento(self):
+        if self.vista is None:
+            return
+        try:
+            lanzamiento = int(self.entry_ir.get().replace(',', '').replace('.', ''))
+        except ValueError:
+            return
+        self.desde = self.vista.posicion(lanzamiento)
+        self.refrescar()
+
+    def _mover(self, filas):
+        self.desde += filas
+        self.refrescar()
+        return 'break'
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        """Comando del scrollbar: 'moveto' con una fracción o 'scroll' en filas o páginas."""
+        if self.vista is None:
+            return
+        if accion == 'moveto':
+            self.desde = int(float(cantidad) * len(self.vista))
+        else:
+            self.desde += int(cantidad) * (FILAS_VISIBLES if unidad == 'pages' else 1)
+        self.refrescar()
+
+    def refrescar(self):
+        """Rellenar las filas visibles con la página actual."""
+        total = len(self.vista) if self.vista is not None else 0
+        self.desde = max(0, min(self.desde, total - FILAS_VISIBLES))
+        pagina = self.vista.pagina(self.desde, FILAS_VISIBLES) if total else []
+        for i, item in enumerate(self.filas):
+            if i < len(pagina):
+                fila = pagina[i]
+                self.tree.item(item, values=(f"{fila['lanzamiento']:,}", " ".join(map(str, fila['dados'])), fila['seises']))
+            else:
+                self.tree.item(item, values=('', '', ''))
+        if total:
+            self.scrollbar.set(self.desde / total, min(self.desde + FILAS_VISIBLES, total) / total)
+        else:
+            self.scrollbar.set(0, 1)
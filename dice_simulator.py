@@ -1,149 +1,591 @@
+import os
 import random
+import threading
 import numpy as np
 from collections import Counter
-from typing import Dict, List, Tuple, Optional
+from fractions import Fraction
+from typing import Callable, Dict, List, Tuple, Optional, Union
+import csv
 import json
 from datetime import datetime
-import matplotlib.pyplot as plt
+
+from result_store import ResultStore, DetalleLanzamientos, VersionAlmacen, TAMANO_BLOQUE
+from estadisticas import AcumuladorEstadistico
+from especificacion import EspecificacionDados, como_especificacion
+from probabilidad_exacta import distribucion_binomial, distribucion_cara, distribucion_suma_fft, prob_al_menos
+from convergencia import proporcion, valores_evento
+from eventos_raros import estimar_evento_raro, texto_evento_raro
+from bondad_ajuste import pruebas_bondad, pruebas_bondad_lote, resumen_replicas, texto_bondad, texto_replicas
+import reduccion_varianza
+from reduccion_varianza import AcumuladorReduccion, texto_reduccion
+from simulacion_paralela import TAMANO_FRAGMENTO, simular_conteos_paralelo
+import formato_binario
+from generadores import GENERADOR_POR_DEFECTO, crear_generador, estado_serializable, restaurar_generador
+
+
+# Configuración de dados: número de dados de 6 caras, texto ('3d20', '2d6:1,1,1,1,1,3') o especificación
+Dados = Union[int, str, EspecificacionDados]
+
+
+class InstantaneaResultados:
+    """Copia de los conteos agregados de un DiceSimulator en un momento dado.
+
+    Ofrece la interfaz de lectura que usa GraphManager (total_lanzamientos,
+    conteo_resultados, calcular_probabilidades_teoricas) y ocupa unos pocos
+    enteros por configuración, así que se puede pasar a otro hilo mientras el
+    simulador sigue escribiendo. Se construye desde las versiones publicadas
+    de cada almacén, nunca desde un lote a medio agregar.
+    """
+
+    def __init__(self, simulador: "DiceSimulator", versiones: Optional[Dict] = None):
+        versiones = versiones or simulador.versiones()
+        self.total_lanzamientos = {clave: version.total for clave, version in versiones.items()}
+        self.conteos = {clave: version.estadisticas.conteos.tolist() for clave, version in versiones.items()}
+        self.convergencia = {clave: version.convergencia.curva() for clave, version in versiones.items()}
+        # Los índices de sumas nunca se modifican en el sitio: se comparten sin copiar
+        self.sumas = {clave: version.indice_sumas for clave, version in versiones.items()}
+        self.calcular_probabilidades_teoricas = simulador.calcular_probabilidades_teoricas
+        self.distribucion_suma_teorica = simulador.distribucion_suma_teorica
+
+    def conteo_resultados(self, dados: Dados) -> List[int]:
+        return self.conteos[como_especificacion(dados).clave]
+
+    def conteo_sumas(self, dados: Dados) -> np.ndarray:
+        return self.sumas[como_especificacion(dados).clave]
+
+    def curva_convergencia(self, dados: Dados, valores=None) -> Tuple[np.ndarray, np.ndarray]:
+        especificacion = como_especificacion(dados)
+        lanzamientos, conteos = self.convergencia[especificacion.clave]
+        if valores is None:
+            valores = valores_evento(especificacion.num_dados, especificacion.caras)
+        return lanzamientos, proporcion(lanzamientos, conteos, valores)
+
+
+class InstantaneaAnalisis(InstantaneaResultados):
+    """Instantánea con todo lo que muestra la interfaz al terminar una simulación.
+
+    Además de los conteos incluye las estadísticas descriptivas, el texto del
+    análisis y las filas de las tablas de frecuencia ya formateadas (tuplas),
+    así que se construye en el hilo de simulación y la interfaz solo la pinta.
+    No se modifica después de crearse.
+    """
+
+    def __init__(self, simulador: "DiceSimulator"):
+        versiones = simulador.versiones()
+        super().__init__(simulador, versiones)
+        self.estadisticas = {clave: version.estadisticas.resumen() for clave, version in versiones.items()}
+        self.texto = simulador.texto_analisis(versiones)
+        self.tablas = {clave: simulador.filas_tablas(version.especificacion, versiones)
+                       for clave, version in versiones.items()}
 
 
 class DiceSimulator:
-    def __init__(self):
-        self.resultados_1_dado = []
-        self.resultados_2_dados = []
-        self.resultados_3_dados = []
-        self.resultados_detallados = {"1": [], "2": [], "3": []}
-        self.total_lanzamientos = {"1": 0, "2": 0, "3": 0}
+    def __init__(self, generador_bits: str = GENERADOR_POR_DEFECTO, directorio: Optional[str] = None):
+        # Con `directorio` los lanzamientos se guardan en archivos mapeados en memoria;
+        # si ya contiene un almacén, se adjunta sin cargarlo
+        self.directorio = directorio
+        # Un almacén por configuración de dados, con la clave de su EspecificacionDados;
+        # 1, 2 y 3 dados de 6 caras siempre existen, los demás se crean al usarlos
+        self.almacenes = {}
+        # Protege altas en `almacenes` frente a quien lo recorre desde otro hilo
+        self._cerrojo_almacenes = threading.Lock()
+        for clave in ("1", "2", "3"):
+            self.almacen(clave)
+        if directorio:
+            for nombre in sorted(os.listdir(directorio)):
+                if nombre.endswith("_dados") and os.path.isdir(os.path.join(directorio, nombre)):
+                    self.almacen(nombre[:-len("_dados")])
         self.historial_simulaciones = []
+        # Estimaciones de estimar_evento_raro, que se añaden al informe de análisis
+        self.eventos_raros = []
+        # Resúmenes de AcumuladorReduccion de las simulaciones con muestreo estratificado o antitético
+        self.reducciones_varianza = []
+        # Resúmenes de bondad_ajuste_replicas (pruebas sobre muchas réplicas de una configuración)
+        self.replicas_bondad = []
         self.semilla_random = None
-        
-    def establecer_semilla(self, semilla: Optional[int] = None):
-        """Establece una semilla para reproducibilidad"""
+        # Raíz de los flujos de la simulación paralela (cada ejecución usa un hijo)
+        self.secuencia_semilla = np.random.SeedSequence()
+        # Generadores propios: dos simuladores no comparten estado aleatorio
+        self.generador_bits = generador_bits
+        self.rng = crear_generador(self.secuencia_semilla, generador_bits)
+        self.random = random.Random()
+
+    def almacen(self, dados: Dados) -> ResultStore:
+        """Almacén de una configuración de dados (se crea vacío la primera vez)"""
+        especificacion = como_especificacion(dados)
+        clave = especificacion.clave
+        with self._cerrojo_almacenes:
+            if clave not in self.almacenes:
+                # La clave nombra el directorio del almacén en disco: debe volver a dar la misma especificación
+                if EspecificacionDados.desde_texto(clave) != especificacion:
+                    raise ValueError(f"La clave {clave!r} no identifica a {especificacion}")
+                directorio = os.path.join(self.directorio, f"{clave}_dados") if self.directorio else None
+                self.almacenes[clave] = ResultStore(especificacion, directorio=directorio)
+            return self.almacenes[clave]
+    
+    def version(self, dados: Dados) -> VersionAlmacen:
+        """Última versión publicada de una configuración, sin crear su almacén
+
+        Para lecturas desde la interfaz: si la configuración no se ha simulado
+        devuelve una versión vacía en memoria y no toca `almacenes` ni el disco.
+        """
+        especificacion = como_especificacion(dados)
+        store = self.almacenes.get(especificacion.clave)
+        if store is None:
+            return ResultStore(especificacion).version()
+        return store.version()
+
+    @property
+    def total_lanzamientos(self) -> Dict[str, int]:
+        """Lanzamientos acumulados por configuración (guardados o solo contados)"""
+        return {clave: version.total for clave, version in self.versiones().items()}
+
+    def lista_almacenes(self) -> List[ResultStore]:
+        """Copia de la lista de almacenes, segura aunque otro hilo añada uno"""
+        with self._cerrojo_almacenes:
+            return list(self.almacenes.values())
+    
+    def versiones(self) -> Dict[str, VersionAlmacen]:
+        """Última versión publicada de cada almacén: lectura consistente desde cualquier hilo, sin copiar"""
+        return {store.especificacion.clave: store.version() for store in self.lista_almacenes()}
+
+    # Las vistas resultados_* leen una versión publicada: no cambian aunque se siga simulando
+    @property
+    def resultados_1_dado(self):
+        """Cara obtenida en cada lanzamiento de 1 dado"""
+        return self.almacenes["1"].version().valores
+
+    @property
+    def resultados_2_dados(self):
+        """Número de seises en cada lanzamiento de 2 dados"""
+        return self.almacenes["2"].version().valores
+
+    @property
+    def resultados_3_dados(self):
+        """Número de seises en cada lanzamiento de 3 dados"""
+        return self.almacenes["3"].version().valores
+
+    @property
+    def resultados_detallados(self) -> Dict[str, DetalleLanzamientos]:
+        """Vista por lanzamiento ({'lanzamiento', 'dados', 'seises'}) de cada configuración"""
+        return {clave: version.detallados for clave, version in self.versiones().items()}
+
+    def establecer_semilla(self, semilla: Optional[int] = None, generador_bits: Optional[str] = None):
+        """Establece una semilla (y opcionalmente el generador de bits) para reproducibilidad"""
         self.semilla_random = semilla
-        if semilla is not None:
-            random.seed(semilla)
-            np.random.seed(semilla)
+        if generador_bits is not None:
+            self.generador_bits = generador_bits
+        self.secuencia_semilla = np.random.SeedSequence(semilla)
+        self.rng = crear_generador(self.secuencia_semilla, self.generador_bits)
+        self.random = random.Random(semilla)
+    
+    def restaurar_estado_generador(self, estado: Dict):
+        """Devuelve el generador al 'estado_generador' de una entrada del historial
+
+        La siguiente simulación con los mismos parámetros repite exactamente aquella ejecución.
+        """
+        self.rng = restaurar_generador(estado)
+        self.generador_bits = estado['bit_generator']
     
-    def calcular_probabilidades_teoricas(self, num_dados: int) -> Dict[str, float]:
-        """Calcula las probabilidades teóricas para diferentes escenarios"""
+    def estado_generador(self) -> Dict:
+        """Estado actual del generador, apto para JSON y para restaurar_estado_generador"""
+        return estado_serializable(self.rng.bit_generator.state)
+    
+    def calcular_probabilidades_teoricas(self, dados: Dados, caras: int = 6,
+                                         exacto: bool = False) -> Dict[str, float]:
+        """Calcula las probabilidades teóricas para diferentes escenarios
+
+        Vale para cualquier número de dados y de caras (`caras` solo se usa si
+        `dados` es un número) y para dados cargados; con exacto=True los
+        valores son Fraction. Los cálculos quedan memorizados en probabilidad_exacta.
+        """
+        especificacion = como_especificacion(dados, caras)
+        num_dados, caras = especificacion.num_dados, especificacion.caras
         probabilidades = {}
         
-        if num_dados == 1:
+        if especificacion.cargado:
+            if exacto:
+                suma = sum(Fraction(w) for w in especificacion.pesos)
+                por_cara = [Fraction(w) / suma for w in especificacion.pesos]
+            else:
+                por_cara = especificacion.probabilidades.tolist()
+            if num_dados == 1:
+                for i, p in enumerate(por_cara, start=1):
+                    probabilidades[f"sacar_{i}"] = p
+            else:
+                # Número de seises (la cara más alta): binomial(num_dados, P(cara más alta))
+                distribucion = distribucion_binomial(num_dados, por_cara[-1])
+                for k, p in enumerate(distribucion):
+                    probabilidades[f"{k}_seises"] = p
+                probabilidades["al_menos_1_seis"] = 1 - distribucion[0]
+        
+        elif num_dados == 1:
             # Para 1 dado: probabilidad de cada cara
-            for i in range(1, 7):
-                probabilidades[f"sacar_{i}"] = 1/6
+            for i in range(1, caras + 1):
+                probabilidades[f"sacar_{i}"] = distribucion_cara(1, caras, exacto)[1]
                 
-        elif num_dados == 2:
-            # Para 2 dados: probabilidades de 6 en ambos, uno, ninguno
-            probabilidades["0_seises"] = (5/6)**2  # 25/36
-            probabilidades["1_seises"] = 2 * (1/6) * (5/6)  # 10/36
-            probabilidades["2_seises"] = (1/6)**2  # 1/36
-            probabilidades["al_menos_1_seis"] = 1 - (5/6)**2  # 11/36
-            
-        elif num_dados == 3:
-            # Para 3 dados: todas las combinaciones posibles
-            probabilidades["0_seises"] = (5/6)**3  # 125/216
-            probabilidades["1_seises"] = 3 * (1/6) * (5/6)**2  # 75/216
-            probabilidades["2_seises"] = 3 * (1/6)**2 * (5/6)  # 15/216
-            probabilidades["3_seises"] = (1/6)**3  # 1/216
-            probabilidades["al_menos_1_seis"] = 1 - (5/6)**3  # 91/216
+        elif num_dados >= 2:
+            # Número de seises (la cara más alta): binomial(num_dados, 1/caras)
+            for k, p in enumerate(distribucion_cara(num_dados, caras, exacto)):
+                probabilidades[f"{k}_seises"] = p
+            probabilidades["al_menos_1_seis"] = prob_al_menos(1, num_dados, caras, exacto)
             
         return probabilidades
     
+    def distribucion_suma_teorica(self, dados: Dados, caras: int = 6) -> np.ndarray:
+        """P(suma de los dados = s), con el índice como suma (0..num_dados * caras)
+
+        Se calcula por FFT y queda memorizada, así que sirve para cientos de
+        dados (ver probabilidad_exacta.distribucion_suma_fft).
+        """
+        especificacion = como_especificacion(dados, caras)
+        return distribucion_suma_fft(especificacion.num_dados, especificacion.caras, especificacion.pesos)
+    
+    def probabilidades_resultados(self, dados: Dados) -> np.ndarray:
+        """calcular_probabilidades_teoricas como arreglo con el índice de conteo_resultados
+
+        Caras 1..M con 1 dado (el índice 0 vale 0), número de seises 0..N con más.
+        """
+        especificacion = como_especificacion(dados)
+        teoricas = self.calcular_probabilidades_teoricas(especificacion)
+        if especificacion.num_dados == 1:
+            return np.array([0.0] + [teoricas[f"sacar_{i}"] for i in range(1, especificacion.caras + 1)])
+        return np.array([teoricas[f"{k}_seises"] for k in range(especificacion.num_dados + 1)])
+    
     def calcular_estadisticas_avanzadas(self, resultados: List[int]) -> Dict[str, float]:
         """Calcula estadísticas avanzadas de los resultados"""
         if not resultados:
             return {}
+        return AcumuladorEstadistico.desde_conteos(np.bincount(np.asarray(resultados))).resumen()
+    
+    def calcular_estadisticas_conteos(self, conteos) -> Dict[str, float]:
+        """Igual que calcular_estadisticas_avanzadas, pero desde un histograma (índice = valor)"""
+        return AcumuladorEstadistico.desde_conteos(conteos).resumen()
+    
+    def conteo_resultados(self, dados: Dados) -> List[int]:
+        """Histograma de resultados_N: por cara con 1 dado, por número de seises con más"""
+        return self.version(dados).estadisticas.conteos.tolist()
+    
+    def conteo_sumas(self, dados: Dados) -> np.ndarray:
+        """Histograma de la suma de los dados por lanzamiento (índice = suma)"""
+        return self.version(dados).conteo_sumas()
+    
+    def curva_convergencia(self, dados: Dados, valores=None) -> Tuple[np.ndarray, np.ndarray]:
+        """(lanzamientos, proporción acumulada) de un evento en puntos espaciados logarítmicamente
+
+        `valores` es un valor o una lista de valores de resultados_N (caras con 1 dado,
+        número de seises con más); por defecto, sacar un 6 (la cara más alta) o al menos uno.
+        """
+        store = self.version(dados)
+        lanzamientos, conteos = store.convergencia.curva()
+        if valores is None:
+            valores = valores_evento(store.num_dados, store.num_caras)
+        return lanzamientos, proporcion(lanzamientos, conteos, valores)
+    
+    def instantanea(self) -> InstantaneaResultados:
+        """Conteos agregados actuales, para mostrarlos desde otro hilo"""
+        return InstantaneaResultados(self)
+    
+    def analisis(self) -> InstantaneaAnalisis:
+        """Conteos, estadísticas, texto y filas de tablas actuales, para mostrarlos desde otro hilo"""
+        return InstantaneaAnalisis(self)
+    
+    def simular_dados_vectorizado(self, lanzamientos: int, dados: Dados, muestreo: str = 'simple') -> bool:
+        """Versión optimizada de simulación usando numpy para mejor rendimiento
+
+        Dados normales con enteros acotados; dados cargados con el método alias
+        (coste por cara independiente del número de caras). Con `muestreo`
+        estratificado o antitético (ver reduccion_varianza) la reducción de
+        varianza lograda se añade al informe.
+        """
+        try:
+            especificacion = como_especificacion(dados)
+            estado = estado_serializable(self.rng.bit_generator.state)
+            lanzamientos_dados = reduccion_varianza.muestrear(self.rng, especificacion, lanzamientos, muestreo)
+            
+            # Guardar en formato columnar (uint8), sin objetos por lanzamiento
+            store = self.almacen(especificacion)
+            store.agregar(lanzamientos_dados)
+            store.persistir()
+            if muestreo != 'simple':
+                acumulador = AcumuladorReduccion(especificacion, muestreo)
+                acumulador.agregar(lanzamientos_dados)
+                self.reducciones_varianza.append(acumulador.resumen())
+            
+            # Guardar en historial
+            self.historial_simulaciones.append({
+                'timestamp': datetime.now().isoformat(),
+                'num_dados': especificacion.num_dados,
+                'dados': str(especificacion),
+                'muestreo': muestreo,
+                'lanzamientos': lanzamientos,
+                'semilla': self.semilla_random,
+                'generador': self.generador_bits,
+                'estado_generador': estado
+            })
+            
+            return True
             
-        resultados_np = np.array(resultados)
-        
-        return {
-            'media': float(np.mean(resultados_np)),
-            'mediana': float(np.median(resultados_np)),
-            'moda': float(Counter(resultados).most_common(1)[0][0]),
-            'desviacion_estandar': float(np.std(resultados_np)),
-            'varianza': float(np.var(resultados_np)),
-            'rango': float(np.max(resultados_np) - np.min(resultados_np)),
-            'cuartil_25': float(np.percentile(resultados_np, 25)),
-            'cuartil_75': float(np.percentile(resultados_np, 75))
-        }
-    
-    def simular_dados_vectorizado(self, lanzamientos: int, num_dados: int) -> bool:
-        """Versión optimizada de simulación usando numpy para mejor rendimiento"""
+        except Exception as e:
+            print(f"Error en simulación vectorizada: {e}")
+            return False
+    
+    def simular_por_bloques(self, lanzamientos: int, dados: Dados, tamano_bloque: int = TAMANO_BLOQUE,
+                            guardar_lanzamientos: bool = True,
+                            progreso: Optional[Callable[[int, int], None]] = None,
+                            cancelar=None, muestreo: str = 'simple') -> int:
+        """Simulación en streaming: genera y acumula bloques de tamaño fijo.
+
+        La memoria temporal depende de `tamano_bloque`, no de `lanzamientos`;
+        con guardar_lanzamientos=False solo se acumulan conteos y la memoria
+        total queda acotada. `progreso(hechos, total)` se llama tras cada
+        bloque y `cancelar` (p. ej. un threading.Event) se consulta antes de
+        cada uno. Con `muestreo` distinto de 'simple' cada bloque se genera
+        con ese modo y la reducción de varianza se añade al informe.
+        Devuelve los lanzamientos completados. Si un bloque falla, lo ya
+        agregado se conserva y el historial registra el error (campo 'error')
+        en lugar de una cancelación.
+        """
+        especificacion = como_especificacion(dados)
+        store = self.almacen(especificacion)
+        estado = estado_serializable(self.rng.bit_generator.state)
+        acumulador = AcumuladorReduccion(especificacion, muestreo) if muestreo != 'simple' else None
+        hechos = 0
+        error = None
+        try:
+            while hechos < lanzamientos:
+                if cancelar is not None and cancelar.is_set():
+                    break
+                n = min(tamano_bloque, lanzamientos - hechos)
+                if acumulador is not None:
+                    lote = reduccion_varianza.muestrear(self.rng, especificacion, n, muestreo)
+                    store.agregar(lote, guardar=guardar_lanzamientos)
+                    acumulador.agregar(lote)
+                elif guardar_lanzamientos:
+                    store.agregar(especificacion.muestrear(self.rng, n))
+                elif especificacion.con_indice_conjunto:
+                    # Un código de resultado conjunto por lanzamiento: equivale a n dados y solo se cuenta
+                    codigos = especificacion.muestrear_codigos(self.rng, n)
+                    store.agregar_conteos(np.bincount(codigos, minlength=store.num_resultados))
+                else:
+                    store.agregar(especificacion.muestrear(self.rng, n), guardar=False)
+                hechos += n
+                if progreso is not None:
+                    progreso(hechos, lanzamientos)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(f"Error en simulación por bloques: {e}")
+        # Los lotes solo se guardan en disco cada cierto tiempo: lo agregado (también
+        # si se canceló o falló) se deja guardado al terminar
         try:
-            # Generar todos los lanzamientos de una vez usando numpy
-            lanzamientos_dados = np.random.randint(1, 7, size=(lanzamientos, num_dados))
+            store.persistir()
+        except Exception as e:
+            error = error or f"{type(e).__name__}: {e}"
+            print(f"Error guardando el almacén: {e}")
+        if acumulador is not None and acumulador.n:
+            self.reducciones_varianza.append(acumulador.resumen())
+        
+        self.historial_simulaciones.append({
+            'timestamp': datetime.now().isoformat(),
+            'num_dados': especificacion.num_dados,
+            'dados': str(especificacion),
+            'muestreo': muestreo,
+            'lanzamientos': hechos,
+            'semilla': self.semilla_random,
+            'modo': 'bloques',
+            'cancelada': error is None and hechos < lanzamientos,
+            'error': error,
+            'tamano_bloque': tamano_bloque,
+            'generador': self.generador_bits,
+            'estado_generador': estado
+        })
+        
+        return hechos
+    
+    def simular_dados_agregado(self, lanzamientos: int, dados: Dados) -> bool:
+        """Simulación solo de conteos: muestrea el histograma de resultados directamente.
+
+        Las frecuencias de los caras^n resultados conjuntos siguen una
+        multinomial; no se generan los lanzamientos individuales y el coste no
+        depende del número de lanzamientos. Si hay demasiados resultados
+        conjuntos se muestrean los marginales (ver _muestrear_marginales).
+        """
+        try:
+            especificacion = como_especificacion(dados)
+            store = self.almacen(especificacion)
+            estado = estado_serializable(self.rng.bit_generator.state)
+            if especificacion.con_indice_conjunto:
+                store.agregar_conteos(self.rng.multinomial(lanzamientos, especificacion.probabilidades_conjuntas()))
+            else:
+                store.agregar_marginales(*self._muestrear_marginales(lanzamientos, especificacion))
+            store.persistir()
             
-            # Contar seises por lanzamiento
-            seises_por_lanzamiento = np.sum(lanzamientos_dados == 6, axis=1)
+            self.historial_simulaciones.append({
+                'timestamp': datetime.now().isoformat(),
+                'num_dados': especificacion.num_dados,
+                'dados': str(especificacion),
+                'lanzamientos': lanzamientos,
+                'semilla': self.semilla_random,
+                'modo': 'agregado',
+                'generador': self.generador_bits,
+                'estado_generador': estado
+            })
             
-            # Preparar resultados detallados
-            resultados_detallados = []
-            for i in range(lanzamientos):
-                resultados_detallados.append({
-                    'lanzamiento': i + 1,
-                    'dados': lanzamientos_dados[i].tolist(),
-                    'seises': int(seises_por_lanzamiento[i])
-                })
+            return True
             
-            # Guardar resultados según el número de dados
-            if num_dados == 1:
-                self.resultados_1_dado.extend(lanzamientos_dados[:, 0].tolist())
-                self.resultados_detallados["1"].extend(resultados_detallados)
-                self.total_lanzamientos["1"] += lanzamientos
-            elif num_dados == 2:
-                self.resultados_2_dados.extend(seises_por_lanzamiento.tolist())
-                self.resultados_detallados["2"].extend(resultados_detallados)
-                self.total_lanzamientos["2"] += lanzamientos
-            elif num_dados == 3:
-                self.resultados_3_dados.extend(seises_por_lanzamiento.tolist())
-                self.resultados_detallados["3"].extend(resultados_detallados)
-                self.total_lanzamientos["3"] += lanzamientos
+        except Exception as e:
+            print(f"Error en simulación agregada: {e}")
+            return False
+    
+    def _muestrear_marginales(self, lanzamientos: int, especificacion: EspecificacionDados):
+        """(conteos por cara, conteos por número de seises) con su distribución conjunta exacta.
+
+        El número de seises (cara más alta) de cada lanzamiento es binomial, así
+        que su histograma es una multinomial; fijado ese histograma, los demás
+        dados son independientes y reparten sus caras con otra multinomial.
+        """
+        p = especificacion.probabilidades
+        n = especificacion.num_dados
+        seises = self.rng.multinomial(lanzamientos, np.clip(distribucion_binomial(n, float(p[-1])), 0, None))
+        dados_altos = int(seises @ np.arange(n + 1))
+        resto = lanzamientos * n - dados_altos
+        otras = self.rng.multinomial(resto, p[:-1] / p[:-1].sum()) if p[:-1].sum() > 0 else np.zeros(len(p) - 1, dtype=np.int64)
+        return np.concatenate(([0], otras, [dados_altos])), seises
+    
+    def simular_dados_paralelo(self, lanzamientos: int, dados: Dados, procesos: Optional[int] = None,
+                               tamano_fragmento: int = TAMANO_FRAGMENTO) -> bool:
+        """Simulación repartida en fragmentos entre varios procesos (solo conteos).
+
+        Con la misma semilla el resultado es idéntico sea cual sea `procesos`;
+        la semilla de cada ejecución queda en el historial para reproducirla.
+        """
+        try:
+            especificacion = como_especificacion(dados)
+            semilla = self.secuencia_semilla.spawn(1)[0]
+            conteos = simular_conteos_paralelo(lanzamientos, especificacion, semilla,
+                                               procesos=procesos, tamano_fragmento=tamano_fragmento,
+                                               generador_bits=self.generador_bits)
+            
+            store = self.almacen(especificacion)
+            store.agregar_conteos(conteos)
+            store.persistir()
             
-            # Guardar en historial
             self.historial_simulaciones.append({
                 'timestamp': datetime.now().isoformat(),
-                'num_dados': num_dados,
+                'num_dados': especificacion.num_dados,
+                'dados': str(especificacion),
                 'lanzamientos': lanzamientos,
-                'semilla': self.semilla_random
+                'semilla': self.semilla_random,
+                'modo': 'paralelo',
+                'generador': self.generador_bits,
+                'secuencia_semilla': {'entropia': semilla.entropy, 'spawn_key': list(semilla.spawn_key)},
+                'tamano_fragmento': tamano_fragmento
             })
             
             return True
             
         except Exception as e:
-            print(f"Error en simulación vectorizada: {e}")
+            print(f"Error en simulación paralela: {e}")
             return False
     
-    def simular_dados(self, lanzamientos: int, num_dados: int) -> bool:
+    def estimar_evento_raro(self, minimo: int, dados: Dados, lanzamientos: int = 10 ** 7,
+                            error_relativo: Optional[float] = 0.01,
+                            probabilidad_inclinada: Optional[float] = None) -> Optional[Dict]:
+        """P(al menos `minimo` seises, o caras más altas) por muestreo por importancia
+        
+        No se guarda en los almacenes (los lanzamientos están inclinados hacia
+        el seis); la estimación, con su error estándar y tamaño efectivo, se
+        devuelve y se añade al informe. Para con `error_relativo` o al llegar a
+        `lanzamientos`. Ver eventos_raros.estimar_evento_raro.
+        """
+        try:
+            especificacion = como_especificacion(dados)
+            estado = estado_serializable(self.rng.bit_generator.state)
+            estimacion = estimar_evento_raro(self.rng, especificacion, minimo, lanzamientos,
+                                             error_relativo, probabilidad_inclinada)
+            self.eventos_raros.append(estimacion)
+            
+            self.historial_simulaciones.append({
+                'timestamp': datetime.now().isoformat(),
+                'num_dados': especificacion.num_dados,
+                'dados': str(especificacion),
+                'lanzamientos': estimacion['lanzamientos'],
+                'semilla': self.semilla_random,
+                'modo': 'muestreo_importancia',
+                'minimo_seises': minimo,
+                'probabilidad_inclinada': estimacion['probabilidad_inclinada'],
+                'generador': self.generador_bits,
+                'estado_generador': estado
+            })
+            
+            return estimacion
+            
+        except Exception as e:
+            print(f"Error en muestreo por importancia: {e}")
+            return None
+    
+    def bondad_ajuste(self, dados: Dados, almacenes: Optional[Dict] = None) -> Optional[Dict[str, float]]:
+        """Chi-cuadrado, G y Kolmogorov-Smirnov de conteo_resultados frente a calcular_probabilidades_teoricas
+        
+        Se calculan desde el histograma mantenido al simular, en O(caras) o
+        O(dados), sin recorrer los lanzamientos. None si la configuración no
+        tiene lanzamientos. Ver bondad_ajuste.pruebas_bondad.
+        """
+        especificacion = como_especificacion(dados)
+        store = (almacenes or self.versiones()).get(especificacion.clave)
+        if store is None or not store.total:
+            return None
+        probabilidades = self.probabilidades_resultados(especificacion)
+        return pruebas_bondad(store.estadisticas.conteos[:len(probabilidades)], probabilidades)
+    
+    def bondad_ajuste_replicas(self, lanzamientos: int, dados: Dados, replicas: int = 1000) -> Optional[Dict]:
+        """Pruebas de bondad de ajuste sobre `replicas` simulaciones independientes de `lanzamientos`
+        
+        Cada réplica es el histograma de resultados de una simulación completa,
+        muestreado de una vez con una multinomial (como en el modo solo
+        conteos), y las tres pruebas de todas las réplicas se calculan en una
+        llamada vectorizada. Con dados que siguen la teoría se rechaza cerca
+        del 5% de las réplicas con chi-cuadrado y G (menos con KS, conservadora
+        en distribuciones discretas). El resumen se añade al informe.
+        """
+        try:
+            especificacion = como_especificacion(dados)
+            probabilidades = self.probabilidades_resultados(especificacion)
+            conteos = self.rng.multinomial(lanzamientos, probabilidades / probabilidades.sum(), size=replicas)
+            lote = pruebas_bondad_lote(conteos, probabilidades)
+            resumen = {
+                'dados': str(especificacion),
+                'lanzamientos': lanzamientos,
+                'replicas': replicas,
+                'grados_libertad': lote['grados_libertad'],
+                'pruebas': resumen_replicas(lote),
+            }
+            self.replicas_bondad.append(resumen)
+            return resumen
+            
+        except Exception as e:
+            print(f"Error en las pruebas de bondad de ajuste: {e}")
+            return None
+    
+    def simular_dados(self, lanzamientos: int, dados: Dados) -> bool:
         """Simulación tradicional (fallback si numpy falla)"""
         try:
-            resultados = []
-            resultados_detallados = []
+            especificacion = como_especificacion(dados)
+            caras = range(1, especificacion.caras + 1)
+            lanzamientos_dados = []
             
             for i in range(lanzamientos):
-                lanzamiento = [random.randint(1, 6) for _ in range(num_dados)]
-                seises_count = lanzamiento.count(6)
-                
-                resultados.append(seises_count)
-                resultados_detallados.append({
-                    'lanzamiento': i + 1,
-                    'dados': lanzamiento.copy(),
-                    'seises': seises_count
-                })
+                if especificacion.cargado:
+                    lanzamiento = self.random.choices(caras, weights=especificacion.pesos, k=especificacion.num_dados)
+                else:
+                    lanzamiento = [self.random.randint(1, especificacion.caras) for _ in range(especificacion.num_dados)]
+                lanzamientos_dados.append(lanzamiento)
             
             # Guardar resultados
-            if num_dados == 1:
-                self.resultados_1_dado.extend([r['dados'][0] for r in resultados_detallados])
-                self.resultados_detallados["1"].extend(resultados_detallados)
-                self.total_lanzamientos["1"] += lanzamientos
-            elif num_dados == 2:
-                self.resultados_2_dados.extend(resultados)
-                self.resultados_detallados["2"].extend(resultados_detallados)
-                self.total_lanzamientos["2"] += lanzamientos
-            elif num_dados == 3:
-                self.resultados_3_dados.extend(resultados)
-                self.resultados_detallados["3"].extend(resultados_detallados)
-                self.total_lanzamientos["3"] += lanzamientos
+            if lanzamientos_dados:
+                store = self.almacen(especificacion)
+                store.agregar(np.array(lanzamientos_dados, dtype=np.uint8))
+                store.persistir()
             
             return True
             
@@ -152,22 +594,30 @@ class DiceSimulator:
             return False
     
    
+    def cerrar(self):
+        """Deja guardado en disco todo lo agregado (antes de salir o de cambiar de almacenamiento)"""
+        for store in self.lista_almacenes():
+            store.persistir()
+    
     def limpiar_resultados(self):
         """Limpia todos los resultados almacenados"""
-        self.resultados_1_dado = []
-        self.resultados_2_dados = []
-        self.resultados_3_dados = []
-        self.resultados_detallados = {"1": [], "2": [], "3": []}
-        self.total_lanzamientos = {"1": 0, "2": 0, "3": 0}
+        for store in self.lista_almacenes():
+            store.limpiar()
         self.historial_simulaciones = []
+        self.eventos_raros = []
+        self.reducciones_varianza = []
+        self.replicas_bondad = []
     
     def exportar_resultados(self, archivo: str) -> bool:
-        """Exporta resultados a archivo JSON"""
+        """Exporta un resumen a archivo JSON (solo los últimos 1000 resultados por configuración)
+
+        Para guardar la sesión completa usar exportar_resultados_binario.
+        """
         try:
             datos = {
-                'resultados_1_dado': self.resultados_1_dado[-1000:],  # Limitar para tamaño
-                'resultados_2_dados': self.resultados_2_dados[-1000:],
-                'resultados_3_dados': self.resultados_3_dados[-1000:],
+                'resultados_1_dado': self.resultados_1_dado[-1000:].tolist(),  # Limitar para tamaño
+                'resultados_2_dados': self.resultados_2_dados[-1000:].tolist(),
+                'resultados_3_dados': self.resultados_3_dados[-1000:].tolist(),
                 'total_lanzamientos': self.total_lanzamientos,
                 'historial_simulaciones': self.historial_simulaciones,
                 'timestamp_exportacion': datetime.now().isoformat()
@@ -181,15 +631,70 @@ class DiceSimulator:
             print(f"Error exportando resultados: {e}")
             return False
     
-    def analizar_un_dado(self) -> str:
+    def exportar_convergencia(self, archivo: str, dados: Dados) -> bool:
+        """Exporta a CSV la trayectoria de convergencia de una configuración
+
+        Una fila por punto de muestreo: lanzamientos y proporción acumulada de cada
+        valor, con las mismas claves que calcular_probabilidades_teoricas.
+        Sin lanzamientos de esa configuración no escribe nada y devuelve False.
+        """
+        try:
+            # Solo lectura: exportar no debe crear el almacén (ni su directorio en disco)
+            store = self.version(dados)
+            num_dados = store.num_dados
+            lanzamientos, conteos = store.convergencia.curva()
+            if len(lanzamientos) == 0:
+                print(f"Error exportando convergencia: no hay lanzamientos de {store.especificacion}")
+                return False
+            if num_dados == 1:
+                columnas = {f"sacar_{i}": i for i in range(1, store.num_caras + 1)}
+            else:
+                columnas = {f"{k}_seises": k for k in range(num_dados + 1)}
+                columnas["al_menos_1_seis"] = valores_evento(num_dados)
+            proporciones = np.column_stack([proporcion(lanzamientos, conteos, v) for v in columnas.values()])
+            with open(archivo, 'w', newline='', encoding='utf-8') as f:
+                escritor = csv.writer(f)
+                escritor.writerow(['lanzamientos', *columnas])
+                for n, fila in zip(lanzamientos.tolist(), proporciones.tolist()):
+                    escritor.writerow([n, *fila])
+            return True
+        except Exception as e:
+            print(f"Error exportando convergencia: {e}")
+            return False
+    
+    def exportar_resultados_binario(self, ruta: str, comprimir: bool = False) -> bool:
+        """Exporta la sesión completa (lanzamientos, conteos, generador, historial y estimaciones del informe)
+
+        Sin comprimir se crea un directorio de .npy que np.load(mmap_mode='r')
+        abre sin leerlos; con comprimir=True se escribe un único .npz.
+        """
+        try:
+            formato_binario.exportar(self, ruta, comprimir)
+            return True
+        except Exception as e:
+            print(f"Error exportando resultados binarios: {e}")
+            return False
+    
+    def importar_resultados_binario(self, ruta: str) -> bool:
+        """Reemplaza la sesión actual por una guardada con exportar_resultados_binario"""
+        try:
+            formato_binario.importar(self, ruta)
+            return True
+        except Exception as e:
+            print(f"Error importando resultados binarios: {e}")
+            return False
+    
+    def analizar_un_dado(self, almacenes: Optional[Dict] = None) -> str:
         """Análisis mejorado para 1 dado con estadísticas avanzadas"""
-        if not self.resultados_1_dado:
+        store = (almacenes or self.versiones())["1"]
+        if not store.total:
             return ""
             
-        contador = Counter(self.resultados_1_dado)
-        total = len(self.resultados_1_dado)
+        # Histograma y momentos mantenidos al simular: no se recorren los lanzamientos
+        contador = dict(enumerate(store.estadisticas.conteos.tolist()))
+        total = store.total
         prob_teoricas = self.calcular_probabilidades_teoricas(1)
-        estadisticas = self.calcular_estadisticas_avanzadas(self.resultados_1_dado)
+        estadisticas = store.estadisticas.resumen()
         
         texto = f" ANÁLISIS AVANZADO DE 1 DADO ({total:,} lanzamientos)\n"
         texto += "═" * 70 + "\n"
@@ -245,15 +750,16 @@ class DiceSimulator:
         return texto
 
     
-    def analizar_dos_dados(self) -> str:
+    def analizar_dos_dados(self, almacenes: Optional[Dict] = None) -> str:
         """Análisis mejorado para 2 dados"""
-        if not self.resultados_2_dados:
+        store = (almacenes or self.versiones())["2"]
+        if not store.total:
             return ""
             
-        contador = Counter(self.resultados_2_dados)
-        total = len(self.resultados_2_dados)
+        contador = dict(enumerate(store.estadisticas.conteos.tolist()))
+        total = store.total
         prob_teoricas = self.calcular_probabilidades_teoricas(2)
-        estadisticas = self.calcular_estadisticas_avanzadas(self.resultados_2_dados)
+        estadisticas = store.estadisticas.resumen()
         
         texto = f" ANÁLISIS AVANZADO DE 2 DADOS ({total:,} lanzamientos)\n"
         texto += "═" * 70 + "\n"
@@ -287,10 +793,7 @@ class DiceSimulator:
         texto += f"     Diferencia:   {abs(prob_al_menos_uno_exp - prob_al_menos_uno_teo):.4f}\n"
 
         # Conteo detallado de cada cara en todos los dados
-        caras_contador = Counter()
-        for detalle in self.resultados_detallados["2"]:
-            for cara in detalle['dados']:
-                caras_contador[cara] += 1
+        caras_contador = dict(enumerate(store.conteo_caras().tolist()))
         total_caras = sum(caras_contador.values())
         texto += f"\n LISTADO DE FRECUENCIAS POR CARA (en {total_caras:,} dados lanzados):\n"
         texto += "─" * 50 + "\n"
@@ -301,15 +804,16 @@ class DiceSimulator:
         texto += "\n"
         return texto
     
-    def analizar_tres_dados(self) -> str:
+    def analizar_tres_dados(self, almacenes: Optional[Dict] = None) -> str:
         """Análisis mejorado para 3 dados"""
-        if not self.resultados_3_dados:
+        store = (almacenes or self.versiones())["3"]
+        if not store.total:
             return ""
             
-        contador = Counter(self.resultados_3_dados)
-        total = len(self.resultados_3_dados)
+        contador = dict(enumerate(store.estadisticas.conteos.tolist()))
+        total = store.total
         prob_teoricas = self.calcular_probabilidades_teoricas(3)
-        estadisticas = self.calcular_estadisticas_avanzadas(self.resultados_3_dados)
+        estadisticas = store.estadisticas.resumen()
         
         texto = f" ANÁLISIS AVANZADO DE 3 DADOS ({total:,} lanzamientos)\n"
         texto += "═" * 70 + "\n"
@@ -332,10 +836,7 @@ class DiceSimulator:
         texto += f"   Mediana:                    {estadisticas['mediana']:.3f}\n"
         
         # Conteo detallado de cada cara en todos los dados
-        caras_contador = Counter()
-        for detalle in self.resultados_detallados["3"]:
-            for cara in detalle['dados']:
-                caras_contador[cara] += 1
+        caras_contador = dict(enumerate(store.conteo_caras().tolist()))
         total_caras = sum(caras_contador.values())
         texto += f"\n LISTADO DE FRECUENCIAS POR CARA (en {total_caras:,} dados lanzados):\n"
         texto += "─" * 50 + "\n"
@@ -364,14 +865,171 @@ class DiceSimulator:
         texto += "\n"
         return texto
     
+    def analizar_especificacion(self, store) -> str:
+        """Análisis de cualquier otra configuración (dN, más dados, dados cargados)"""
+        if not store.total:
+            return ""
+        
+        especificacion = store.especificacion
+        num_dados, caras = especificacion.num_dados, especificacion.caras
+        contador = store.estadisticas.conteos.tolist()
+        total = store.total
+        prob_teoricas = self.calcular_probabilidades_teoricas(especificacion)
+        estadisticas = store.estadisticas.resumen()
+        
+        texto = f" ANÁLISIS DE {especificacion} ({total:,} lanzamientos)\n"
+        texto += "═" * 70 + "\n"
+        if especificacion.cargado:
+            texto += "   Probabilidad por cara: " + ", ".join(f"{p:.4f}" for p in especificacion.probabilidades) + "\n"
+        
+        if num_dados == 1:
+            texto += " DISTRIBUCIÓN DE RESULTADOS:\n"
+            texto += "─" * 50 + "\n"
+            for i in range(1, caras + 1):
+                texto += f"   Cara {i:>3}: {contador[i]:6,} | Exp: {contador[i] / total:.4f} | Teó: {prob_teoricas[f'sacar_{i}']:.4f}\n"
+        else:
+            texto += f" DISTRIBUCIÓN DEL NÚMERO DE {caras} (cara más alta):\n"
+            texto += "─" * 50 + "\n"
+            for k in range(num_dados + 1):
+                # Con muchos dados solo se listan los valores observados o con probabilidad apreciable
+                if contador[k] or prob_teoricas[f"{k}_seises"] >= 1e-6:
+                    texto += f"   {k:>3} × {caras}: {contador[k]:6,} | Exp: {contador[k] / total:.4f} | Teó: {prob_teoricas[f'{k}_seises']:.4f}\n"
+            al_menos_uno = total - contador[0]
+            texto += f"\n   Al menos un {caras}: Exp: {al_menos_uno / total:.4f} | Teó: {prob_teoricas['al_menos_1_seis']:.4f}\n"
+        
+        texto += f"\n ESTADÍSTICAS DESCRIPTIVAS:\n"
+        texto += "─" * 50 + "\n"
+        texto += f"   Media:               {estadisticas['media']:.3f}\n"
+        texto += f"   Desviación estándar: {estadisticas['desviacion_estandar']:.3f}\n"
+        
+        if num_dados > 1:
+            caras_contador = store.conteo_caras().tolist()
+            total_caras = sum(caras_contador)
+            texto += f"\n LISTADO DE FRECUENCIAS POR CARA (en {total_caras:,} dados lanzados):\n"
+            texto += "─" * 50 + "\n"
+            for i, p in enumerate(especificacion.probabilidades, start=1):
+                texto += f"   Cara {i:>3}: {caras_contador[i]:6,} veces (esperadas {p * total_caras:,.1f})\n"
+        
+        texto += "\n"
+        return texto
+    
+    def analizar_suma(self, store) -> str:
+        """Suma de los dados simulada frente a su distribución exacta (configuraciones de 2+ dados)"""
+        sumas = store.indice_sumas
+        total = int(sumas.sum())
+        if store.num_dados < 2 or not total:
+            return ""
+        
+        teorica = self.distribucion_suma_teorica(store.especificacion)
+        valores = np.arange(len(sumas))
+        experimental = sumas / total
+        media_exp = float(valores @ experimental)
+        media_teo = float(valores @ teorica)
+        desviacion_exp = float(np.sqrt(((valores - media_exp) ** 2) @ experimental))
+        desviacion_teo = float(np.sqrt(((valores - media_teo) ** 2) @ teorica))
+        # Distancia de variación total: máxima diferencia de probabilidad sobre cualquier conjunto de sumas
+        distancia = 0.5 * float(np.abs(experimental - teorica).sum())
+        
+        texto = f" SUMA DE LOS DADOS - {store.especificacion} ({total:,} lanzamientos)\n"
+        texto += "─" * 50 + "\n"
+        texto += f"   Media:               Exp: {media_exp:.3f} | Teó: {media_teo:.3f}\n"
+        texto += f"   Desviación estándar: Exp: {desviacion_exp:.3f} | Teó: {desviacion_teo:.3f}\n"
+        texto += f"   Suma más frecuente:  Exp: {int(sumas.argmax())} | Teó: {int(teorica.argmax())}\n"
+        texto += f"   Distancia de variación total: {distancia:.4f}\n"
+        texto += "\n"
+        return texto
+    
+    def analizar_bondad(self, store) -> str:
+        """Pruebas de bondad de ajuste de una configuración (ver bondad_ajuste)"""
+        if not store.total:
+            return ""
+        especificacion = store.especificacion
+        resultado = self.bondad_ajuste(especificacion, {especificacion.clave: store})
+        if especificacion.num_dados == 1:
+            etiqueta = f"caras de {especificacion}"
+        else:
+            etiqueta = f"número de {especificacion.caras} en {especificacion}"
+        return texto_bondad(resultado, etiqueta)
+    
+    def texto_analisis(self, almacenes: Optional[Dict] = None) -> str:
+        """Informe completo (cabecera con la fecha y el análisis de cada configuración con datos)"""
+        almacenes = almacenes or self.versiones()
+        texto = f"ANÁLISIS - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        texto += "═" * 80 + "\n\n"
+        texto += self.analizar_un_dado(almacenes)
+        texto += self.analizar_dos_dados(almacenes)
+        texto += self.analizar_tres_dados(almacenes)
+        for clave, store in almacenes.items():
+            if clave not in ("1", "2", "3"):
+                texto += self.analizar_especificacion(store)
+        for store in almacenes.values():
+            texto += self.analizar_bondad(store)
+        for store in almacenes.values():
+            texto += self.analizar_suma(store)
+        for estimacion in list(self.eventos_raros):
+            texto += texto_evento_raro(estimacion)
+        for resumen in list(self.reducciones_varianza):
+            texto += texto_reduccion(resumen)
+        for resumen in list(self.replicas_bondad):
+            texto += texto_replicas(resumen)
+        return texto
+    
+    def filas_tablas(self, dados: Dados, almacenes: Optional[Dict] = None) -> Dict[str, Tuple[Tuple[str, ...], ...]]:
+        """Filas formateadas de las tablas 'resumen', 'distribucion' y 'frecuencias'"""
+        especificacion = como_especificacion(dados)
+        store = (almacenes or self.versiones()).get(especificacion.clave)
+        if store is None or not store.total:
+            return {'resumen': (), 'distribucion': (), 'frecuencias': ()}
+        num_dados, caras = especificacion.num_dados, especificacion.caras
+        total = store.total
+        if not total:
+            return {'resumen': (), 'distribucion': (), 'frecuencias': ()}
+        
+        # Histograma de resultados (también disponible en modo solo conteos)
+        contador = dict(enumerate(store.estadisticas.conteos.tolist()))
+        media = store.estadisticas.media
+        resumen = [("Total lanzamientos", f"{total:,}", "Número de experimentos")]
+        distribucion = []
+        prob_cara = especificacion.probabilidades
+        if num_dados == 1:
+            resumen.append(("Media de caras", f"{media:.4f}", "Promedio de la cara obtenida"))
+            
+            # Distribución: SOLO 0 o 1 seis (la cara más alta)
+            seises = contador.get(caras, 0)
+            for k, freq, prob_teo in ((0, total - seises, 1 - prob_cara[-1]), (1, seises, prob_cara[-1])):
+                distribucion.append((str(k), f"{freq:,}", f"{(freq / total * 100):.2f}%",
+                                     f"{freq / total:.4f}", f"{prob_teo:.4f}"))
+            caras_contador = contador
+            total_caras = total
+        else:
+            resumen.append(("Media de seises", f"{media:.4f}", "Promedio por lanzamiento"))
+            
+            prob_teoricas = self.calcular_probabilidades_teoricas(especificacion)
+            for i in range(num_dados + 1):
+                freq = contador.get(i, 0)
+                distribucion.append((str(i), f"{freq:,}", f"{(freq / total * 100):.2f}%",
+                                     f"{freq / total:.4f}", f"{prob_teoricas.get(f'{i}_seises', 0):.4f}"))
+            caras_contador = dict(enumerate(store.conteo_caras().tolist()))
+            total_caras = sum(caras_contador.values())
+        
+        # Frecuencia de cada cara (entre todos los dados lanzados)
+        frecuencias = []
+        for cara in range(1, caras + 1):
+            esperado = total_caras * prob_cara[cara - 1]
+            freq = caras_contador.get(cara, 0)
+            porcentaje = (freq / total_caras * 100) if total_caras > 0 else 0
+            frecuencias.append((str(cara), f"{freq:,}", f"{porcentaje:.2f}%",
+                                f"{esperado:.1f}", f"{freq - esperado:+.1f}"))
+        return {'resumen': tuple(resumen), 'distribucion': tuple(distribucion), 'frecuencias': tuple(frecuencias)}
+    
     def limpiar_todo(self):
         """Limpia todos los resultados almacenados"""
-        self.resultados_1_dado = []
-        self.resultados_2_dados = []
-        self.resultados_3_dados = []
-        self.resultados_detallados = {"1": [], "2": [], "3": []}
-        self.total_lanzamientos = {"1": 0, "2": 0, "3": 0}
+        for store in self.lista_almacenes():
+            store.limpiar()
         self.historial_simulaciones = []
+        self.eventos_raros = []
+        self.reducciones_varianza = []
+        self.replicas_bondad = []
     
     def actualizar_tablas_mejoradas(self):
         """Actualizar todas las tablas con los resultados actuales."""
@@ -422,6 +1080,9 @@ class DiceSimulator:
     def generar_histograma(self, datos: List[int], num_dados: int):
         """Genera un histograma de frecuencias para los resultados"""
         try:
+            # Import diferido: usar el simulador sin gráficos no carga matplotlib
+            import matplotlib.pyplot as plt
+            
             fig, ax = plt.subplots()
             contador = Counter(datos)
             caras = list(range(1, 7))
@@ -0,0 +1,174 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+
+CARAS_MIN = 2
+CARAS_MAX = 100
+# Resultados conjuntos (caras^num_dados) hasta los que se mantiene el índice conjunto
+# y se puede simular solo con conteos sobre él (6 dados d6, 3 d20, 2 d100)
+LIMITE_CONJUNTOS = 1 << 16
+
+
+class TablaAlias:
+    """Método alias de Walker (construcción de Vose) para una distribución discreta.
+
+    Tras una construcción O(k), cada muestra cuesta O(1) sea cual sea el
+    número de valores: un único uniforme elige la columna (parte entera) y
+    decide entre el valor y su alias (parte fraccionaria).
+    """
+
+    def __init__(self, probabilidades):
+        p = np.asarray(probabilidades, dtype=np.float64)
+        k = len(p)
+        escalada = p / p.sum() * k
+        self.umbral = np.ones(k)
+        self.alias = np.arange(k)
+        pequenos = [i for i in range(k) if escalada[i] < 1]
+        grandes = [i for i in range(k) if escalada[i] >= 1]
+        while pequenos and grandes:
+            s, g = pequenos.pop(), grandes.pop()
+            self.umbral[s] = escalada[s]
+            self.alias[s] = g
+            escalada[g] -= 1 - escalada[s]
+            (pequenos if escalada[g] < 1 else grandes).append(g)
+        # Lo que queda (por redondeo) tiene umbral 1: se elige siempre a sí mismo
+
+    def __len__(self) -> int:
+        return len(self.umbral)
+
+    def muestrear(self, rng: np.random.Generator, forma) -> np.ndarray:
+        """Índices 0..k-1 con la distribución de la tabla."""
+        u = rng.random(forma) * len(self)
+        columna = u.astype(np.intp)
+        return np.where(u - columna < self.umbral[columna], columna, self.alias[columna])
+
+
+@dataclass(frozen=True)
+class EspecificacionDados:
+    """Qué se lanza: `num_dados` dados de `caras` caras, con pesos opcionales por cara.
+
+    `clave` identifica el almacén de resultados: "1", "2", "3"... para dados
+    de 6 caras sin cargar (las claves de siempre), "3d20" o "2d6_1_1_1_1_1_3"
+    para los demás. Los «seises» de informes y tablas son la cara más alta.
+    """
+    num_dados: int
+    caras: int = 6
+    pesos: Optional[Tuple[float, ...]] = None
+
+    def __post_init__(self):
+        if self.num_dados < 1:
+            raise ValueError("Se necesita al menos un dado")
+        if not CARAS_MIN <= self.caras <= CARAS_MAX:
+            raise ValueError(f"Los dados deben tener entre {CARAS_MIN} y {CARAS_MAX} caras")
+        if self.pesos is not None:
+            pesos = tuple(float(w) for w in self.pesos)
+            if len(pesos) != self.caras:
+                raise ValueError(f"Se esperaban {self.caras} pesos, uno por cara")
+            if min(pesos) < 0 or sum(pesos) <= 0:
+                raise ValueError("Los pesos deben ser no negativos y no todos cero")
+            # Pesos todos iguales: es un dado normal (misma clave y mismo muestreo)
+            object.__setattr__(self, 'pesos', None if len(set(pesos)) == 1 else pesos)
+
+    @classmethod
+    def desde_texto(cls, texto: str) -> "EspecificacionDados":
+        """'3', '3d20', '2d6:1,1,1,1,1,3' o una clave como '2d6_1_1_1_1_1_3'."""
+        texto = str(texto).strip().lower()
+        base, _, pesos = texto.replace(':', '_', 1).partition('_')
+        num_dados, _, caras = base.partition('d')
+        try:
+            return cls(int(num_dados), int(caras) if caras else 6,
+                       tuple(float(w) for w in pesos.replace(',', '_').split('_')) if pesos else None)
+        except ValueError as e:
+            raise ValueError(f"Especificación de dados no válida: {texto!r} ({e})") from None
+
+    @property
+    def cargado(self) -> bool:
+        return self.pesos is not None
+
+    @property
+    def clave(self) -> str:
+        if self.caras == 6 and not self.cargado:
+            return str(self.num_dados)
+        clave = f"{self.num_dados}d{self.caras}"
+        if self.cargado:
+            clave += "_" + "_".join(_texto_peso(w) for w in self.pesos)
+        return clave
+
+    def __str__(self) -> str:
+        texto = f"{self.num_dados}d{self.caras}"
+        return texto + ":" + ",".join(_texto_peso(w) for w in self.pesos) if self.cargado else texto
+
+    @property
+    def probabilidades(self) -> np.ndarray:
+        """P(cara) para las caras 1..caras."""
+        if not self.cargado:
+            return np.full(self.caras, 1 / self.caras)
+        pesos = np.asarray(self.pesos)
+        return pesos / pesos.sum()
+
+    @property
+    def num_resultados(self) -> int:
+        """Resultados conjuntos posibles (caras^num_dados)."""
+        return self.caras ** self.num_dados
+
+    @property
+    def con_indice_conjunto(self) -> bool:
+        return self.num_resultados <= LIMITE_CONJUNTOS
+
+    def probabilidades_conjuntas(self) -> np.ndarray:
+        """P de cada resultado conjunto, con el código en base `caras` de ResultStore (dado 0 el menos significativo)."""
+        if not self.cargado:
+            return np.full(self.num_resultados, 1 / self.num_resultados)
+        conjuntas = self.probabilidades
+        for _ in range(self.num_dados - 1):
+            conjuntas = np.outer(self.probabilidades, conjuntas).ravel()
+        return conjuntas
+
+    def muestrear(self, rng: np.random.Generator, lanzamientos: int) -> np.ndarray:
+        """Matriz uint8 (lanzamientos x num_dados) de caras 1..caras."""
+        if not self.cargado:
+            # Enteros acotados directamente en uint8: menos bits aleatorios por cara y sin conversión
+            return rng.integers(1, self.caras + 1, size=(lanzamientos, self.num_dados), dtype=np.uint8)
+        indices = _tabla_alias(self.pesos).muestrear(rng, (lanzamientos, self.num_dados))
+        return (indices + 1).astype(np.uint8)
+
+    def muestrear_codigos(self, rng: np.random.Generator, lanzamientos: int) -> np.ndarray:
+        """Códigos de resultado conjunto (solo con con_indice_conjunto): un número por lanzamiento."""
+        if not self.con_indice_conjunto:
+            raise ValueError(f"{self}: demasiados resultados conjuntos ({self.num_resultados:,}) para muestrearlos")
+        if not self.cargado:
+            # Un código uniforme en [0, caras^n) equivale a n dados independientes
+            return rng.integers(0, self.num_resultados, size=lanzamientos)
+        return _tabla_alias_conjunta(self).muestrear(rng, lanzamientos)
+
+
+def _texto_peso(peso: float) -> str:
+    """Peso para claves y textos: corto ('3') si se puede y sin pérdida (repr) si no.
+
+    Con solo '{:g}' (6 cifras) dos dados cargados distintos compartirían clave
+    y almacén, y desde_texto(clave) no devolvería la misma especificación.
+    """
+    texto = f"{peso:g}"
+    return texto if float(texto) == peso else repr(peso)
+
+
+@lru_cache(maxsize=None)
+def _tabla_alias(pesos: Tuple[float, ...]) -> TablaAlias:
+    return TablaAlias(pesos)
+
+
+@lru_cache(maxsize=32)
+def _tabla_alias_conjunta(especificacion: EspecificacionDados) -> TablaAlias:
+    return TablaAlias(especificacion.probabilidades_conjuntas())
+
+
+def como_especificacion(dados: Union[int, str, EspecificacionDados], caras: int = 6) -> EspecificacionDados:
+    """Acepta un número de dados (de `caras` caras), un texto ('3d20') o una especificación."""
+    if isinstance(dados, EspecificacionDados):
+        return dados
+    if isinstance(dados, str):
+        return EspecificacionDados.desde_texto(dados)
+    return EspecificacionDados(int(dados), caras)
@@ -0,0 +1,106 @@
+from typing import Dict
+
+import numpy as np
+
+
+class AcumuladorEstadistico:
+    """Estadísticas incrementales de un valor entero pequeño (cara o número de seises).
+
+    Guarda el conteo por valor y los momentos de Welford (n, media, M2), que
+    se actualizan por bloque y se pueden fusionar entre acumuladores. Media,
+    varianza, mediana, cuartiles y moda salen del histograma en O(valores),
+    sin volver a recorrer los lanzamientos.
+    """
+
+    def __init__(self, num_valores: int):
+        self.conteos = np.zeros(num_valores, dtype=np.int64)
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+
+    @classmethod
+    def desde_conteos(cls, conteos) -> "AcumuladorEstadistico":
+        conteos = np.asarray(conteos, dtype=np.int64)
+        acumulador = cls(len(conteos))
+        acumulador.agregar_conteos(conteos)
+        return acumulador
+
+    def __len__(self) -> int:
+        return self.n
+
+    def agregar(self, valores: np.ndarray):
+        """Suma un bloque de valores observados."""
+        self.agregar_conteos(np.bincount(np.asarray(valores).ravel(), minlength=len(self.conteos)))
+
+    def agregar_conteos(self, conteos: np.ndarray):
+        """Suma un histograma (índice = valor) como si fuera un bloque."""
+        conteos = np.asarray(conteos, dtype=np.int64)
+        n = int(conteos.sum())
+        if n == 0:
+            return
+        valores = np.arange(len(conteos), dtype=np.float64)
+        media = float(conteos @ valores / n)
+        m2 = float(conteos @ (valores - media) ** 2)
+        self._fusionar_momentos(n, media, m2)
+        self._sumar_conteos(conteos)
+
+    def fusionar(self, otro: "AcumuladorEstadistico"):
+        """Incorpora otro acumulador (p. ej. de otro fragmento o proceso)."""
+        if otro.n == 0:
+            return
+        self._fusionar_momentos(otro.n, otro.media, otro.m2)
+        self._sumar_conteos(otro.conteos)
+
+    def _fusionar_momentos(self, n: int, media: float, m2: float):
+        # Combinación de Chan et al. de dos conjuntos de momentos de Welford
+        total = self.n + n
+        delta = media - self.media
+        self.media += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+
+    def _sumar_conteos(self, conteos: np.ndarray):
+        # Siempre un arreglo nuevo: las copias superficiales (versiones publicadas) no cambian
+        if len(conteos) > len(self.conteos):
+            conteos = conteos.copy()
+            conteos[:len(self.conteos)] += self.conteos
+            self.conteos = conteos
+        else:
+            suma = self.conteos.copy()
+            suma[:len(conteos)] += conteos
+            self.conteos = suma
+
+    @property
+    def varianza(self) -> float:
+        return self.m2 / self.n if self.n else 0.0
+
+    def percentil(self, q: float) -> float:
+        """Percentil exacto desde el histograma, con la interpolación lineal de np.percentile."""
+        acumulado = np.cumsum(self.conteos)
+        posicion = q / 100 * (self.n - 1)
+        inferior = int(np.floor(posicion))
+        v_inf = int(np.searchsorted(acumulado, inferior, side='right'))
+        v_sup = int(np.searchsorted(acumulado, min(inferior + 1, self.n - 1), side='right'))
+        return float(v_inf + (v_sup - v_inf) * (posicion - inferior))
+
+    def resumen(self) -> Dict[str, float]:
+        """Mismas claves que DiceSimulator.calcular_estadisticas_avanzadas."""
+        if self.n == 0:
+            return {}
+        presentes = np.flatnonzero(self.conteos)
+        return {
+            'media': self.media,
+            'mediana': self.percentil(50),
+            'moda': float(np.argmax(self.conteos)),
+            'desviacion_estandar': float(np.sqrt(self.varianza)),
+            'varianza': self.varianza,
+            'rango': float(presentes[-1] - presentes[0]),
+            'cuartil_25': self.percentil(25),
+            'cuartil_75': self.percentil(75)
+        }
+
+    def limpiar(self):
+        self.conteos = np.zeros_like(self.conteos)
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
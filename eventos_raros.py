@@ -0,0 +1,146 @@
+from math import sqrt
+from typing import Dict, Optional
+
+import numpy as np
+
+from especificacion import EspecificacionDados
+from probabilidad_exacta import distribucion_binomial
+
+
+# Lanzamientos por bloque del muestreo por importancia (memoria temporal acotada)
+TAMANO_BLOQUE_IMPORTANCIA = 1 << 18
+# Lanzamientos mínimos antes de comprobar el error relativo: con muy pocos el error estimado no es fiable
+MINIMO_LANZAMIENTOS = 1000
+
+
+def probabilidad_inclinada_optima(num_dados: int, minimo: int, probabilidad: float) -> float:
+    """P(cara más alta) de la distribución inclinada para el evento «al menos `minimo` de `num_dados`».
+
+    La inclinación exponencial que centra la binomial en el borde del evento
+    (media num_dados · q = minimo) es la asintóticamente óptima; nunca se
+    inclina por debajo de la probabilidad original.
+    """
+    return max(minimo / num_dados, probabilidad)
+
+
+def estimar_evento_raro(rng: np.random.Generator, especificacion: EspecificacionDados, minimo: int,
+                        lanzamientos: int, error_relativo: Optional[float] = None,
+                        probabilidad_inclinada: Optional[float] = None,
+                        tamano_bloque: int = TAMANO_BLOQUE_IMPORTANCIA) -> Dict[str, float]:
+    """P(al menos `minimo` caras más altas en un lanzamiento) por muestreo por importancia.
+
+    Los dados se lanzan con una distribución inclinada hacia la cara más alta
+    (probabilidad q en lugar de p) y cada lanzamiento del evento pesa su
+    razón de verosimilitud (p/q)^k ((1-p)/(1-q))^(n-k), que solo depende del
+    número k de caras más altas. Como el evento y el peso solo dependen de
+    k, y bajo la inclinación k ~ Binomial(n, q), se muestrea k directamente:
+    el coste por lanzamiento no depende del número de dados. La media de los
+    pesos es un estimador insesgado; con q cerca de minimo/n su varianza es
+    órdenes de magnitud menor que la de contar apariciones. Se simula en
+    bloques que se duplican hasta `lanzamientos` o hasta alcanzar
+    `error_relativo` (error estándar / estimación).
+
+    Si la cara más alta tiene probabilidad 0 o 1, k es siempre 0 o n: se
+    devuelve el valor exacto sin muestrear ('degenerada') y sin comparar con
+    el Monte Carlo simple, que tampoco tendría varianza.
+    """
+    n = especificacion.num_dados
+    if not 0 <= minimo <= n:
+        raise ValueError(f"El mínimo debe estar entre 0 y {n}")
+    p = float(especificacion.probabilidades[-1])
+    if p in (0.0, 1.0):
+        exacta = float(minimo <= (n if p == 1.0 else 0))
+        return {
+            'dados': str(especificacion),
+            'caras': especificacion.caras,
+            'minimo': minimo,
+            'estimacion': exacta,
+            'error_estandar': 0.0,
+            'error_relativo': 0.0,
+            'tamano_efectivo': 0.0,
+            'lanzamientos': 0,
+            'en_evento': 0,
+            'probabilidad_original': p,
+            'probabilidad_inclinada': p,
+            'exacta': exacta,
+            'lanzamientos_mc_equivalentes': None,
+            'degenerada': True,
+        }
+    q = probabilidad_inclinada if probabilidad_inclinada is not None else probabilidad_inclinada_optima(n, minimo, p)
+    if not 0 < q <= 1:
+        raise ValueError("La probabilidad inclinada debe estar en (0, 1]")
+
+    # Peso de cada número de caras más altas k = 0..n, en logaritmos para no desbordar con muchos dados
+    # (los términos con exponente 0 valen 0 aunque p o q sean 0 o 1)
+    k = np.arange(n + 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_pesos = (np.where(k > 0, k * (np.log(p) - np.log(q)), 0.0)
+                     + np.where(k < n, (n - k) * (np.log1p(-p) - np.log1p(-q)), 0.0))
+    pesos = np.where(k >= minimo, np.exp(log_pesos), 0.0)
+
+    conteos = np.zeros(n + 1, dtype=np.int64)
+    hechos = 0
+    while hechos < lanzamientos:
+        # Bloques que se duplican: la parada por error relativo se pasa como mucho al doble
+        m = min(tamano_bloque, max(hechos, MINIMO_LANZAMIENTOS), lanzamientos - hechos)
+        conteos += np.bincount(rng.binomial(n, q, size=m), minlength=n + 1)
+        hechos += m
+        if error_relativo is not None and hechos >= MINIMO_LANZAMIENTOS:
+            estimacion, error = _media_y_error(conteos, pesos, hechos)
+            if estimacion > 0 and error / estimacion <= error_relativo:
+                break
+
+    estimacion, error = _media_y_error(conteos, pesos, hechos)
+    # Tamaño efectivo de Kish de los lanzamientos del evento: (Σw)² / Σw²
+    suma, suma_cuadrados = conteos @ pesos, conteos @ pesos ** 2
+    efectivo = float(suma ** 2 / suma_cuadrados) if suma_cuadrados > 0 else 0.0
+    exacta = float(sum(distribucion_binomial(n, p)[minimo:]))
+    relativo = error / estimacion if estimacion > 0 else float('inf')
+    return {
+        'dados': str(especificacion),
+        'caras': especificacion.caras,
+        'minimo': minimo,
+        'estimacion': estimacion,
+        'error_estandar': error,
+        'error_relativo': relativo,
+        'tamano_efectivo': efectivo,
+        'lanzamientos': hechos,
+        'en_evento': int(conteos[minimo:].sum()),
+        'probabilidad_original': p,
+        'probabilidad_inclinada': q,
+        'exacta': exacta,
+        # Lanzamientos que necesitaría el Monte Carlo simple para el mismo error relativo: (1 - P) / (P · r²);
+        # None si no se puede comparar (evento imposible o seguro, o estimación sin error con q = 1)
+        'lanzamientos_mc_equivalentes': (1 - exacta) / (exacta * relativo ** 2) if 0 < exacta < 1 and 0 < relativo < float('inf') else None,
+        'degenerada': False,
+    }
+
+
+def _media_y_error(conteos: np.ndarray, pesos: np.ndarray, lanzamientos: int):
+    """Media de los pesos por lanzamiento y su error estándar, desde el histograma de k."""
+    media = float(conteos @ pesos / lanzamientos)
+    if lanzamientos < 2:
+        return media, float('inf')
+    varianza = max(float(conteos @ (pesos - media) ** 2) / (lanzamientos - 1), 0.0)
+    return media, sqrt(varianza / lanzamientos)
+
+
+def texto_evento_raro(estimacion: Dict[str, float]) -> str:
+    """Bloque del informe de análisis con una estimación de estimar_evento_raro."""
+    texto = (f" EVENTO RARO POR MUESTREO POR IMPORTANCIA - al menos {estimacion['minimo']} × {estimacion['caras']}"
+             f" en {estimacion['dados']}\n")
+    texto += "─" * 50 + "\n"
+    if estimacion['degenerada']:
+        texto += (f"   P(cara más alta) = {estimacion['probabilidad_original']:.0f}: probabilidad exacta "
+                  f"{estimacion['exacta']:.0f}, sin muestreo\n\n")
+        return texto
+    texto += f"   Estimación:        {estimacion['estimacion']:.6e} ± {estimacion['error_estandar']:.2e} (error relativo {estimacion['error_relativo']:.2%})\n"
+    texto += f"   Teórica:           {estimacion['exacta']:.6e}\n"
+    texto += f"   Lanzamientos:      {estimacion['lanzamientos']:,} ({estimacion['en_evento']:,} en el evento)\n"
+    texto += f"   Tamaño efectivo:   {estimacion['tamano_efectivo']:,.0f}\n"
+    texto += f"   P(cara más alta):  {estimacion['probabilidad_original']:.4f} → {estimacion['probabilidad_inclinada']:.4f} (inclinada)\n"
+    if estimacion['lanzamientos_mc_equivalentes'] is not None:
+        texto += (f"   Monte Carlo simple necesitaría unos {estimacion['lanzamientos_mc_equivalentes']:,.0f} lanzamientos "
+                  f"({estimacion['lanzamientos_mc_equivalentes'] / estimacion['lanzamientos']:,.0f} veces más)\n")
+    texto += "\n"
+    return texto
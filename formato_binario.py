@@ -0,0 +1,127 @@
+import json
+import os
+from datetime import datetime
+from typing import Dict
+
+import numpy as np
+
+from result_store import BloquesCongelados, especificacion_guardada
+
+
+# Formato de exportación completo de una sesión de DiceSimulator:
+#  - sin comprimir: un directorio con un .npy por arreglo y cabecera.json;
+#    cada .npy se puede abrir con np.load(..., mmap_mode='r')
+#  - comprimido: un único .npz con los mismos arreglos y la cabecera como texto
+VERSION_FORMATO = 1
+CABECERA = 'cabecera.json'
+
+
+def _guardar_npy_por_bloques(ruta: str, datos: BloquesCongelados):
+    """Escribe un arreglo por bloques en un .npy sin concatenarlo en memoria."""
+    salida = np.lib.format.open_memmap(ruta, mode='w+', dtype=datos.dtype,
+                                       shape=(len(datos),) + datos._forma_vacia()[1:])
+    inicio = 0
+    for bloque in datos.iter_bloques():
+        salida[inicio:inicio + len(bloque)] = bloque
+        inicio += len(bloque)
+    salida.flush()
+    del salida
+
+
+def _cabecera(simulador, versiones: Dict) -> Dict:
+    secuencia = simulador.secuencia_semilla
+    return {
+        'version': VERSION_FORMATO,
+        'timestamp_exportacion': datetime.now().isoformat(),
+        'total_lanzamientos': {clave: version.total for clave, version in versiones.items()},
+        'historial_simulaciones': simulador.historial_simulaciones,
+        # Resultados del informe que no viven en los almacenes
+        'eventos_raros': simulador.eventos_raros,
+        'reducciones_varianza': simulador.reducciones_varianza,
+        'replicas_bondad': simulador.replicas_bondad,
+        'semilla': simulador.semilla_random,
+        'generador': simulador.generador_bits,
+        'estado_generador': simulador.estado_generador(),
+        'secuencia_semilla': {
+            'entropia': secuencia.entropy,
+            'spawn_key': list(secuencia.spawn_key),
+            'hijos': secuencia.n_children_spawned,
+        },
+        'almacenes': {},
+    }
+
+
+def exportar(simulador, ruta: str, comprimir: bool = False):
+    """Guarda la sesión completa: lanzamientos, índices de conteo, generador, historial y estimaciones del informe."""
+    # Versiones publicadas: se puede exportar mientras otro hilo sigue simulando
+    versiones = simulador.versiones()
+    cabecera = _cabecera(simulador, versiones)
+    arreglos = {}
+    for clave, store in versiones.items():
+        meta, indices = store.exportar_estado()
+        cabecera['almacenes'][clave] = meta
+        arreglos.update({f'{nombre}_{clave}': arreglo for nombre, arreglo in indices.items()})
+
+    if comprimir:
+        for clave, store in versiones.items():
+            arreglos[f'caras_{clave}'] = store.caras.to_numpy()
+            arreglos[f'seises_{clave}'] = store.seises.to_numpy()
+        np.savez_compressed(ruta, cabecera=np.array(json.dumps(cabecera, ensure_ascii=False)), **arreglos)
+        return
+
+    os.makedirs(ruta, exist_ok=True)
+    for nombre, arreglo in arreglos.items():
+        np.save(os.path.join(ruta, f'{nombre}.npy'), arreglo)
+    for clave, store in versiones.items():
+        _guardar_npy_por_bloques(os.path.join(ruta, f'caras_{clave}.npy'), store.caras)
+        _guardar_npy_por_bloques(os.path.join(ruta, f'seises_{clave}.npy'), store.seises)
+    # La cabecera se escribe al final: su presencia indica una exportación completa
+    with open(os.path.join(ruta, CABECERA), 'w', encoding='utf-8') as f:
+        json.dump(cabecera, f, ensure_ascii=False)
+
+
+def abrir(ruta: str):
+    """(cabecera, arreglos) de una exportación; los .npy de un directorio se abren como memmap."""
+    if os.path.isdir(ruta):
+        with open(os.path.join(ruta, CABECERA), encoding='utf-8') as f:
+            cabecera = json.load(f)
+        arreglos = {nombre[:-4]: np.load(os.path.join(ruta, nombre), mmap_mode='r')
+                    for nombre in os.listdir(ruta) if nombre.endswith('.npy')}
+    else:
+        with np.load(ruta) as datos:
+            arreglos = {nombre: datos[nombre] for nombre in datos.files}
+        cabecera = json.loads(str(arreglos.pop('cabecera')))
+    if cabecera.get('version') != VERSION_FORMATO:
+        raise ValueError(f"Versión de formato no soportada: {cabecera.get('version')}")
+    return cabecera, arreglos
+
+
+def importar(simulador, ruta: str):
+    """Restaura en `simulador` una sesión guardada con exportar().
+
+    Reemplaza la sesión actual: se vacían todos los almacenes (también los
+    de configuraciones que no están en el archivo) y las estimaciones del
+    informe antes de cargar las guardadas.
+    """
+    cabecera, arreglos = abrir(ruta)
+    simulador.limpiar_resultados()
+    for clave, meta in cabecera['almacenes'].items():
+        indices = {nombre: arreglos[f'{nombre}_{clave}'] for nombre in
+                   ('indice_conjunto', 'indice_caras', 'indice_seises', 'indice_sumas', 'conteos_valores',
+                    'convergencia_lanzamientos', 'convergencia_conteos')
+                   if f'{nombre}_{clave}' in arreglos}
+        # Las configuraciones distintas de 1, 2 y 3 dados de 6 caras se crean al importarlas
+        simulador.almacen(especificacion_guardada(meta)).importar_estado(meta, indices, arreglos[f'caras_{clave}'],
+                                                                        arreglos[f'seises_{clave}'])
+
+    secuencia = cabecera['secuencia_semilla']
+    simulador.semilla_random = cabecera['semilla']
+    simulador.secuencia_semilla = np.random.SeedSequence(secuencia['entropia'],
+                                                         spawn_key=tuple(secuencia['spawn_key']),
+                                                         n_children_spawned=secuencia['hijos'])
+    simulador.restaurar_estado_generador(cabecera['estado_generador'])
+    simulador.historial_simulaciones = cabecera['historial_simulaciones']
+    # Exportaciones anteriores no guardan estas listas
+    simulador.eventos_raros = cabecera.get('eventos_raros', [])
+    simulador.reducciones_varianza = cabecera.get('reducciones_varianza', [])
+    simulador.replicas_bondad = cabecera.get('replicas_bondad', [])
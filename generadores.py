@@ -0,0 +1,44 @@
+from typing import Dict
+
+import numpy as np
+
+
+# Generadores de bits disponibles para DiceSimulator
+GENERADORES_BITS = {
+    'PCG64': np.random.PCG64,
+    'PCG64DXSM': np.random.PCG64DXSM,
+    'Philox': np.random.Philox,
+    'SFC64': np.random.SFC64,
+}
+
+GENERADOR_POR_DEFECTO = 'PCG64'
+
+
+def crear_generador(semilla: np.random.SeedSequence, nombre: str = GENERADOR_POR_DEFECTO) -> np.random.Generator:
+    """Generator de numpy con el generador de bits elegido."""
+    try:
+        clase = GENERADORES_BITS[nombre]
+    except KeyError:
+        raise ValueError(f"Generador de bits desconocido: {nombre} "
+                         f"(opciones: {', '.join(GENERADORES_BITS)})") from None
+    return np.random.Generator(clase(semilla))
+
+
+def estado_serializable(estado: Dict) -> Dict:
+    """Copia del estado de un generador de bits apta para JSON (arreglos como listas)."""
+    return {clave: estado_serializable(valor) if isinstance(valor, dict)
+            else valor.tolist() if isinstance(valor, np.ndarray) else valor
+            for clave, valor in estado.items()}
+
+
+def restaurar_generador(estado: Dict) -> np.random.Generator:
+    """Reconstruye un Generator en el estado guardado por estado_serializable."""
+    bits = GENERADORES_BITS[estado['bit_generator']]()
+    bits.state = _estado_numpy(estado)
+    return np.random.Generator(bits)
+
+
+def _estado_numpy(estado: Dict) -> Dict:
+    return {clave: _estado_numpy(valor) if isinstance(valor, dict)
+            else np.array(valor, dtype=np.uint64) if isinstance(valor, list) else valor
+            for clave, valor in estado.items()}
@@ -1,13 +1,65 @@
-import matplotlib.pyplot as plt
+import matplotlib
+import matplotlib.style
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
+import numpy as np
 import tkinter as tk
-from collections import Counter
+
+from especificacion import EspecificacionDados
+
+
+# Cambios de tamaño (en píxeles) por debajo de los cuales no se redibuja
+UMBRAL_REDIMENSION = 8
+# Tiempo sin eventos <Configure> tras el que se dibuja a calidad completa
+PAUSA_REDIMENSION_MS = 200
+# Color de la curva de convergencia de cada panel de configuración
+COLORES_CONVERGENCIA = ('#0984E3', '#27AE60', '#E74C3C')
+# Configuraciones de los paneles 0, 1 y 2 mientras no se simule otra
+ESPECIFICACIONES_PANELES = (EspecificacionDados(1), EspecificacionDados(2), EspecificacionDados(3))
+# Por encima de estas categorías se deja que matplotlib elija las marcas del eje x
+MAX_MARCAS = 20
+# Sumas con probabilidad teórica por debajo de esta fracción de la moda no se dibujan (salvo si se observaron)
+UMBRAL_SUMAS = 1e-6
+
+
+def nombre_configuracion(especificacion: EspecificacionDados, plural: str = 'Dados') -> str:
+    """'1 Dado', '3 Dados' para dados de 6 caras sin cargar; '3d20', '2d6:1,...' para los demás."""
+    if especificacion.clave != str(especificacion.num_dados):
+        return str(especificacion)
+    return f"1 {plural[:-1]}" if especificacion.num_dados == 1 else f"{especificacion.num_dados} {plural}"
+
+
+def etiqueta_maximos(k: int, caras: int) -> str:
+    """Categoría de k caras máximas por lanzamiento ('2 seises' con dados de 6 caras)."""
+    if caras == 6:
+        return '1 seis' if k == 1 else f'{k} seises'
+    return f'{k} × {caras}'
+
+
+def crear_ejes(fig, **gridspec_kw):
+    """Los cuatro paneles 2x2 y, debajo, el de convergencia y el de la suma de los dados."""
+    rejilla = fig.add_gridspec(3, 2, **gridspec_kw)
+    axes = np.array([[fig.add_subplot(rejilla[fila, columna]) for columna in range(2)] for fila in range(2)])
+    return axes, fig.add_subplot(rejilla[2, 0]), fig.add_subplot(rejilla[2, 1])
+
+
+def imagen_ppm(rgb, width, height):
+    """PPM binario de una imagen RGB escalada (vecino más cercano) a width x height."""
+    filas = np.arange(height) * rgb.shape[0] // height
+    columnas = np.arange(width) * rgb.shape[1] // width
+    escalada = rgb[filas[:, None], columnas]
+    return b'P6 %d %d 255 ' % (width, height) + escalada.tobytes()
+
 
 class GraphManager:
-    def __init__(self, parent_frame, colores):
+    def __init__(self, parent_frame, colores, especificaciones=None):
+        # Sin parent_frame (None) la figura se dibuja en un lienzo Agg sin ventana (benchmarks, exportar)
         self.parent_frame = parent_frame
         self.colores = colores
+        # Qué configuración muestra cada uno de los paneles 0, 1 y 2 (la lista se
+        # puede compartir y modificar desde fuera: se lee en cada actualización)
+        self.especificaciones = especificaciones if especificaciones is not None else list(ESPECIFICACIONES_PANELES)
         self.tooltip_data = {}
         self.setup_matplotlib()
         self.create_graphs()
@@ -15,22 +67,36 @@ class GraphManager:
  
     def setup_matplotlib(self):
         """Configurar matplotlib con tema personalizado."""
-        plt.style.use('default')
-        plt.rcParams['figure.facecolor'] = '#ECF0F1'
-        plt.rcParams['axes.facecolor'] = '#FFFFFF'
-        plt.rcParams['text.color'] = '#2C3E50'
-        plt.rcParams['axes.labelcolor'] = '#2C3E50'
-        plt.rcParams['axes.edgecolor'] = '#2C3E50'
-        plt.rcParams['xtick.color'] = '#2C3E50'
-        plt.rcParams['ytick.color'] = '#2C3E50'
-        plt.rcParams['font.size'] = 9
+        # rcParams de matplotlib y no de pyplot: no hace falta cargar pyplot
+        matplotlib.style.use('default')
+        matplotlib.rcParams['figure.facecolor'] = '#ECF0F1'
+        matplotlib.rcParams['axes.facecolor'] = '#FFFFFF'
+        matplotlib.rcParams['text.color'] = '#2C3E50'
+        matplotlib.rcParams['axes.labelcolor'] = '#2C3E50'
+        matplotlib.rcParams['axes.edgecolor'] = '#2C3E50'
+        matplotlib.rcParams['xtick.color'] = '#2C3E50'
+        matplotlib.rcParams['ytick.color'] = '#2C3E50'
+        matplotlib.rcParams['font.size'] = 9
         
         # IMPORTANTE: Configurar interactividad para evitar artefactos
-        plt.rcParams['figure.autolayout'] = False
-        plt.rcParams['toolbar'] = 'None'
+        matplotlib.rcParams['figure.autolayout'] = False
+        matplotlib.rcParams['toolbar'] = 'None'
 
     def create_graphs(self):
         """Crear la figura y canvas para los gráficos."""
+        # Crear la figura de Matplotlib con configuración específica
+        self.fig = Figure(figsize=(10, 10), dpi=80, facecolor='#ECF0F1')
+        self.axes, self.ax_convergencia, self.ax_suma = crear_ejes(
+            self.fig, hspace=0.4, wspace=0.3, left=0.08,
+            right=0.95, top=0.88, bottom=0.12
+        )
+        self.fig.suptitle('Análisis Visual Completo de Resultados',
+                         fontsize=14, fontweight='bold', color='#2C3E50')
+        if self.parent_frame is None:
+            self.canvas = FigureCanvasAgg(self.fig)
+            self.clear_all_graphs()
+            return
+
         # Frame contenedor principal
         self.container_frame = tk.Frame(self.parent_frame, bg=self.colores['bg_frame'])
         self.container_frame.grid(row=0, column=0, sticky='nsew')
@@ -41,19 +107,12 @@ class GraphManager:
         self.container_frame.grid_rowconfigure(0, weight=1)
         self.container_frame.grid_columnconfigure(0, weight=1)
 
-        # Crear la figura de Matplotlib con configuración específica
-        self.fig = Figure(figsize=(10, 7), dpi=80, facecolor='#ECF0F1')
-        self.axes = self.fig.subplots(2, 2, gridspec_kw={
-            'hspace': 0.4, 'wspace': 0.3, 'left': 0.08,
-            'right': 0.95, 'top': 0.88, 'bottom': 0.12
-        })
-        self.fig.suptitle('Análisis Visual Completo de Resultados',
-                         fontsize=14, fontweight='bold', color='#2C3E50')
-
         # Crear el canvas con configuración específica para evitar artefactos
         self.canvas = FigureCanvasTkAgg(self.fig, self.container_frame)
         self.canvas_widget = self.canvas.get_tk_widget()
-        self.canvas_widget.grid(row=0, column=0, sticky='nsew')
+        # Tamaño fijado por resize_figure (no sigue al contenedor): así el lienzo
+        # solo se vuelve a dibujar cuando termina un redimensionamiento
+        self.canvas_widget.grid(row=0, column=0, sticky='nw')
         
         # para evitar artefactos visuales
         self.canvas_widget.configure(
@@ -71,20 +130,14 @@ class GraphManager:
         self.parent_frame.bind('<Configure>', self.on_parent_configure)
         self.last_size = (0, 0)
         self.resize_job = None
+        # Imagen escalada que tapa la figura mientras se redimensiona
+        self.vista_previa = tk.Label(self.container_frame, bd=0, highlightthickness=0, bg=self.colores['bg_frame'])
+        self.mapa_cache = None
+        self.foto_previa = None
+        self.canvas.mpl_connect('draw_event', self._ocultar_vista_previa)
         self.parent_frame.after(100, self.force_initial_resize)
         self.clear_all_graphs()
 
-    def clear_all_graphs(self):
-        """Limpiar todos los gráficos."""
-        for ax in self.axes.flat:
-            ax.clear()
-            ax.set_facecolor('#FFFFFF')  # Fondo blanco consistente
-            ax.grid(True, alpha=0.3, linestyle='--')
-        
-        # Forzar redibujado para evitar artefactos
-        self.fig.canvas.draw_idle()
-
-
     def on_hover(self, event):
         """Handle mouse hover events to display tooltips."""
         if event.inaxes is None:
@@ -169,39 +222,59 @@ class GraphManager:
                 self.schedule_resize(width, height)
     
     def schedule_resize(self, width, height):
-        """Programar redimensionamiento para evitar múltiples llamadas"""
+        """Programar redimensionamiento para evitar múltiples llamadas.
+
+        Mientras el usuario arrastra se muestra la última imagen escalada y la
+        figura solo se vuelve a dibujar cuando el tamaño deja de cambiar
+        durante PAUSA_REDIMENSION_MS. Los cambios menores que UMBRAL_REDIMENSION
+        píxeles respecto al último dibujo se ignoran.
+        """
+        if (abs(width - self.last_size[0]) < UMBRAL_REDIMENSION
+                and abs(height - self.last_size[1]) < UMBRAL_REDIMENSION):
+            if self.resize_job:
+                # Se volvió (casi) al tamaño dibujado: basta con la imagen actual
+                self.parent_frame.after_cancel(self.resize_job)
+                self.resize_job = None
+                self._ocultar_vista_previa()
+            return
+        if self.last_size != (0, 0):
+            # Antes del primer dibujo no hay imagen que escalar
+            self._mostrar_vista_previa(width, height)
         if self.resize_job:
             self.parent_frame.after_cancel(self.resize_job)
-        self.resize_job = self.parent_frame.after(50, lambda: self.resize_figure(width, height))
-    
+        self.resize_job = self.parent_frame.after(PAUSA_REDIMENSION_MS, lambda: self.resize_figure(width, height))
+
+    def _mostrar_vista_previa(self, width, height):
+        """Cubrir la figura con el último dibujo escalado a width x height."""
+        if self.mapa_cache is None:
+            # Último dibujo completo; se congela durante todo el arrastre
+            self.mapa_cache = np.asarray(self.canvas.buffer_rgba())[:, :, :3].copy()
+        self.foto_previa = tk.PhotoImage(master=self.container_frame, data=imagen_ppm(self.mapa_cache, width, height))
+        self.vista_previa.configure(image=self.foto_previa)
+        self.vista_previa.place(x=0, y=0)
+        self.vista_previa.lift()
+
+    def _ocultar_vista_previa(self, event=None):
+        if self.mapa_cache is not None:
+            self.vista_previa.place_forget()
+            self.foto_previa = None
+            self.mapa_cache = None
+
     def resize_figure(self, width, height):
-        """Redimensionar la figura según el tamaño del contenedor"""
+        """Redimensionar la figura según el tamaño del contenedor y dibujarla una vez"""
         try:
-            # Remover la verificación de tamaño mínimo que limita el crecimiento
             self.last_size = (width, height)
             dpi = self.fig.dpi
-            
-            # Calcular nuevo tamaño manteniendo proporción
-            width_inch = width / dpi
-            height_inch = height / dpi
-            
-            # Mantener una proporción razonable
-            aspect_ratio = width_inch / height_inch
-            if aspect_ratio > 2.5:
-                height_inch = width_inch / 2.0
-            elif aspect_ratio < 0.7:
-                width_inch = height_inch * 1.0
-            
-            # Actualizar tamaño de la figura
-            self.fig.set_size_inches(width_inch, height_inch, forward=True)
-            
+
             # Ajustar espaciado
-            self.adjust_subplot_spacing(width_inch, height_inch)
-            
-            # Forzar redibujado
-            self.fig.canvas.draw()
-            self.canvas_widget.update_idletasks()
-            
+            self.adjust_subplot_spacing(width / dpi, height / dpi)
+
+            # La figura ocupa el contenedor: el <Configure> del lienzo de matplotlib
+            # ajusta su tamaño y la dibuja; si el lienzo no cambia, se pide aquí
+            if (width, height) != (self.canvas_widget.winfo_width(), self.canvas_widget.winfo_height()):
+                self.canvas_widget.configure(width=width, height=height)
+            else:
+                self.canvas.draw_idle()
         except Exception as e:
             print(f"Error al redimensionar: {e}")
         finally:
@@ -225,223 +298,305 @@ class GraphManager:
                 wspace=0.3, hspace=0.4
             )
     
+    def paneles(self):
+        """Ejes de todos los paneles: los cuatro de la cuadrícula, el de convergencia y el de la suma."""
+        return list(self.axes.flat) + [self.ax_convergencia, self.ax_suma]
+
     def clear_all_graphs(self):
         """Limpiar todos los gráficos"""
-        for ax in self.axes.flat:
-            ax.clear()
-            ax.set_facecolor('#FFFFFF')
-            ax.grid(True, alpha=0.3, linestyle='--')
+        for ax in self.paneles():
+            self._limpiar_panel(ax)
         self.tooltip_data.clear()
-        self.canvas.draw()
-    
+        self.artistas = {}
+        self.firmas = {}
+        # draw_idle: update_graphs dibuja a continuación y, al crear la figura,
+        # ya dibuja el redimensionado inicial
+        self.canvas.draw_idle()
+
+    def _limpiar_panel(self, ax):
+        ax.clear()
+        ax.set_facecolor('#FFFFFF')
+        ax.grid(True, alpha=0.3, linestyle='--')
+
     def update_graphs(self, simulator):
-        """Actualizar todos los gráficos con los datos del simulador"""
-        self.clear_all_graphs()
+        """Actualizar todos los gráficos con los datos del simulador.
+
+        Las barras, etiquetas y leyendas de cada panel se crean una vez por
+        configuración; después solo cambian alturas, textos y límites, y solo
+        en los paneles cuyos datos cambiaron.
+        """
         try:
-            self.plot_single_die(simulator)
-            self.plot_two_dice(simulator)
-            self.plot_three_dice(simulator)
-            self.plot_comparison(simulator)
-            self.canvas.draw()
+            cambiados = 0
+            for idx, ax in enumerate(self.paneles()):
+                datos = self._datos_panel(idx, simulator)
+                firma = datos.get('firma') or (datos['clave'], datos['titulo'], tuple(map(tuple, datos.get('series', ()))))
+                if self.firmas.get(idx) == firma:
+                    continue
+                artistas = self.artistas.get(idx)
+                if artistas is None or artistas['clave'] != datos['clave']:
+                    self._limpiar_panel(ax)
+                    self.artistas[idx] = self._construir_panel(idx, ax, datos)
+                else:
+                    self._refrescar_panel(ax, artistas, datos)
+                self._guardar_tooltip(idx, datos)
+                self.firmas[idx] = firma
+                cambiados += 1
+            if cambiados:
+                self.canvas.draw_idle()
         except Exception as e:
             print(f"Error actualizando gráficos: {e}")
-    
-    def plot_single_die(self, simulator):
-        """Gráfico para 1 dado"""
-        ax = self.axes[0, 0]
-        if not simulator.resultados_1_dado:
-            ax.text(0.5, 0.5, 'Sin datos\npara 1 dado', ha='center', va='center', transform=ax.transAxes, fontsize=12, color='gray')
-            ax.set_title('1 Dado - Sin datos')
+
+    def _datos_panel(self, idx, simulator):
+        """Lo que muestra un panel: clave de configuración, series de alturas y textos.
+
+        Paneles: 0, 1 y 2 son las configuraciones de self.especificaciones (por
+        defecto 1, 2 y 3 dados de 6 caras); 3 es la comparación teórica y 4 la
+        convergencia y 5 la suma de los dados frente a su distribución exacta.
+        Una clave None indica un panel sin datos.
+        """
+        if idx == 3:
+            return self._datos_comparacion(simulator)
+        if idx == 4:
+            return self._datos_convergencia(simulator)
+        if idx == 5:
+            return self._datos_suma(simulator)
+        especificacion = self.especificaciones[idx]
+        num_dados, caras = especificacion.num_dados, especificacion.caras
+        nombre = nombre_configuracion(especificacion)
+        total = simulator.total_lanzamientos.get(especificacion.clave, 0)
+        if not total:
+            return {'clave': None, 'titulo': f'{nombre} - Sin datos',
+                    'mensaje': f'Sin datos\npara {nombre_configuracion(especificacion, "dados")}'}
+        if num_dados == 1:
+            valores = list(range(1, caras + 1))
+            return {
+                'clave': especificacion.clave,
+                'titulo': f' {nombre} - Distribución\n({total:,} lanzamientos)',
+                'x': [valores],
+                'series': [simulator.conteo_resultados(especificacion)[1:caras + 1]],
+                'etiquetas': [[f"Cara {i}" for i in valores]],
+            }
+        valores = list(range(num_dados + 1))
+        return {
+            'clave': especificacion.clave,
+            'titulo': f'{nombre} - Numero de {caras}\n({total:,} lanzamientos)',
+            'xlabel': f'Numero de {caras} por lanzamiento',
+            'x': [valores],
+            'series': [simulator.conteo_resultados(especificacion)[:num_dados + 1]],
+            'etiquetas': [[etiqueta_maximos(k, caras) for k in valores]],
+        }
+
+    def _datos_comparacion(self, simulator):
+        """Comparación teórica vs experimental de la mayor configuración con datos."""
+        especificacion = next((e for e in reversed(self.especificaciones)
+                               if simulator.total_lanzamientos.get(e.clave, 0)), None)
+        if especificacion is None:
+            return {'clave': None, 'titulo': 'Comparacion - Sin datos', 'mensaje': 'Sin datos\npara comparacion'}
+        num_dados, caras = especificacion.num_dados, especificacion.caras
+        nombre = nombre_configuracion(especificacion)
+        total = simulator.total_lanzamientos[especificacion.clave]
+        contador = simulator.conteo_resultados(especificacion)
+        prob_teoricas = simulator.calcular_probabilidades_teoricas(especificacion)
+        if num_dados == 1:
+            categorias = list(range(1, caras + 1))
+            prob_exp = [contador[i] / total for i in categorias]
+            prob_teo = [prob_teoricas[f"sacar_{i}"] for i in categorias]
+            etiquetas = [f"Cara {cat}" for cat in categorias]
+            titulo, xlabel = f'{nombre} - Teorica vs Experimental', 'Resultado del dado'
+        else:
+            categorias = [etiqueta_maximos(k, caras) for k in range(num_dados + 1)]
+            prob_exp = [contador[i] / total for i in range(num_dados + 1)]
+            prob_teo = [prob_teoricas[f"{i}_seises"] for i in range(num_dados + 1)]
+            etiquetas = categorias
+            titulo, xlabel = f'{nombre} - Teorica vs Experimental', f'Numero de {caras} por lanzamiento'
+        valores = range(len(categorias))
+        return {
+            'clave': f'comparacion_{especificacion.clave}',
+            'titulo': titulo,
+            'xlabel': xlabel,
+            'categorias': categorias,
+            'x': [[v - 0.35/2 for v in valores], [v + 0.35/2 for v in valores]],
+            'series': [prob_exp, prob_teo],
+            'etiquetas': [[f"{e} (Exp)" for e in etiquetas], [f"{e} (Teo)" for e in etiquetas]],
+        }
+
+    def _datos_convergencia(self, simulator):
+        """Proporción acumulada del evento de cada configuración frente a su valor teórico."""
+        con_datos = [(posicion, e) for posicion, e in enumerate(self.especificaciones)
+                     if simulator.total_lanzamientos.get(e.clave, 0)]
+        if not con_datos:
+            return {'clave': None, 'titulo': 'Convergencia - Sin datos', 'mensaje': 'Sin datos\npara convergencia'}
+        claves = tuple(e.clave for _, e in con_datos)
+        curvas = []
+        for posicion, especificacion in con_datos:
+            lanzamientos, proporciones = simulator.curva_convergencia(especificacion)
+            teoricas = simulator.calcular_probabilidades_teoricas(especificacion)
+            nombre = nombre_configuracion(especificacion, 'dados')
+            caras = especificacion.caras
+            if especificacion.num_dados == 1:
+                etiqueta, teorica = f'{nombre}: P({caras})', teoricas[f'sacar_{caras}']
+            else:
+                etiqueta, teorica = f'{nombre}: P(al menos un {caras})', teoricas['al_menos_1_seis']
+            curvas.append({'etiqueta': etiqueta, 'x': lanzamientos, 'y': proporciones, 'teorica': teorica,
+                           'color': COLORES_CONVERGENCIA[posicion]})
+        return {
+            'clave': ('convergencia',) + claves,
+            'titulo': 'Convergencia - Ley de los Grandes Números',
+            'curvas': curvas,
+            # Las curvas solo cambian cuando cambia algún total
+            'firma': ('convergencia', tuple(simulator.total_lanzamientos[c] for c in claves)),
+        }
+
+    def _datos_suma(self, simulator):
+        """Distribución simulada de la suma frente a la exacta (FFT) de la mayor configuración con sumas."""
+        con_sumas = [e for e in reversed(self.especificaciones) if simulator.total_lanzamientos.get(e.clave, 0)]
+        # Con 1 dado la suma es la cara: se prefiere una configuración de varios dados
+        especificacion = next((e for e in con_sumas if e.num_dados > 1), con_sumas[0] if con_sumas else None)
+        sumas = simulator.conteo_sumas(especificacion) if especificacion is not None else None
+        if sumas is None or not sumas.any():
+            return {'clave': None, 'titulo': 'Suma de los dados - Sin datos', 'mensaje': 'Sin datos\npara la suma'}
+        total = int(sumas.sum())
+        teorica = simulator.distribucion_suma_teorica(especificacion)
+        visibles = np.flatnonzero((teorica >= teorica.max() * UMBRAL_SUMAS) | (sumas > 0))
+        x = np.arange(visibles[0], visibles[-1] + 1)
+        return {
+            'clave': ('suma', especificacion.clave),
+            'titulo': f'{nombre_configuracion(especificacion)} - Suma de los dados\n({total:,} lanzamientos)',
+            'curvas': [
+                {'etiqueta': 'Experimental', 'x': x, 'y': sumas[x] / total, 'color': '#F39C12', 'escalones': True},
+                {'etiqueta': 'Teorica (exacta)', 'x': x, 'y': teorica[x], 'color': '#9B59B6', 'escalones': False},
+            ],
+            'firma': ('suma', especificacion.clave, total),
+        }
+
+    def _construir_panel(self, idx, ax, datos):
+        """Crear los artistas de un panel para su configuración actual."""
+        if datos['clave'] is None:
+            ax.text(0.5, 0.5, datos['mensaje'], ha='center', va='center', transform=ax.transAxes, fontsize=12, color='gray')
+            ax.set_title(datos['titulo'])
+            return {'clave': None}
+        if idx == 0:
+            return self.plot_single_die(ax, datos)
+        if idx == 3:
+            return self.plot_comparison(ax, datos)
+        if idx == 4:
+            return self.plot_convergencia(ax, datos)
+        if idx == 5:
+            return self.plot_suma(ax, datos)
+        return self.plot_seises(ax, datos, '#27AE60' if idx == 1 else '#E74C3C')
+
+    def _artistas_barras(self, ax, datos, contenedores, formato, margen, fontsize):
+        """Etiqueta cada barra (texto vacío si la altura es 0) y devuelve los artistas del panel.
+
+        Con más de MAX_MARCAS barras (grupos grandes de dados) no se etiquetan.
+        """
+        maximo = max((max(serie) for serie in datos['series']), default=0) or 1
+        textos = []
+        for barras, serie in zip(contenedores, datos['series']):
+            if len(serie) > MAX_MARCAS:
+                textos.append([])
+                continue
+            textos.append([ax.text(bar.get_x() + bar.get_width()/2., altura + maximo*margen,
+                                   formato.format(altura) if altura > 0 else '',
+                                   ha='center', va='bottom', fontweight='bold', fontsize=fontsize)
+                           for bar, altura in zip(barras, serie)])
+        return {'clave': datos['clave'], 'barras': contenedores, 'textos': textos,
+                'formato': formato, 'margen': margen}
+
+    def _refrescar_panel(self, ax, artistas, datos):
+        """Cambiar alturas, etiquetas, título y límites sin recrear los artistas."""
+        if 'lineas' in artistas:
+            for linea, curva in zip(artistas['lineas'], datos['curvas']):
+                linea.set_data(curva['x'], curva['y'])
+            ax.title.set_text(datos['titulo'])
+            ax.relim()
+            ax.autoscale_view()
             return
-        
-        contador = Counter(simulator.resultados_1_dado)
-        valores = list(range(1, 7))
-        frecuencias = [contador.get(i, 0) for i in valores]
-        
-        # Store data for tooltip
-        labels = [f"Cara {i}" for i in valores]
-        self.store_tooltip_data(0, valores, frecuencias, labels)
+        maximo = max((max(serie) for serie in datos['series']), default=0) or 1
+        for barras, textos, serie in zip(artistas['barras'], artistas['textos'], datos['series']):
+            for bar, altura in zip(barras, serie):
+                bar.set_height(altura)
+            for bar, texto, altura in zip(barras, textos, serie):
+                texto.set_y(altura + maximo * artistas['margen'])
+                texto.set_text(artistas['formato'].format(altura) if altura > 0 else '')
+        ax.title.set_text(datos['titulo'])
+        ax.relim()
+        ax.autoscale_view()
+
+    def _guardar_tooltip(self, idx, datos):
+        if datos['clave'] is None or 'x' not in datos:
+            self.tooltip_data.pop(idx, None)
+            return
+        self.store_tooltip_data(idx, sum(datos['x'], []), sum(datos['series'], []), sum(datos['etiquetas'], []))
 
-        bars = ax.bar(valores, frecuencias, alpha=0.85, color=['#00B894', '#00CEC9', '#0984E3', '#6C5CE7', '#FD79A8', '#E17055'],
+    def plot_single_die(self, ax, datos):
+        """Gráfico para 1 dado"""
+        valores = datos['x'][0]
+        bars = ax.bar(valores, datos['series'][0], alpha=0.85, color=['#00B894', '#00CEC9', '#0984E3', '#6C5CE7', '#FD79A8', '#E17055'],
               edgecolor='#222f3e', linewidth=2)
         ax.set_facecolor('#f1f2f6')
-        ax.set_title(f' 1 Dado - Distribución\n({len(simulator.resultados_1_dado):,} lanzamientos)', fontweight='bold', fontsize=13, color='#0984E3')
-        ax.set_xlabel('Resultado del dado', fontweight='bold', fontsize=11, color='#636e72')
-        ax.set_ylabel('Frecuencia', fontweight='bold', fontsize=11, color='#636e72')
-        
-        max_freq = max(frecuencias) if frecuencias else 1
-        for bar in bars:
-            height = bar.get_height()
-            if height > 0:
-                ax.text(bar.get_x() + bar.get_width()/2., height + max_freq*0.01, f'{height:,}', ha='center', va='bottom', fontweight='bold', fontsize=8)
-        
-        ax.set_title(f' 1 Dado - Distribución\n({len(simulator.resultados_1_dado):,} lanzamientos)', fontweight='bold', fontsize=13, color='#0984E3')
+        ax.set_title(datos['titulo'], fontweight='bold', fontsize=13, color='#0984E3')
         ax.set_xlabel('Resultado del dado', fontweight='bold', fontsize=11, color='#636e72')
         ax.set_ylabel('Frecuencia', fontweight='bold', fontsize=11, color='#636e72')
-        ax.set_xticks(valores)
+        if len(valores) <= MAX_MARCAS:
+            ax.set_xticks(valores)
         ax.grid(True, alpha=0.3, linestyle='--')
-    
-    def plot_two_dice(self, simulator):
-        """Gráfico para 2 dados"""
-        ax = self.axes[0, 1]
-        if not simulator.resultados_2_dados:
-            ax.text(0.5, 0.5, 'Sin datos\npara 2 dados', ha='center', va='center', transform=ax.transAxes, fontsize=12, color='gray')
-            ax.set_title('2 Dados - Sin datos')
-            return
-        
-        contador = Counter(simulator.resultados_2_dados)
-        valores = list(range(0, 3))
-        frecuencias = [contador.get(i, 0) for i in valores]
-        etiquetas = ['0 seises', '1 seis', '2 seises']
-        
-       
-        self.store_tooltip_data(1, valores, frecuencias, etiquetas)
-
-        bars = ax.bar(valores, frecuencias, alpha=0.8, color='#27AE60', edgecolor='#2C3E50', linewidth=1)
-        max_freq = max(frecuencias) if frecuencias else 1
-        for bar in bars:
-            height = bar.get_height()
-            if height > 0:
-                ax.text(bar.get_x() + bar.get_width()/2., height + max_freq*0.01, f'{height:,}', ha='center', va='bottom', fontweight='bold', fontsize=8)
-
-        ax.set_title(f'2 Dados - Numero de 6\n({len(simulator.resultados_2_dados):,} lanzamientos)', fontweight='bold')
-        ax.set_xlabel('Numero de 6 por lanzamiento', fontweight='bold')
+        return self._artistas_barras(ax, datos, [bars], '{:,}', 0.01, 8)
+
+    def plot_seises(self, ax, datos, color):
+        """Gráfico del número de caras máximas (6 con dados normales) para 2 o más dados"""
+        valores = datos['x'][0]
+        bars = ax.bar(valores, datos['series'][0], alpha=0.8, color=color, edgecolor='#2C3E50', linewidth=1)
+        ax.set_title(datos['titulo'], fontweight='bold')
+        ax.set_xlabel(datos['xlabel'], fontweight='bold')
         ax.set_ylabel('Frecuencia', fontweight='bold')
-        ax.set_xticks(valores)
-        ax.set_xticklabels(etiquetas)
+        if len(valores) <= MAX_MARCAS:
+            ax.set_xticks(valores)
+            ax.set_xticklabels(datos['etiquetas'][0])
         ax.grid(True, alpha=0.3, linestyle='--')
-    
-    def plot_three_dice(self, simulator):
-        """Gráfico para 3 dados"""
-        ax = self.axes[1, 0]
-        if not simulator.resultados_3_dados:
-            ax.text(0.5, 0.5, 'Sin datos\npara 3 dados', ha='center', va='center', transform=ax.transAxes, fontsize=12, color='gray')
-            ax.set_title('3 Dados - Sin datos')
-            return
-        
-        contador = Counter(simulator.resultados_3_dados)
-        valores = list(range(0, 4))
-        frecuencias = [contador.get(i, 0) for i in valores]
-        etiquetas = ['0 seises', '1 seis', '2 seises', '3 seises']
+        return self._artistas_barras(ax, datos, [bars], '{:,}', 0.01, 8)
 
-
-        self.store_tooltip_data(2, valores, frecuencias, etiquetas)
-
-        bars = ax.bar(valores, frecuencias, alpha=0.8, color='#E74C3C', edgecolor='#2C3E50', linewidth=1)
-        max_freq = max(frecuencias) if frecuencias else 1
-        for bar in bars:
-            height = bar.get_height()
-            if height > 0:
-                ax.text(bar.get_x() + bar.get_width()/2., height + max_freq*0.01, f'{height:,}', ha='center', va='bottom', fontweight='bold', fontsize=8)
-
-        ax.set_title(f'3 Dados - Numero de 6\n({len(simulator.resultados_3_dados):,} lanzamientos)', fontweight='bold')
-        ax.set_xlabel('Numero de 6 por lanzamiento', fontweight='bold')
-        ax.set_ylabel('Frecuencia', fontweight='bold')
-        ax.set_xticks(valores)
-        ax.set_xticklabels(etiquetas)
-        ax.grid(True, alpha=0.3, linestyle='--')
-    
-    def plot_comparison(self, simulator):
+    def plot_comparison(self, ax, datos):
         """Gráfico de comparación teórica vs experimental"""
-        if simulator.resultados_3_dados:
-            self.plot_three_dice_comparison(simulator)
-        elif simulator.resultados_2_dados:
-            self.plot_two_dice_comparison(simulator)
-        elif simulator.resultados_1_dado:
-            self.plot_single_die_comparison(simulator)
-        else:
-            ax = self.axes[1, 1]
-            ax.text(0.5, 0.5, 'Sin datos\npara comparacion', ha='center', va='center', transform=ax.transAxes, fontsize=12, color='gray')
-            ax.set_title('Comparacion - Sin datos')
-    
-    def _plot_comparison_bars(self, ax, x, categorias, prob_exp, prob_teo, width=0.35):
-        bars1 = ax.bar([i - width/2 for i in x], prob_exp, width, label='Experimental', alpha=0.8, color='#F39C12', edgecolor='#2C3E50', linewidth=1)
-        bars2 = ax.bar([i + width/2 for i in x], prob_teo, width, label='Teorica', alpha=0.8, color='#9B59B6', edgecolor='#2C3E50', linewidth=1)
-        
-        max_prob = max(max(prob_exp) if prob_exp else [0], max(prob_teo) if prob_teo else [0])
-        for bars in [bars1, bars2]:
-            for bar in bars:
-                height = bar.get_height()
-                if height > 0:
-                    ax.text(bar.get_x() + bar.get_width()/2., height + max_prob*0.02, f'{height:.3f}', ha='center', va='bottom', fontweight='bold', fontsize=7)
-
-    def plot_three_dice_comparison(self, simulator):
-        ax = self.axes[1,1]
-        contador = Counter(simulator.resultados_3_dados)
-        total = len(simulator.resultados_3_dados)
-        prob_teoricas = simulator.calcular_probabilidades_teoricas(3)
-        
-        categorias = ['0 seises', '1 seis', '2 seises', '3 seises']
-        valores = range(len(categorias))
-        prob_exp = [contador.get(i, 0) / total for i in valores]
-        prob_teo = [prob_teoricas[f"{i}_seises"] for i in valores]
-        
-        self._plot_comparison_bars(ax, valores, categorias, prob_exp, prob_teo)
-
-
-        x_pos = [v - 0.35/2 for v in valores] + [v + 0.35/2 for v in valores]
-        y_val = prob_exp + prob_teo
-        labels = [f"{cat} (Exp)" for cat in categorias] + [f"{cat} (Teo)" for cat in categorias]
-        self.store_tooltip_data(3, x_pos, y_val, labels)
-        
-        ax.set_title('3 Dados - Teorica vs Experimental', fontweight='bold')
-        ax.set_xlabel('Numero de 6 por lanzamiento', fontweight='bold')
+        width = 0.35
+        bars1 = ax.bar(datos['x'][0], datos['series'][0], width, label='Experimental', alpha=0.8, color='#F39C12', edgecolor='#2C3E50', linewidth=1)
+        bars2 = ax.bar(datos['x'][1], datos['series'][1], width, label='Teorica', alpha=0.8, color='#9B59B6', edgecolor='#2C3E50', linewidth=1)
+        ax.set_title(datos['titulo'], fontweight='bold')
+        ax.set_xlabel(datos['xlabel'], fontweight='bold')
         ax.set_ylabel('Probabilidad', fontweight='bold')
-        ax.set_xticks(valores)
-        ax.set_xticklabels(categorias, rotation=0, ha='center')
+        if len(datos['categorias']) <= MAX_MARCAS:
+            ax.set_xticks(range(len(datos['categorias'])))
+            ax.set_xticklabels(datos['categorias'])
         ax.legend(loc='upper right')
         ax.grid(True, alpha=0.3, linestyle='--')
-    
-    def plot_two_dice_comparison(self, simulator):
-        ax = self.axes[1,1]
-        contador = Counter(simulator.resultados_2_dados)
-        total = len(simulator.resultados_2_dados)
-        prob_teoricas = simulator.calcular_probabilidades_teoricas(2)
-        
-        categorias = ['0 seises', '1 seis', '2 seises']
-        valores = range(len(categorias))
-        prob_exp = [contador.get(i, 0) / total for i in valores]
-        prob_teo = [prob_teoricas[f"{i}_seises"] for i in valores]
-
-        self._plot_comparison_bars(ax, valores, categorias, prob_exp, prob_teo)
-
-
-        x_pos = [v - 0.35/2 for v in valores] + [v + 0.35/2 for v in valores]
-        y_val = prob_exp + prob_teo
-        labels = [f"{cat} (Exp)" for cat in categorias] + [f"{cat} (Teo)" for cat in categorias]
-        self.store_tooltip_data(3, x_pos, y_val, labels)
-
-        ax.set_title('2 Dados - Teorica vs Experimental', fontweight='bold')
-        ax.set_xlabel('Numero de 6 por lanzamiento', fontweight='bold')
-        ax.set_ylabel('Probabilidad', fontweight='bold')
-        ax.set_xticks(valores)
-        ax.set_xticklabels(categorias)
+        return self._artistas_barras(ax, datos, [bars1, bars2], '{:.3f}', 0.02, 7)
+
+    def plot_convergencia(self, ax, datos):
+        """Proporción acumulada frente al número de lanzamientos (eje logarítmico)"""
+        lineas = []
+        for curva in datos['curvas']:
+            linea, = ax.plot(curva['x'], curva['y'], color=curva['color'], linewidth=1.5, label=curva['etiqueta'])
+            ax.axhline(curva['teorica'], color=curva['color'], linestyle='--', linewidth=1, alpha=0.7)
+            lineas.append(linea)
+        ax.set_xscale('log')
+        ax.set_title(datos['titulo'], fontweight='bold')
+        ax.set_xlabel('Lanzamientos', fontweight='bold')
+        ax.set_ylabel('Proporción acumulada', fontweight='bold')
         ax.legend(loc='upper right')
         ax.grid(True, alpha=0.3, linestyle='--')
-    
-    def plot_single_die_comparison(self, simulator):
-        ax = self.axes[1,1]
-        contador = Counter(simulator.resultados_1_dado)
-        total = len(simulator.resultados_1_dado)
-        prob_teoricas = simulator.calcular_probabilidades_teoricas(1)
-        
-        categorias = list(range(1, 7))
-        valores = range(len(categorias))
-        prob_exp = [contador.get(i, 0) / total for i in categorias]
-        prob_teo = [prob_teoricas[f"sacar_{i}"] for i in categorias]
-
-        self._plot_comparison_bars(ax, valores, categorias, prob_exp, prob_teo)
-
-
-        x_pos = [v - 0.35/2 for v in valores] + [v + 0.35/2 for v in valores]
-        y_val = prob_exp + prob_teo
-        labels = [f"Cara {cat} (Exp)" for cat in categorias] + [f"Cara {cat} (Teo)" for cat in categorias]
-        self.store_tooltip_data(3, x_pos, y_val, labels)
-
-        ax.set_title('1 Dado - Teorica vs Experimental', fontweight='bold')
-        ax.set_xlabel('Resultado del dado', fontweight='bold')
+        return {'clave': datos['clave'], 'lineas': lineas}
+
+    def plot_suma(self, ax, datos):
+        """Frecuencia relativa de cada suma (escalones) y su probabilidad exacta (línea)"""
+        lineas = []
+        for curva in datos['curvas']:
+            linea, = ax.plot(curva['x'], curva['y'], color=curva['color'], label=curva['etiqueta'],
+                             drawstyle='steps-mid' if curva['escalones'] else 'default',
+                             linewidth=1.5 if curva['escalones'] else 2)
+            lineas.append(linea)
+        ax.set_title(datos['titulo'], fontweight='bold')
+        ax.set_xlabel('Suma de los dados', fontweight='bold')
         ax.set_ylabel('Probabilidad', fontweight='bold')
-        ax.set_xticks(valores)
-        ax.set_xticklabels(categorias)
         ax.legend(loc='upper right')
-        ax.grid(True, alpha=0.3, linestyle='--')
\ No newline at end of file
+        ax.grid(True, alpha=0.3, linestyle='--')
+        return {'clave': datos['clave'], 'lineas': lineas}
@@ -1,10 +1,16 @@
+import time
+INICIO = time.perf_counter()
+
+import logging
 import tkinter as tk
 from main_window import SimuladorDados
 
 if __name__ == "__main__":
+    # Tiempos de arranque (nivel INFO)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s: %(message)s")
     try:
         root = tk.Tk()
-        app = SimuladorDados(root)
+        app = SimuladorDados(root, inicio=INICIO)
         root.mainloop()
     except Exception as e:
         print(f"Ocurrió un error al iniciar la aplicación: {e}")
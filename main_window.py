@@ -1,24 +1,48 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, filedialog
+import logging
+import queue
 import threading
 import time
 from datetime import datetime
-from collections import Counter
 import numpy as np
 
-from graph_manager import GraphManager
 from dice_simulator import DiceSimulator
+from especificacion import EspecificacionDados, como_especificacion
+from reduccion_varianza import MUESTREOS
+
+
+logger = logging.getLogger(__name__)
+
+# Refrescos por segundo de los gráficos durante una simulación (0 = solo al terminar)
+FPS_GRAFICOS = (0, 2, 5, 10, 20, 30)
+FPS_GRAFICOS_POR_DEFECTO = 5
+# Con los gráficos en vivo desactivados, la barra de progreso se sigue refrescando a este ritmo
+FPS_PROGRESO = 5
+# Sugerencias del selector de dados: además se puede escribir cualquier especificación
+OPCIONES_DADOS = ("1", "2", "3", "1d20", "3d20", "2d6:1,1,1,1,1,3")
 
 
 class SimuladorDados:
-    def __init__(self, root):
+    def __init__(self, root, inicio=None):
+        # inicio: time.perf_counter() del arranque del proceso, para medir también las importaciones
+        self.inicio = inicio if inicio is not None else time.perf_counter()
         self.root = root
         self.simulator = DiceSimulator()
+        # Último análisis mostrado (InstantaneaAnalisis): la interfaz solo pinta esto
+        self.analisis = self.simulator.analisis()
+        # Configuración de cada panel de 1, 2 y 3+ dados (la lee el GraphManager)
+        self.especificaciones_graficos = [EspecificacionDados(n) for n in (1, 2, 3)]
         self.setup_window()
         self.setup_colors()
         self.setup_styles()
         self.create_widgets()
         self.simulacion_activa = False
+        logger.info("Inicio: interfaz construida en %.0f ms", (time.perf_counter() - self.inicio) * 1000)
+        self.root.after_idle(self._registrar_ventana_lista)
+
+    def _registrar_ventana_lista(self):
+        logger.info("Inicio: ventana interactiva en %.0f ms", (time.perf_counter() - self.inicio) * 1000)
 
     def setup_window(self):
         """Configurar ventana principal."""
@@ -31,6 +55,7 @@ class SimuladorDados:
     def on_closing(self):
         """Manejar el cierre de la aplicación."""
         if messagebox.askokcancel("Salir", "¿Estás seguro de que quieres salir?"):
+            self.simulator.cerrar()
             self.root.destroy()
 
     def setup_colors(self):
@@ -132,11 +157,42 @@ class SimuladorDados:
         self.entry_lanzamientos.insert(0, "10000")
         self.entry_lanzamientos.grid(row=0, column=1, sticky='w', padx=5, pady=3)
 
-        tk.Label(controls_frame, text="Número de dados:", font=('Segoe UI', 9, 'bold'),
+        tk.Label(controls_frame, text="Dados (N, NdC o NdC:pesos):", font=('Segoe UI', 9, 'bold'),
                  bg=self.colores['bg_frame'], fg=self.colores['texto_principal']).grid(row=1, column=0, sticky='e', padx=5, pady=3)
-        self.combo_dados = ttk.Combobox(controls_frame, values=[1, 2, 3], state='readonly', width=12)
+        self.combo_dados = ttk.Combobox(controls_frame, values=OPCIONES_DADOS, width=16)
         self.combo_dados.set(3)
         self.combo_dados.grid(row=1, column=1, sticky='w', padx=5, pady=3)
+        self.combo_dados.bind('<<ComboboxSelected>>', self._al_cambiar_dados)
+        self.combo_dados.bind('<Return>', self._al_cambiar_dados)
+
+        # Modo agregado: solo conteos, sin guardar cada lanzamiento
+        self.var_solo_conteos = tk.BooleanVar(value=False)
+        tk.Checkbutton(controls_frame, text="Solo conteos (sin detalle por lanzamiento)",
+                       variable=self.var_solo_conteos, font=('Segoe UI', 9),
+                       bg=self.colores['bg_frame'], fg=self.colores['texto_input'],
+                       activebackground=self.colores['bg_frame']).grid(row=2, column=0, columnspan=2, pady=3)
+
+        # Almacenamiento de la sesión: en memoria o en archivos mapeados en disco
+        tk.Label(controls_frame, text="Almacenamiento:", font=('Segoe UI', 9, 'bold'),
+                 bg=self.colores['bg_frame'], fg=self.colores['texto_principal']).grid(row=3, column=0, sticky='e', padx=5, pady=3)
+        self.combo_almacenamiento = ttk.Combobox(controls_frame, values=["Memoria", "Disco"], state='readonly', width=12)
+        self.combo_almacenamiento.set("Memoria")
+        self.combo_almacenamiento.grid(row=3, column=1, sticky='w', padx=5, pady=3)
+        self.combo_almacenamiento.bind('<<ComboboxSelected>>', self.cambiar_almacenamiento)
+
+        # Gráficos en vivo: instantáneas por segundo que se dibujan durante la simulación
+        tk.Label(controls_frame, text="Gráficos en vivo (fps):", font=('Segoe UI', 9, 'bold'),
+                 bg=self.colores['bg_frame'], fg=self.colores['texto_principal']).grid(row=4, column=0, sticky='e', padx=5, pady=3)
+        self.combo_fps = ttk.Combobox(controls_frame, values=FPS_GRAFICOS, state='readonly', width=12)
+        self.combo_fps.set(FPS_GRAFICOS_POR_DEFECTO)
+        self.combo_fps.grid(row=4, column=1, sticky='w', padx=5, pady=3)
+
+        # Muestreo: simple o con reducción de varianza (estratificado, antitético)
+        tk.Label(controls_frame, text="Muestreo:", font=('Segoe UI', 9, 'bold'),
+                 bg=self.colores['bg_frame'], fg=self.colores['texto_principal']).grid(row=5, column=0, sticky='e', padx=5, pady=3)
+        self.combo_muestreo = ttk.Combobox(controls_frame, values=MUESTREOS, state='readonly', width=24)
+        self.combo_muestreo.set(MUESTREOS[0])
+        self.combo_muestreo.grid(row=5, column=1, sticky='w', padx=5, pady=3)
 
         # Contenido del panel derecho (Acciones)
         tk.Label(right_panel, text="ACCIONES", font=('Segoe UI', 10, 'bold'),
@@ -145,12 +201,25 @@ class SimuladorDados:
         button_container.pack(padx=15, pady=(0, 15))
         self.btn_simular = ttk.Button(button_container, text="SIMULAR", style='Accent.TButton', command=self.iniciar_simulacion)
         self.btn_simular.pack(pady=3)
+        self.btn_cancelar = tk.Button(button_container, text="CANCELAR", font=('Segoe UI', 10, 'bold'),
+                                      bg=self.colores['bg_boton_warning'], fg=self.colores['texto_input'],
+                                      activebackground='#d4ac0d', bd=0, padx=20, pady=6,
+                                      cursor='hand2', state='disabled', command=self.cancelar_simulacion)
+        self.btn_cancelar.pack(pady=3)
         self.btn_limpiar = tk.Button(button_container, text="LIMPIAR", font=('Segoe UI', 10, 'bold'),
                                      bg=self.colores['bg_boton_danger'], fg=self.colores['texto_principal'],
                                      activebackground='#c0392b', bd=0, padx=20, pady=6,
                                      cursor='hand2', command=self.limpiar_todo)
         self.btn_limpiar.pack(pady=3)
 
+        # Progreso de la simulación en curso
+        self.progreso_var = tk.DoubleVar(value=0)
+        self.barra_progreso = ttk.Progressbar(left_panel, variable=self.progreso_var, maximum=100, mode='determinate')
+        self.barra_progreso.pack(fill=tk.X, padx=15, pady=(0, 10))
+        self.evento_cancelar = threading.Event()
+        # Instantáneas (hechos, total, InstantaneaResultados) del hilo de simulación a la GUI
+        self.cola_instantaneas = queue.Queue()
+
         # Barra de estado
         self.status_var = tk.StringVar(value="Listo para simular")
         status_bar = tk.Label(parent, textvariable=self.status_var, relief=tk.SUNKEN, anchor='w',
@@ -211,11 +280,82 @@ class SimuladorDados:
         # Nueva pestaña de Tablas
         self.tables_frame = tk.Frame(self.notebook, bg=self.colores['bg_secundario'])
         self.notebook.add(self.tables_frame, text="TABLAS DE FRECUENCIA")
-        
-        # Inicializar componentes
-        self.graph_manager = GraphManager(self.graph_frame, self.colores)
+
+        # Pestaña de lanzamientos individuales (tabla virtual con filtros)
+        self.detalle_frame = tk.Frame(self.notebook, bg=self.colores['bg_secundario'])
+        self.notebook.add(self.detalle_frame, text="DETALLE POR LANZAMIENTO")
+        self.tabla_detalle = None
+        # La tabla de detalle solo se actualiza visible; si no, se marca para cuando se muestre
+        self.detalle_pendiente = False
+
+        # Los gráficos (matplotlib) y las tablas se crean la primera vez que se muestra su pestaña
+        self.graph_manager = None
         self.create_analysis_area()
+        self.notebook.bind('<<NotebookTabChanged>>', self._al_cambiar_pestana)
+
+    def _al_cambiar_pestana(self, event=None):
+        """Crear el contenido de la pestaña visible si todavía no existe."""
+        actual = self.notebook.select()
+        if actual == str(self.graph_outer) and self.graph_manager is None:
+            # after_idle: primero se pinta la pestaña, luego se importa matplotlib
+            self.root.after_idle(self._asegurar_graficos)
+        elif actual == str(self.tables_frame) and not hasattr(self, 'tables'):
+            self._asegurar_tablas()
+        elif actual == str(self.detalle_frame) and self.tabla_detalle is None:
+            self._asegurar_detalle()
+        elif actual == str(self.detalle_frame) and self.detalle_pendiente:
+            self.actualizar_detalle()
+
+    def _asegurar_graficos(self):
+        """Importar matplotlib y crear el GraphManager en el primer uso."""
+        if self.graph_manager is None:
+            t0 = time.perf_counter()
+            from graph_manager import GraphManager
+            self.graph_manager = GraphManager(self.graph_frame, self.colores, self.especificaciones_graficos)
+            if any(self.analisis.total_lanzamientos.values()):
+                self.graph_manager.update_graphs(self.analisis)
+            logger.info("Gráficos creados en %.0f ms", (time.perf_counter() - t0) * 1000)
+        return self.graph_manager
+
+    def _asegurar_tablas(self):
+        """Crear las tablas de frecuencia en el primer uso y rellenarlas."""
+        t0 = time.perf_counter()
         self.create_frequency_tables()
+        self.actualizar_tablas_mejoradas()
+        logger.info("Tablas creadas en %.0f ms", (time.perf_counter() - t0) * 1000)
+
+    def _asegurar_detalle(self):
+        """Crear la tabla de lanzamientos individuales en el primer uso."""
+        from detalle_lanzamientos import TablaLanzamientos
+        self.tabla_detalle = TablaLanzamientos(self.detalle_frame, self.colores)
+        self.tabla_detalle.pack(fill=tk.BOTH, expand=True)
+        self.actualizar_detalle()
+
+    def _al_cambiar_dados(self, event=None):
+        self.actualizar_tablas_mejoradas()
+        self.actualizar_detalle()
+
+    def especificacion_elegida(self):
+        """EspecificacionDados escrita o elegida en el selector (None si no es válida)."""
+        try:
+            return como_especificacion(self.combo_dados.get())
+        except ValueError:
+            return None
+
+    def actualizar_detalle(self, event=None):
+        """Mostrar en la tabla de detalle los lanzamientos de la configuración elegida.
+
+        Con la pestaña oculta solo se marca como pendiente: un filtro activo
+        recorre todos los lanzamientos y no tiene sentido hacerlo sin verlo.
+        """
+        especificacion = self.especificacion_elegida()
+        if self.tabla_detalle is None or especificacion is None:
+            return
+        if self.notebook.select() != str(self.detalle_frame):
+            self.detalle_pendiente = True
+            return
+        self.detalle_pendiente = False
+        self.tabla_detalle.mostrar(self.simulator.version(especificacion))
 
     def _limit_graph_width(self, event):
         """Ajusta el ancho del frame interno al del canvas."""
@@ -250,47 +390,176 @@ class SimuladorDados:
             messagebox.showerror("Error", "Número de lanzamientos inválido.")
             return
 
-        num_dados = int(self.combo_dados.get())
+        try:
+            especificacion = como_especificacion(self.combo_dados.get())
+        except ValueError as e:
+            messagebox.showerror("Error", f"Dados inválidos: {e}")
+            return
+        # El panel de 1, 2 o 3+ dados pasa a mostrar esta configuración
+        self.especificaciones_graficos[min(especificacion.num_dados, 3) - 1] = especificacion
+        solo_conteos = self.var_solo_conteos.get()
+        muestreo = self.combo_muestreo.get()
+        self.fps_graficos = int(self.combo_fps.get())
+        periodo = 1 / (self.fps_graficos or FPS_PROGRESO)
         self.simulacion_activa = True
         self.btn_simular.config(state='disabled', text="PROCESANDO...")
+        self.btn_cancelar.config(state='normal')
+        # Limpiar o cambiar de almacén escribiría en los almacenes que usa el hilo de simulación
+        self.btn_limpiar.config(state='disabled')
+        self.combo_almacenamiento.config(state='disabled')
+        self.evento_cancelar.clear()
+        self.progreso_var.set(0)
         self.status_var.set(f"Simulando {lanzamientos:,} lanzamientos...")
         
-        thread = threading.Thread(target=self.ejecutar_simulacion, args=(lanzamientos, num_dados))
+        thread = threading.Thread(target=self.ejecutar_simulacion, args=(lanzamientos, especificacion, solo_conteos, periodo, muestreo))
         thread.daemon = True
         thread.start()
+        self.root.after(int(periodo * 1000), self.sondear_instantaneas)
 
-    def ejecutar_simulacion(self, lanzamientos, num_dados):
+    def ejecutar_simulacion(self, lanzamientos, especificacion, solo_conteos=False, periodo=1 / FPS_PROGRESO,
+                            muestreo='simple'):
         """Lógica de la simulación que se ejecuta en el hilo."""
-        self.simulator.simular_dados_vectorizado(lanzamientos, num_dados)
-        self.root.after(0, self.finalizar_simulacion)
-
-    def finalizar_simulacion(self):
-        """Actualizar la GUI cuando la simulación termina."""
-        self.graph_manager.update_graphs(self.simulator)
-        self.actualizar_analisis()
-        self.actualizar_tablas_mejoradas()  # Nueva llamada
+        ultima_publicacion = [0.0]
+
+        def publicar(hechos, total):
+            # Como mucho una instantánea por periodo, por rápido que avance la simulación
+            ahora = time.perf_counter()
+            if ahora - ultima_publicacion[0] >= periodo:
+                ultima_publicacion[0] = ahora
+                self.cola_instantaneas.put((hechos, total, self.simulator.instantanea()))
+
+        error = None
+        if solo_conteos and muestreo == 'simple':
+            if self.simulator.simular_dados_agregado(lanzamientos, especificacion):
+                hechos = lanzamientos
+            else:
+                hechos, error = 0, "la simulación solo conteos falló (ver la consola)"
+        else:
+            # Los muestreos con reducción de varianza generan los lanzamientos aunque no se guarden
+            hechos = self.simulator.simular_por_bloques(
+                lanzamientos, especificacion, guardar_lanzamientos=not solo_conteos,
+                progreso=publicar, cancelar=self.evento_cancelar, muestreo=muestreo)
+            error = self.simulator.historial_simulaciones[-1].get('error')
+        # El análisis (texto, estadísticas y filas de tablas) se prepara aquí, fuera del hilo de Tk
+        analisis = self.simulator.analisis()
+        self.root.after(0, self.finalizar_simulacion, hechos, lanzamientos, analisis, error)
+
+    def sondear_instantaneas(self):
+        """Mostrar la instantánea más reciente del hilo de simulación y volver a programarse.
+
+        Se descartan las intermedias: el coste por refresco no depende de la
+        velocidad de la simulación.
+        """
+        if not self.simulacion_activa:
+            return
+        ultima = self._vaciar_cola_instantaneas()
+        if ultima is not None:
+            hechos, total, instantanea = ultima
+            self.actualizar_progreso(hechos, total)
+            if self.fps_graficos and self.graph_manager is not None:
+                self.graph_manager.update_graphs(instantanea)
+        self.root.after(int(1000 / (self.fps_graficos or FPS_PROGRESO)), self.sondear_instantaneas)
+
+    def _vaciar_cola_instantaneas(self):
+        ultima = None
+        while True:
+            try:
+                ultima = self.cola_instantaneas.get_nowait()
+            except queue.Empty:
+                return ultima
+
+    def actualizar_progreso(self, hechos, total):
+        """Reflejar en la GUI el avance que informa el hilo de simulación."""
+        self.progreso_var.set(hechos / total * 100)
+        self.status_var.set(f"Simulando... {hechos:,} / {total:,} lanzamientos")
+
+    def cancelar_simulacion(self):
+        """Pedir al hilo de simulación que se detenga tras el bloque actual."""
+        self.evento_cancelar.set()
+        self.btn_cancelar.config(state='disabled')
+        self.status_var.set("Cancelando...")
+
+    def finalizar_simulacion(self, hechos=None, lanzamientos=None, analisis=None, error=None):
+        """Mostrar el análisis preparado por el hilo de simulación cuando termina."""
+        self._vaciar_cola_instantaneas()
+        self.mostrar_analisis(analisis)
+        self.actualizar_detalle()
         self.simulacion_activa = False
         self.btn_simular.config(state='normal', text="SIMULAR")
-        self.status_var.set("Simulación completada.")
+        self.btn_cancelar.config(state='disabled')
+        self.btn_limpiar.config(state='normal')
+        self.combo_almacenamiento.config(state='readonly')
+        if error is not None:
+            self.status_var.set(f"Error en la simulación ({hechos:,} de {lanzamientos:,} lanzamientos completados).")
+            messagebox.showerror("Error", f"La simulación se detuvo por un error:\n{error}")
+        elif hechos is not None and hechos < lanzamientos:
+            self.status_var.set(f"Simulación cancelada ({hechos:,} de {lanzamientos:,} lanzamientos).")
+        else:
+            self.progreso_var.set(100)
+            self.status_var.set("Simulación completada.")
         self.notebook.select(0) # Cambiar a la pestaña de gráficos
 
+    def mostrar_analisis(self, analisis=None):
+        """Pintar gráficos, análisis y tablas desde una InstantaneaAnalisis.
+
+        Sin argumento se calcula en el momento (almacén recién adjuntado o
+        vacío: solo lee los índices de conteo).
+        """
+        self.analisis = analisis if analisis is not None else self.simulator.analisis()
+        if self.graph_manager is not None:
+            self.graph_manager.update_graphs(self.analisis)
+        self.actualizar_analisis()
+        self.actualizar_tablas_mejoradas()
+
     def actualizar_analisis(self):
-        """Actualizar el widget de texto con los resultados del análisis."""
+        """Actualizar el widget de texto con el texto del análisis."""
         self.text_analysis.config(state=tk.NORMAL)
         self.text_analysis.delete(1.0, tk.END)
-        texto = f"ANÁLISIS - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        texto += "═" * 80 + "\n\n"
-        texto += self.simulator.analizar_un_dado()
-        texto += self.simulator.analizar_dos_dados()
-        texto += self.simulator.analizar_tres_dados()
-        self.text_analysis.insert(tk.END, texto)
+        self.text_analysis.insert(tk.END, self.analisis.texto)
         self.text_analysis.config(state=tk.DISABLED)
 
+    def cambiar_almacenamiento(self, event=None):
+        """Iniciar una sesión en memoria o crear/adjuntar un almacén en disco."""
+        if self.simulacion_activa:
+            self.combo_almacenamiento.set("Disco" if self.simulator.directorio else "Memoria")
+            return
+        # Una sesión en memoria se pierde al cambiar; la de disco queda en su directorio
+        if (not self.simulator.directorio and any(self.simulator.total_lanzamientos.values())
+                and not messagebox.askyesno("Cambiar almacenamiento",
+                                            "Los lanzamientos de la sesión en memoria se perderán.\n¿Continuar?")):
+            self.combo_almacenamiento.set("Memoria")
+            return
+        generador_bits = self.simulator.generador_bits
+        self.simulator.cerrar()
+        if self.combo_almacenamiento.get() == "Disco":
+            directorio = filedialog.askdirectory(title="Directorio del almacén (nuevo o existente)")
+            if not directorio:
+                self.combo_almacenamiento.set("Disco" if self.simulator.directorio else "Memoria")
+                return
+            try:
+                self.simulator = DiceSimulator(generador_bits, directorio=directorio)
+            except Exception as e:
+                messagebox.showerror("Error", f"No se pudo abrir el almacén:\n{e}")
+                self.combo_almacenamiento.set("Disco" if self.simulator.directorio else "Memoria")
+                return
+            self.status_var.set(f"Almacén en disco: {directorio}")
+        else:
+            self.simulator = DiceSimulator(generador_bits)
+            self.status_var.set("Almacén en memoria.")
+
+        # Un almacén adjuntado ya trae índices de conteo: se muestra sin leer los lanzamientos
+        self.mostrar_analisis()
+        self.actualizar_detalle()
+
     def limpiar_todo(self):
         """Limpiar todos los resultados y gráficos."""
+        if self.simulacion_activa:
+            return
         if messagebox.askyesno("Confirmar", "¿Limpiar todos los resultados?"):
             self.simulator.limpiar_resultados()
-            self.graph_manager.clear_all_graphs()
+            self.analisis = self.simulator.analisis()
+            if self.graph_manager is not None:
+                self.graph_manager.clear_all_graphs()
             self.text_analysis.config(state=tk.NORMAL)
             self.text_analysis.delete(1.0, tk.END)
             self.text_analysis.insert(tk.END, "Resultados limpiados. Listo para nueva simulación.")
@@ -301,7 +570,8 @@ class SimuladorDados:
                 for tree in self.tables.values():
                     for item in tree.get_children():
                         tree.delete(item)
-                        
+            self.actualizar_detalle()
+
             self.status_var.set("Listo para simular.")
 
 
@@ -437,117 +707,14 @@ class SimuladorDados:
         self.tables_canvas.bind('<Leave>', lambda e: self.tables_canvas.unbind_all("<Shift-MouseWheel>"))
 
     def actualizar_tablas_mejoradas(self):
-        """Actualizar todas las tablas con los resultados actuales."""
+        """Rellenar las tablas con las filas ya formateadas del análisis actual."""
         if not hasattr(self, 'tables'):
             return
 
-        num_dados = int(self.combo_dados.get())
-        resultados = getattr(self.simulator, f'resultados_{num_dados}_dado' + ('s' if num_dados > 1 else ''), [])
-
-        if not resultados:
-            return
-
-        # Limpiar tablas existentes
-        for tree in self.tables.values():
+        especificacion = self.especificacion_elegida()
+        filas = self.analisis.tablas.get(especificacion.clave, {}) if especificacion is not None else {}
+        for nombre, tree in self.tables.items():
             for item in tree.get_children():
                 tree.delete(item)
-
-        # Actualizar tabla de resumen
-        total = len(resultados)
-        if num_dados == 1:
-            media = sum(resultados) / total if total > 0 else 0
-            self.tables['resumen'].insert('', tk.END, values=(
-                "Total lanzamientos", f"{total:,}", "Número de experimentos"
-            ))
-            self.tables['resumen'].insert('', tk.END, values=(
-                "Media de caras", f"{media:.4f}", "Promedio de la cara obtenida"
-            ))
-
-            # Tabla de distribución: SOLO 0 o 1 seis
-            seises = sum(1 for x in resultados if x == 6)
-            no_seises = total - seises
-            prob_teoricas = self.simulator.calcular_probabilidades_teoricas(1)
-            # 0 seises
-            self.tables['distribucion'].insert('', tk.END, values=(
-                "0",
-                f"{no_seises:,}",
-                f"{(no_seises / total * 100):.2f}%",
-                f"{no_seises / total:.4f}",
-                f"{5/6:.4f}"
-            ))
-            # 1 seis
-            self.tables['distribucion'].insert('', tk.END, values=(
-                "1",
-                f"{seises:,}",
-                f"{(seises / total * 100):.2f}%",
-                f"{seises / total:.4f}",
-                f"{1/6:.4f}"
-            ))
-
-            # Tabla de frecuencias: frecuencia de cada cara
-            contador = Counter(resultados)
-            esperado = total / 6 if total > 0 else 0
-            for cara in range(1, 7):
-                freq = contador.get(cara, 0)
-                porcentaje = (freq / total * 100) if total > 0 else 0
-                diferencia = freq - esperado
-                self.tables['frecuencias'].insert('', tk.END, values=(
-                    str(cara),
-                    f"{freq:,}",
-                    f"{porcentaje:.2f}%",
-                    f"{esperado:.1f}",
-                    f"{diferencia:+.1f}"
-                ))
-        else:
-            media = sum(resultados) / total if total > 0 else 0
-            self.tables['resumen'].insert('', tk.END, values=(
-                "Total lanzamientos", f"{total:,}", "Número de experimentos"
-            ))
-            self.tables['resumen'].insert('', tk.END, values=(
-                "Media de seises", f"{media:.4f}", "Promedio por lanzamiento"
-            ))
-
-            # Actualizar tabla de distribución
-            contador = Counter(resultados)
-            prob_teoricas = self.simulator.calcular_probabilidades_teoricas(num_dados)
-            for i in range(num_dados + 1):
-                freq = contador.get(i, 0)
-                porcentaje = (freq / total * 100) if total > 0 else 0
-                prob_exp = freq / total if total > 0 else 0
-                prob_teo = prob_teoricas.get(f"{i}_seises", 0)
-                self.tables['distribucion'].insert('', tk.END, values=(
-                    str(i),
-                    f"{freq:,}",
-                    f"{porcentaje:.2f}%",
-                    f"{prob_exp:.4f}",
-                    f"{prob_teo:.4f}"
-                ))
-
-            if hasattr(self.simulator, 'resultados_detallados'):
-                detalles = self.simulator.resultados_detallados.get(str(num_dados), [])
-                caras_contador = Counter()
-                for detalle in detalles:
-                    if isinstance(detalle, dict) and 'dados' in detalle:
-                        if isinstance(detalle['dados'], list):
-                            for cara in detalle['dados']:
-                                caras_contador[cara] += 1
-                        else:
-                            caras_contador[detalle['dados']] += 1
-                    else:
-                        caras_contador[detalle] += 1
-
-                total_caras = sum(caras_contador.values())
-                esperado = total_caras / 6 if total_caras > 0 else 0
-
-                for cara in range(1, 7):
-                    freq = caras_contador.get(cara, 0)
-                    porcentaje = (freq / total_caras * 100) if total_caras > 0 else 0
-                    diferencia = freq - esperado
-
-                    self.tables['frecuencias'].insert('', tk.END, values=(
-                        str(cara),
-                        f"{freq:,}",
-                        f"{porcentaje:.2f}%",
-                        f"{esperado:.1f}",
-                        f"{diferencia:+.1f}"
-                    ))
\ No newline at end of file
+            for valores in filas.get(nombre, ()):
+                tree.insert('', tk.END, values=valores)
@@ -0,0 +1,166 @@
+from dataclasses import replace
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from especificacion import EspecificacionDados
+
+
+# Modos de muestreo: simple (i.i.d.), estratificado por las caras de todos los
+# dados o solo del primero, y antitético (cara f emparejada con caras + 1 - f)
+MUESTREOS = ('simple', 'estratificado_caras', 'estratificado_primer_dado', 'antitetico')
+# Tramos de cada lote equilibrados por separado en los modos estratificados:
+# son las réplicas independientes con las que se estima su varianza
+REPLICAS = 32
+
+
+def _tramos(lanzamientos: int) -> List[np.ndarray]:
+    """Índices de los tramos de un lote (los mismos al muestrear y al medir)."""
+    return np.array_split(np.arange(lanzamientos), min(REPLICAS, max(lanzamientos, 1)))
+
+
+def _columna_equilibrada(rng: np.random.Generator, probabilidades: np.ndarray, lanzamientos: int) -> np.ndarray:
+    """Caras de un dado con cada cara en proporción exacta (muestreo sistemático) y en orden aleatorio.
+
+    Los puntos (i + u) / n con un único u uniforme dan a cada cara el suelo o
+    el techo de n · p; al permutarlos, cada lanzamiento sigue teniendo
+    exactamente la distribución del dado.
+    """
+    puntos = (np.arange(lanzamientos) + rng.random()) / lanzamientos
+    caras = np.searchsorted(np.cumsum(probabilidades)[:-1], puntos, side='right') + 1
+    return rng.permutation(caras).astype(np.uint8)
+
+
+def muestrear(rng: np.random.Generator, especificacion: EspecificacionDados, lanzamientos: int,
+              muestreo: str = 'simple') -> np.ndarray:
+    """Matriz uint8 (lanzamientos x num_dados) con el modo de muestreo pedido.
+
+    Cada lanzamiento tiene la distribución de los dados en todos los modos;
+    lo que cambia es la dependencia entre lanzamientos, que reduce la
+    varianza de las proporciones estimadas.
+    """
+    if muestreo == 'simple':
+        return especificacion.muestrear(rng, lanzamientos)
+    if muestreo == 'antitetico':
+        pesos = especificacion.pesos
+        if pesos is not None and pesos != pesos[::-1]:
+            raise ValueError("El muestreo antitético necesita dados con pesos simétricos (cara f y caras + 1 - f)")
+        mitad = especificacion.muestrear(rng, (lanzamientos + 1) // 2)
+        pares = np.empty((2 * len(mitad), especificacion.num_dados), dtype=np.uint8)
+        pares[0::2] = mitad
+        pares[1::2] = especificacion.caras + 1 - mitad
+        return pares[:lanzamientos]
+    if muestreo in ('estratificado_caras', 'estratificado_primer_dado'):
+        columnas = especificacion.num_dados if muestreo == 'estratificado_caras' else 1
+        caras = np.empty((lanzamientos, especificacion.num_dados), dtype=np.uint8)
+        # Solo los dados sin estratificar se muestrean de forma independiente
+        if columnas < especificacion.num_dados:
+            libres = replace(especificacion, num_dados=especificacion.num_dados - columnas)
+            caras[:, columnas:] = libres.muestrear(rng, lanzamientos)
+        for tramo in _tramos(lanzamientos):
+            for columna in range(columnas):
+                caras[tramo, columna] = _columna_equilibrada(rng, especificacion.probabilidades, len(tramo))
+        return caras
+    raise ValueError(f"Muestreo desconocido: {muestreo!r} (opciones: {', '.join(MUESTREOS)})")
+
+
+class AcumuladorReduccion:
+    """Varianza lograda por un modo de muestreo al estimar el evento de una configuración.
+
+    El evento es el que muestra la curva de convergencia: sacar la cara más
+    alta con 1 dado, al menos una con más. Se acumula por lotes y se compara
+    con la varianza p(1 - p) / n del Monte Carlo simple con los mismos
+    lanzamientos:
+      - antitético: varianza de las medias de cada par;
+      - estratificado: dispersión entre los tramos equilibrados por separado,
+        que son réplicas independientes (incluye el redondeo de la
+        asignación de cada tramo, que la fórmula por estratos ignoraría).
+    """
+
+    def __init__(self, especificacion: EspecificacionDados, muestreo: str):
+        self.especificacion = especificacion
+        self.muestreo = muestreo
+        self.n = 0
+        self.aciertos = 0
+        # Pares antitéticos: número, suma y suma de cuadrados de sus medias
+        self.pares = 0
+        self.suma_pares = 0.0
+        self.suma_cuadrados_pares = 0.0
+        # Réplicas: (lanzamientos, aciertos) de cada tramo
+        self.replicas = []
+
+    def _evento(self, caras: np.ndarray) -> np.ndarray:
+        return (caras == self.especificacion.caras).any(axis=1)
+
+    def agregar(self, caras: np.ndarray):
+        """Incorpora un lote generado con muestrear(..., self.muestreo)."""
+        y = self._evento(caras)
+        self.n += len(y)
+        self.aciertos += int(np.count_nonzero(y))
+        if self.muestreo == 'antitetico':
+            medias = y[:len(y) // 2 * 2].reshape(-1, 2).mean(axis=1)
+            self.pares += len(medias)
+            self.suma_pares += float(medias.sum())
+            self.suma_cuadrados_pares += float(medias @ medias)
+        elif self.muestreo.startswith('estratificado'):
+            self.replicas.extend((len(tramo), int(np.count_nonzero(y[tramo]))) for tramo in _tramos(len(y)))
+
+    def _varianza_muestreo(self, p: float) -> Optional[float]:
+        if self.muestreo == 'simple':
+            return p * (1 - p) / self.n
+        if self.muestreo == 'antitetico':
+            if self.pares < 2:
+                return None
+            media = self.suma_pares / self.pares
+            varianza_pares = max(self.suma_cuadrados_pares - self.pares * media ** 2, 0.0) / (self.pares - 1)
+            return varianza_pares / self.pares
+        if len(self.replicas) < 2:
+            return None
+        tamanos, aciertos = np.array(self.replicas, dtype=np.float64).T
+        # Estimador de razón entre réplicas de tamaños casi iguales
+        r = len(tamanos)
+        return float(((aciertos - p * tamanos) ** 2).sum()) * r / (r - 1) / self.n ** 2
+
+    def resumen(self) -> Dict[str, float]:
+        """Estimación del evento, varianzas con y sin el muestreo y reducción (var MC / var muestreo)."""
+        p = self.aciertos / self.n if self.n else 0.0
+        varianza_mc = p * (1 - p) / self.n if self.n else 0.0
+        varianza = self._varianza_muestreo(p) if self.n else None
+        if varianza is None:
+            reduccion = None
+        elif varianza > 0:
+            reduccion = varianza_mc / varianza
+        else:
+            reduccion = float('inf') if varianza_mc > 0 else 1.0
+        return {
+            'dados': str(self.especificacion),
+            'caras': self.especificacion.caras,
+            'num_dados': self.especificacion.num_dados,
+            'muestreo': self.muestreo,
+            'lanzamientos': self.n,
+            'estimacion': p,
+            'varianza_mc': varianza_mc,
+            'varianza_muestreo': varianza,
+            'reduccion': reduccion,
+        }
+
+
+def texto_reduccion(resumen: Dict[str, float]) -> str:
+    """Bloque del informe de análisis con el resumen de un AcumuladorReduccion."""
+    caras = resumen['caras']
+    evento = f"P({caras})" if resumen['num_dados'] == 1 else f"P(al menos un {caras})"
+    texto = f" REDUCCIÓN DE VARIANZA - muestreo {resumen['muestreo']} en {resumen['dados']} ({resumen['lanzamientos']:,} lanzamientos)\n"
+    texto += "─" * 50 + "\n"
+    texto += f"   {evento}: {resumen['estimacion']:.4f}\n"
+    texto += f"   Error estándar Monte Carlo simple: {np.sqrt(resumen['varianza_mc']):.2e}\n"
+    if resumen['varianza_muestreo'] is None:
+        texto += "   Lanzamientos insuficientes para estimar la varianza del muestreo\n"
+    else:
+        texto += f"   Error estándar con el muestreo:    {np.sqrt(resumen['varianza_muestreo']):.2e}\n"
+        if resumen['reduccion'] == float('inf'):
+            texto += "   Reducción de varianza: total (la estimación no varía entre ejecuciones)\n"
+        else:
+            texto += (f"   Reducción de varianza: {resumen['reduccion']:.2f}x "
+                      f"(equivale a {resumen['reduccion']:.2f} veces más lanzamientos simples)\n")
+    texto += "\n"
+    return texto
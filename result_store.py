@@ -0,0 +1,703 @@
+import copy
+import json
+import os
+import re
+import threading
+import time
+import weakref
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Union
+
+from estadisticas import AcumuladorEstadistico
+from convergencia import TrayectoriaConvergencia
+from especificacion import EspecificacionDados, como_especificacion
+
+
+# Filas por bloque: 1M lanzamientos de 3 dados ocupan ~3 MB por bloque
+TAMANO_BLOQUE = 1 << 20
+# En disco cada bloque es un archivo: bloques más grandes, menos archivos
+TAMANO_BLOQUE_DISCO = 1 << 24
+# Segundos mínimos entre dos escrituras de índices y estado.json durante una simulación en disco
+INTERVALO_PERSISTENCIA = 5.0
+CARAS = 6
+
+
+class _LecturaColumnar:
+    """API de lectura común (len, iteración, índices, numpy) sobre bloques."""
+
+    def iter_bloques(self) -> Iterator[np.ndarray]:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self):
+        for bloque in self.iter_bloques():
+            yield from bloque.tolist()
+
+    def __array__(self, dtype=None, copy=None):
+        datos = self.to_numpy()
+        return datos if dtype is None else datos.astype(dtype, copy=False)
+
+    def __getitem__(self, indice: Union[int, slice]):
+        if isinstance(indice, slice):
+            inicio, fin, paso = indice.indices(len(self))
+            if paso < 0:
+                return self.to_numpy()[indice]
+            return self._leer_rango(inicio, max(inicio, fin))[::paso]
+        n = len(self)
+        if indice < 0:
+            indice += n
+        if not 0 <= indice < n:
+            raise IndexError("índice fuera de rango")
+        return self._leer_fila(indice)
+
+    def _leer_fila(self, indice: int):
+        raise NotImplementedError
+
+    def _leer_rango(self, inicio: int, fin: int) -> np.ndarray:
+        """Copia las filas [inicio, fin) tocando solo los bloques necesarios."""
+        partes = []
+        desplazamiento = 0
+        for bloque in self.iter_bloques():
+            siguiente = desplazamiento + len(bloque)
+            if siguiente > inicio and desplazamiento < fin:
+                partes.append(bloque[max(inicio - desplazamiento, 0):min(fin, siguiente) - desplazamiento])
+            if siguiente >= fin:
+                break
+            desplazamiento = siguiente
+        if not partes:
+            return np.empty(self._forma_vacia(), dtype=np.uint8)
+        return np.concatenate(partes)
+
+    def to_numpy(self) -> np.ndarray:
+        """Devuelve una copia contigua de todos los datos."""
+        bloques = list(self.iter_bloques())
+        if not bloques:
+            return np.empty(self._forma_vacia(), dtype=np.uint8)
+        return np.concatenate(bloques)
+
+    def _forma_vacia(self):
+        return (0,)
+
+    def tolist(self) -> list:
+        return self.to_numpy().tolist()
+
+    def bincount(self, minlength: int = 0) -> np.ndarray:
+        """Histograma de valores acumulado bloque a bloque (sin concatenar)."""
+        conteos = np.zeros(minlength, dtype=np.int64)
+        for bloque in self.iter_bloques():
+            parcial = np.bincount(bloque.ravel(), minlength=minlength)
+            if len(parcial) > len(conteos):
+                parcial[:len(conteos)] += conteos
+                conteos = parcial
+            else:
+                conteos[:len(parcial)] += parcial
+        return conteos
+
+
+class BloquesCongelados(_LecturaColumnar):
+    """Las primeras `longitud` filas de una lista de bloques de tamaño fijo.
+
+    Es la lectura común de ChunkedArray y lo que devuelve ChunkedArray.congelar():
+    comparte la lista de bloques sin copiar datos. ChunkedArray solo escribe
+    filas posteriores a su longitud y al limpiarse reemplaza la lista en vez
+    de vaciarla, así que lo que se ve aquí no cambia después de congelarlo.
+    """
+
+    def __init__(self, bloques: List[np.ndarray], longitud: int, ancho: Optional[int] = None,
+                 dtype=np.uint8, tamano_bloque: int = TAMANO_BLOQUE):
+        self.ancho = ancho
+        self.dtype = np.dtype(dtype)
+        self.tamano_bloque = tamano_bloque
+        self._bloques = bloques
+        self._longitud = longitud
+
+    def _forma_bloque(self, filas: int):
+        return (filas,) if self.ancho is None else (filas, self.ancho)
+
+    def _forma_vacia(self):
+        return self._forma_bloque(0)
+
+    def __len__(self) -> int:
+        return self._longitud
+
+    def iter_bloques(self) -> Iterator[np.ndarray]:
+        restante = self._longitud
+        for bloque in self._bloques:
+            if restante <= 0:
+                break
+            n = min(restante, self.tamano_bloque)
+            yield bloque[:n]
+            restante -= n
+
+    def _leer_fila(self, indice: int):
+        fila = self._bloques[indice // self.tamano_bloque][indice % self.tamano_bloque]
+        return fila.tolist() if self.ancho is not None else int(fila)
+
+    def columna(self, j: int) -> "_VistaColumna":
+        """Vista de solo lectura de la columna j (sin copiar)."""
+        return _VistaColumna(self, j)
+
+
+class ChunkedArray(BloquesCongelados):
+    """Arreglo creciente de uint8 guardado en bloques de tamaño fijo.
+
+    Agregar datos es O(1) amortizado: nunca se reubican los bloques ya
+    llenos, solo se reserva uno nuevo cuando el actual se completa.
+    """
+
+    def __init__(self, ancho: Optional[int] = None, dtype=np.uint8,
+                 tamano_bloque: int = TAMANO_BLOQUE):
+        super().__init__([], 0, ancho=ancho, dtype=dtype, tamano_bloque=tamano_bloque)
+
+    def append(self, valores: np.ndarray):
+        """Agrega un lote de filas al final del arreglo."""
+        valores = np.asarray(valores, dtype=self.dtype)
+        if self.ancho is not None:
+            valores = valores.reshape(-1, self.ancho)
+        pendiente = len(valores)
+        inicio = 0
+        while pendiente > 0:
+            ocupado = self._longitud % self.tamano_bloque
+            if ocupado == 0:
+                self._bloques.append(self._nuevo_bloque())
+            n = min(self.tamano_bloque - ocupado, pendiente)
+            self._bloques[-1][ocupado:ocupado + n] = valores[inicio:inicio + n]
+            self._longitud += n
+            inicio += n
+            pendiente -= n
+
+    def _nuevo_bloque(self) -> np.ndarray:
+        return np.empty(self._forma_bloque(self.tamano_bloque), dtype=self.dtype)
+
+    def congelar(self) -> BloquesCongelados:
+        """Vista de las filas actuales que no ve lo que se agregue después (O(1), sin copiar)."""
+        return BloquesCongelados(self._bloques, self._longitud, ancho=self.ancho,
+                                 dtype=self.dtype, tamano_bloque=self.tamano_bloque)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(bloque.nbytes for bloque in self._bloques)
+
+    def limpiar(self):
+        # Lista nueva: las vistas congeladas conservan la anterior
+        self._bloques = []
+        self._longitud = 0
+
+
+class ChunkedArrayDisco(ChunkedArray):
+    """ChunkedArray cuyos bloques son archivos .npy mapeados en memoria.
+
+    Cada bloque se crea con open_memmap en `directorio`; el sistema operativo
+    decide qué páginas quedan en RAM, así que el tamaño total solo está
+    limitado por el disco. Al reabrir el directorio se adjuntan los bloques
+    existentes; la longitud válida la guarda quien usa el arreglo.
+
+    Los archivos llevan una generación que cambia al limpiar: los bloques
+    nuevos nunca reutilizan un archivo que una vista congelada (VersionAlmacen)
+    pueda seguir mapeando. Los archivos de generaciones anteriores se borran
+    cuando ya nadie los referencia (en Windows no se puede borrar un archivo
+    mapeado); hasta entonces quedan pendientes y se reintenta en cada
+    limpieza o flush.
+    """
+
+    _PATRON_ARCHIVO = re.compile(r'_(?:g(\d+)_)?\d{6}\.npy$')
+
+    def __init__(self, directorio: str, prefijo: str, ancho: Optional[int] = None, dtype=np.uint8,
+                 tamano_bloque: int = TAMANO_BLOQUE_DISCO, longitud: int = 0):
+        super().__init__(ancho=ancho, dtype=dtype, tamano_bloque=tamano_bloque)
+        self.directorio = directorio
+        self.prefijo = prefijo
+        os.makedirs(directorio, exist_ok=True)
+        archivos = self._archivos()
+        generacion = max(archivos.values(), default=0)
+        # Sin lanzamientos válidos ningún archivo existente está en uso: se empieza una generación nueva
+        self.generacion = generacion if longitud else generacion + 1
+        num_bloques = -(-longitud // tamano_bloque)
+        self._bloques = [np.load(self._ruta_bloque(i), mmap_mode='r+') for i in range(num_bloques)]
+        self._longitud = longitud
+        # (ruta, weakref al memmap o None) de los archivos de otras generaciones pendientes de borrar
+        self._obsoletos = [(ruta, None) for ruta, g in archivos.items() if g != self.generacion]
+        self._borrar_obsoletos()
+
+    def _archivos(self) -> Dict[str, int]:
+        """Ruta y generación de los bloques de este arreglo que hay en el directorio."""
+        archivos = {}
+        for nombre in os.listdir(self.directorio):
+            coincidencia = self._PATRON_ARCHIVO.search(nombre)
+            if coincidencia and nombre[:coincidencia.start()] == self.prefijo:
+                archivos[os.path.join(self.directorio, nombre)] = int(coincidencia.group(1) or 0)
+        return archivos
+
+    def _ruta_bloque(self, i: int) -> str:
+        # La generación 0 conserva los nombres de los almacenes anteriores a las generaciones
+        if self.generacion == 0:
+            return os.path.join(self.directorio, f'{self.prefijo}_{i:06d}.npy')
+        return os.path.join(self.directorio, f'{self.prefijo}_g{self.generacion}_{i:06d}.npy')
+
+    def _nuevo_bloque(self) -> np.ndarray:
+        return np.lib.format.open_memmap(self._ruta_bloque(len(self._bloques)), mode='w+', dtype=self.dtype,
+                                         shape=self._forma_bloque(self.tamano_bloque))
+
+    def _borrar_obsoletos(self):
+        """Borra los archivos de generaciones anteriores que ya no mapea ninguna vista."""
+        pendientes = []
+        for ruta, referencia in self._obsoletos:
+            if referencia is not None and referencia() is not None:
+                pendientes.append((ruta, referencia))
+                continue
+            try:
+                os.remove(ruta)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                # Todavía abierto en otro lugar (Windows): se reintenta más tarde
+                pendientes.append((ruta, None))
+        self._obsoletos = pendientes
+
+    def flush(self):
+        for bloque in self._bloques:
+            bloque.flush()
+        # Se llama tras cada escritura persistida: buen momento para reintentar los borrados
+        self._borrar_obsoletos()
+
+    @property
+    def nbytes(self) -> int:
+        # Nada vive en el heap: los bloques son páginas del archivo
+        return 0
+
+    @property
+    def bytes_en_disco(self) -> int:
+        return sum(bloque.nbytes for bloque in self._bloques)
+
+    def limpiar(self):
+        # Las vistas congeladas conservan la lista anterior y siguen leyendo sus archivos
+        self._obsoletos.extend((self._ruta_bloque(i), weakref.ref(bloque)) for i, bloque in enumerate(self._bloques))
+        self._bloques = []
+        self._longitud = 0
+        self.generacion += 1
+        self._borrar_obsoletos()
+
+
+class _VistaColumna(_LecturaColumnar):
+    """Una columna de un ChunkedArray 2D expuesta como secuencia 1D."""
+
+    def __init__(self, base: BloquesCongelados, j: int):
+        self._base = base
+        self._j = j
+
+    def __len__(self) -> int:
+        return len(self._base)
+
+    def iter_bloques(self) -> Iterator[np.ndarray]:
+        for bloque in self._base.iter_bloques():
+            yield bloque[:, self._j]
+
+    def _leer_fila(self, indice: int):
+        return self._base._leer_fila(indice)[self._j]
+
+
+def especificacion_guardada(meta: Dict) -> EspecificacionDados:
+    """Especificación de unos metadatos de exportar_estado (los anteriores solo traen num_dados: d6)."""
+    pesos = meta.get('pesos')
+    return EspecificacionDados(meta['num_dados'], meta.get('caras', CARAS), tuple(pesos) if pesos else None)
+
+
+class _LecturaAlmacen:
+    """Consultas comunes a ResultStore y a sus versiones publicadas (VersionAlmacen)."""
+
+    def __len__(self) -> int:
+        """Lanzamientos guardados individualmente"""
+        return len(self.seises)
+
+    @property
+    def total(self) -> int:
+        """Lanzamientos totales, guardados o solo contados"""
+        return len(self) + self.lanzamientos_agregados
+
+    def _caras_desde_conjunto(self, conjunto: np.ndarray) -> np.ndarray:
+        return np.concatenate(([0], conjunto @ self._caras_por_resultado))
+
+    def _seises_desde_conjunto(self, conjunto: np.ndarray) -> np.ndarray:
+        seises = self._caras_por_resultado[:, -1]
+        return np.bincount(seises, weights=conjunto, minlength=self.num_dados + 1).astype(np.int64)
+
+    def _sumas_desde_conjunto(self, conjunto: np.ndarray) -> np.ndarray:
+        return np.bincount(self._suma_por_resultado, weights=conjunto,
+                           minlength=len(self.indice_sumas)).astype(np.int64)
+
+    def conteo_conjunto(self) -> Optional[np.ndarray]:
+        """Histograma de los caras^n resultados conjuntos (guardados + agregados); None si no se mantiene."""
+        return None if self.indice_conjunto is None else self.indice_conjunto.copy()
+
+    def conteo_caras(self, conjunto: Optional[np.ndarray] = None) -> np.ndarray:
+        """Veces que salió cada cara entre todos los dados; el índice es la cara (0 sin uso)."""
+        if conjunto is None:
+            return self.indice_caras.copy()
+        return self._caras_desde_conjunto(conjunto)
+
+    def conteo_seises(self, conjunto: Optional[np.ndarray] = None) -> np.ndarray:
+        """Lanzamientos con k seises, para k = 0..num_dados."""
+        if conjunto is None:
+            return self.indice_seises.copy()
+        return self._seises_desde_conjunto(conjunto)
+
+    def conteo_sumas(self) -> np.ndarray:
+        """Lanzamientos con cada suma de los dados; el índice es la suma (0..num_dados * caras).
+
+        Cuenta los lanzamientos guardados, los del histograma conjunto y los
+        solo contados con guardar=False; no los de agregar_marginales, en los
+        que la suma no se conoce.
+        """
+        return self.indice_sumas.copy()
+
+    def conteo_valores(self, conjunto: Optional[np.ndarray] = None) -> np.ndarray:
+        """Histograma de `valores`: por cara con 1 dado, por número de seises con más."""
+        if self.num_dados == 1:
+            return self.conteo_caras(conjunto)
+        return self.conteo_seises(conjunto)
+
+    @property
+    def num_caras(self) -> int:
+        return self.especificacion.caras
+
+    @property
+    def valores(self) -> _LecturaColumnar:
+        """Valor analizado por lanzamiento: la cara con 1 dado, los seises con más."""
+        if self.num_dados == 1:
+            return self.caras.columna(0)
+        return self.seises
+
+    @property
+    def detallados(self) -> "DetalleLanzamientos":
+        return DetalleLanzamientos(self)
+
+    def detalle(self, indice: int) -> Dict:
+        return {
+            'lanzamiento': indice + 1,
+            'dados': self.caras[indice],
+            'seises': self.seises[indice]
+        }
+
+    def exportar_estado(self):
+        """(metadatos JSON, arreglos) con todo lo necesario para reconstruir el almacén."""
+        meta = {
+            'num_dados': self.num_dados,
+            'caras': self.especificacion.caras,
+            'pesos': self.especificacion.pesos,
+            'lanzamientos': len(self),
+            'lanzamientos_agregados': self.lanzamientos_agregados,
+            'estadisticas': {'n': self.estadisticas.n, 'media': self.estadisticas.media, 'm2': self.estadisticas.m2},
+        }
+        arreglos = {
+            'indice_caras': self.indice_caras,
+            'indice_seises': self.indice_seises,
+            'indice_sumas': self.indice_sumas,
+            'conteos_valores': self.estadisticas.conteos,
+            'convergencia_lanzamientos': self.convergencia.lanzamientos,
+            'convergencia_conteos': self.convergencia.conteos,
+        }
+        if self.indice_conjunto is not None:
+            arreglos['indice_conjunto'] = self.indice_conjunto
+        return meta, arreglos
+
+
+class ResultStore(_LecturaAlmacen):
+    """Resultados de una configuración de dados en formato columnar.
+
+    Guarda las caras como una matriz uint8 (lanzamientos x num_dados) y el
+    número de seises (la cara más alta) por lanzamiento como un vector uint8
+    (uint16 con más de 255 dados), es decir num_dados + 1 bytes por
+    lanzamiento. Las simulaciones agregadas solo suman su histograma de
+    resultados conjuntos (caras^n contadores) o, si son demasiados, los
+    conteos por cara y por número de seises.
+
+    Los índices de conteo (resultado conjunto, cara, número de seises y suma) se
+    actualizan con np.bincount en cada lote, así que informes, tablas y
+    gráficos nunca vuelven a recorrer los lanzamientos.
+
+    Cada escritura termina publicando una VersionAlmacen con una sola
+    asignación: los lectores de otros hilos usan version() y ven siempre un
+    estado completo, nunca uno a medio agregar. Para que publicar sea O(1)
+    los índices se reemplazan en vez de modificarse en el sitio (copia en
+    escritura) y los bloques de lanzamientos se comparten. Las escrituras
+    (agregar, limpiar, importar) se serializan con un cerrojo que cubre
+    también la publicación: limpiar desde la interfaz no puede intercalarse
+    con un lote del hilo de simulación.
+
+    En disco, agregar guarda índices y estado.json como mucho cada
+    INTERVALO_PERSISTENCIA segundos; quien simula llama a persistir() al
+    terminar (también si cancela o falla) para dejar el estado completo.
+    """
+
+    def __init__(self, especificacion: Union[int, EspecificacionDados], tamano_bloque: int = TAMANO_BLOQUE,
+                 directorio: Optional[str] = None):
+        # Un entero es el número de dados de 6 caras
+        self.especificacion = como_especificacion(especificacion)
+        self.num_dados = num_dados = self.especificacion.num_dados
+        caras = self.especificacion.caras
+        self._dtype_seises = np.uint8 if num_dados < 256 else np.uint16
+        self._dtype_sumas = np.uint16 if num_dados * caras < 1 << 16 else np.int64
+        self.directorio = directorio
+        # Reentrante: agregar_conteos llama a agregar_marginales e importar_estado a limpiar
+        self._cerrojo = threading.RLock()
+        # Última escritura en disco y si hay lotes agregados después
+        self._persistido = time.monotonic()
+        self._sin_persistir = False
+        if directorio is None:
+            self.caras = ChunkedArray(ancho=num_dados, tamano_bloque=tamano_bloque)
+            self.seises = ChunkedArray(dtype=self._dtype_seises, tamano_bloque=tamano_bloque)
+        # Resultados conjuntos posibles (caras^n), codificados en base `caras`
+        self.num_resultados = self.especificacion.num_resultados
+        if self.especificacion.con_indice_conjunto:
+            self._pesos_codigo = caras ** np.arange(num_dados)
+            codigos = np.arange(self.num_resultados)
+            digitos = (codigos[:, None] // self._pesos_codigo) % caras
+            # _caras_por_resultado[r, f] = cuántos dados muestran la cara f+1 en el resultado r
+            self._caras_por_resultado = np.stack([(digitos == f).sum(axis=1) for f in range(caras)], axis=1)
+            self._suma_por_resultado = self._caras_por_resultado @ np.arange(1, caras + 1)
+            self.indice_conjunto = np.zeros(self.num_resultados, dtype=np.int64)
+        else:
+            # Demasiados resultados conjuntos: solo índices por cara, por número de seises y por suma
+            self._pesos_codigo = self._caras_por_resultado = self._suma_por_resultado = self.indice_conjunto = None
+        # Índices de conteo de todos los lanzamientos, guardados o solo contados
+        self.indice_caras = np.zeros(caras + 1, dtype=np.int64)
+        self.indice_seises = np.zeros(num_dados + 1, dtype=np.int64)
+        self.indice_sumas = np.zeros(num_dados * caras + 1, dtype=np.int64)
+        # Lanzamientos de simulaciones agregadas (sin lanzamientos individuales)
+        self.lanzamientos_agregados = 0
+        # Estadísticas de `valores` actualizadas en cada lote
+        self.estadisticas = AcumuladorEstadistico(caras + 1 if num_dados == 1 else num_dados + 1)
+        # Proporciones acumuladas de cada valor en puntos logarítmicos (Ley de los Grandes Números)
+        self.convergencia = TrayectoriaConvergencia(len(self.estadisticas.conteos))
+        if directorio is not None:
+            self._abrir_directorio(directorio)
+        self._publicar()
+
+    def _abrir_directorio(self, directorio: str):
+        """Crea o adjunta un almacén en disco; los índices se leen sin tocar los lanzamientos."""
+        os.makedirs(directorio, exist_ok=True)
+        meta = None
+        ruta_meta = os.path.join(directorio, 'estado.json')
+        if os.path.exists(ruta_meta):
+            with open(ruta_meta, encoding='utf-8') as f:
+                meta = json.load(f)
+            guardada = especificacion_guardada(meta)
+            if guardada != self.especificacion:
+                raise ValueError(f"{directorio} guarda lanzamientos de {guardada}")
+        longitud = meta['lanzamientos'] if meta else 0
+        self.caras = ChunkedArrayDisco(directorio, 'caras', ancho=self.num_dados, longitud=longitud)
+        self.seises = ChunkedArrayDisco(directorio, 'seises', dtype=self._dtype_seises, longitud=longitud)
+        if meta:
+            with np.load(os.path.join(directorio, 'indices.npz')) as arreglos:
+                self._restaurar_indices(meta, arreglos)
+
+    def _persistir(self):
+        """Guarda índices y longitud junto a los bloques para poder adjuntar el almacén después."""
+        if self.directorio is None:
+            return
+        self.caras.flush()
+        self.seises.flush()
+        meta, arreglos = self.exportar_estado()
+        np.savez(os.path.join(self.directorio, 'indices.npz'), **arreglos)
+        # El JSON se escribe al final y de forma atómica: marca un estado consistente
+        temporal = os.path.join(self.directorio, 'estado.json.tmp')
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(temporal, os.path.join(self.directorio, 'estado.json'))
+        self._persistido = time.monotonic()
+        self._sin_persistir = False
+
+    def _persistir_periodico(self):
+        """_persistir tras un lote, como mucho cada INTERVALO_PERSISTENCIA segundos.
+
+        Reescribir los índices en cada lote haría que una simulación larga en
+        disco pasara más tiempo guardando que generando.
+        """
+        self._sin_persistir = True
+        if time.monotonic() - self._persistido >= INTERVALO_PERSISTENCIA:
+            self._persistir()
+
+    def persistir(self):
+        """Guarda en disco los lotes agregados desde la última escritura (nada en memoria)."""
+        with self._cerrojo:
+            if self._sin_persistir:
+                self._persistir()
+
+    def agregar(self, lanzamientos_dados: np.ndarray, guardar: bool = True):
+        """Agrega un lote de lanzamientos (matriz lanzamientos x num_dados).
+
+        Con guardar=False solo se actualizan índices, estadísticas y convergencia.
+        """
+        with self._cerrojo:
+            caras = np.asarray(lanzamientos_dados, dtype=np.uint8).reshape(-1, self.num_dados)
+            seises = np.count_nonzero(caras == self.num_caras, axis=1)
+            if guardar:
+                self.caras.append(caras)
+                self.seises.append(seises)
+            else:
+                self.lanzamientos_agregados += len(caras)
+            if self.indice_conjunto is not None:
+                codigos = (caras.astype(np.int32) - 1) @ self._pesos_codigo
+                self.indice_conjunto = self.indice_conjunto + np.bincount(codigos, minlength=self.num_resultados)
+            self.indice_caras = self.indice_caras + np.bincount(caras.ravel(), minlength=self.num_caras + 1)
+            self.indice_seises = self.indice_seises + np.bincount(seises, minlength=self.num_dados + 1)
+            sumas = caras.sum(axis=1, dtype=self._dtype_sumas)
+            self.indice_sumas = self.indice_sumas + np.bincount(sumas, minlength=len(self.indice_sumas))
+            self.estadisticas.agregar(caras if self.num_dados == 1 else seises)
+            self.convergencia.agregar(caras if self.num_dados == 1 else seises)
+            self._publicar()
+            self._persistir_periodico()
+
+    def agregar_conteos(self, conteos_conjuntos: np.ndarray):
+        """Suma un histograma de resultados conjuntos (longitud caras^n) sin guardar lanzamientos."""
+        with self._cerrojo:
+            conteos_conjuntos = np.asarray(conteos_conjuntos, dtype=np.int64)
+            self.indice_conjunto = self.indice_conjunto + conteos_conjuntos
+            self.indice_sumas = self.indice_sumas + self._sumas_desde_conjunto(conteos_conjuntos)
+            self.agregar_marginales(self._caras_desde_conjunto(conteos_conjuntos),
+                                    self._seises_desde_conjunto(conteos_conjuntos))
+
+    def agregar_marginales(self, conteos_caras: np.ndarray, conteos_seises: np.ndarray):
+        """Suma conteos por cara (índice = cara) y por número de seises sin guardar lanzamientos.
+
+        Es lo que se agrega cuando no hay índice conjunto; no actualiza
+        indice_conjunto ni indice_sumas (la suma no se deduce de los marginales).
+        """
+        with self._cerrojo:
+            conteos_caras = np.asarray(conteos_caras, dtype=np.int64)
+            conteos_seises = np.asarray(conteos_seises, dtype=np.int64)
+            self.indice_caras = self.indice_caras + conteos_caras
+            self.indice_seises = self.indice_seises + conteos_seises
+            self.lanzamientos_agregados += int(conteos_seises.sum())
+            valores = conteos_caras if self.num_dados == 1 else conteos_seises
+            self.estadisticas.agregar_conteos(valores)
+            self.convergencia.agregar_conteos(valores)
+            self._publicar()
+            self._persistir_periodico()
+
+    def _publicar(self):
+        # Una asignación: los lectores ven la versión anterior o esta, nunca una mezcla
+        self._version = VersionAlmacen(self)
+
+    def version(self) -> "VersionAlmacen":
+        """Último estado completo publicado; se puede leer desde otro hilo mientras se agrega."""
+        return self._version
+
+    @property
+    def nbytes(self) -> int:
+        return self.caras.nbytes + self.seises.nbytes
+
+    @property
+    def en_disco(self) -> bool:
+        return self.directorio is not None
+
+    def importar_estado(self, meta: Dict, arreglos: Dict[str, np.ndarray], caras: np.ndarray, seises: np.ndarray):
+        """Reemplaza el contenido por el de exportar_estado; caras/seises pueden ser memmaps."""
+        with self._cerrojo:
+            self.limpiar()
+            # append copia bloque a bloque, así un memmap no se lee entero de una vez
+            self.caras.append(caras)
+            self.seises.append(seises)
+            self._restaurar_indices(meta, arreglos)
+            self._publicar()
+            self._persistir()
+
+    def _restaurar_indices(self, meta: Dict, arreglos):
+        if self.indice_conjunto is not None:
+            self.indice_conjunto = np.array(arreglos['indice_conjunto'], dtype=np.int64)
+        self.indice_caras = np.array(arreglos['indice_caras'], dtype=np.int64)
+        self.indice_seises = np.array(arreglos['indice_seises'], dtype=np.int64)
+        if 'indice_sumas' in arreglos:
+            self.indice_sumas = np.array(arreglos['indice_sumas'], dtype=np.int64)
+        elif self.indice_conjunto is not None:
+            # Exportaciones anteriores al índice de sumas: se deduce del histograma conjunto
+            self.indice_sumas = self._sumas_desde_conjunto(self.indice_conjunto)
+        self.lanzamientos_agregados = meta['lanzamientos_agregados']
+        self.estadisticas.conteos = np.array(arreglos['conteos_valores'], dtype=np.int64)
+        self.estadisticas.n = meta['estadisticas']['n']
+        self.estadisticas.media = meta['estadisticas']['media']
+        self.estadisticas.m2 = meta['estadisticas']['m2']
+        # Los almacenes anteriores a la trayectoria solo conservan el punto final
+        vacio = np.zeros(0, dtype=np.int64)
+        self.convergencia.restaurar(arreglos['convergencia_lanzamientos'] if 'convergencia_lanzamientos' in arreglos else vacio,
+                                    arreglos['convergencia_conteos'] if 'convergencia_conteos' in arreglos else vacio,
+                                    self.estadisticas.conteos)
+
+    def limpiar(self):
+        with self._cerrojo:
+            self.caras.limpiar()
+            self.seises.limpiar()
+            if self.indice_conjunto is not None:
+                self.indice_conjunto = np.zeros_like(self.indice_conjunto)
+            self.indice_caras = np.zeros_like(self.indice_caras)
+            self.indice_seises = np.zeros_like(self.indice_seises)
+            self.indice_sumas = np.zeros_like(self.indice_sumas)
+            self.lanzamientos_agregados = 0
+            self.estadisticas.limpiar()
+            self.convergencia.limpiar()
+            self._publicar()
+            self._persistir()
+
+
+class VersionAlmacen(_LecturaAlmacen):
+    """Estado inmutable de un ResultStore tal como quedó tras una escritura completa.
+
+    Crearla es O(1): comparte los bloques de lanzamientos (congelados en su
+    longitud) y los índices de conteo, que el almacén nunca modifica en el
+    sitio. Ofrece las mismas consultas que ResultStore.
+    """
+
+    def __init__(self, store: ResultStore):
+        self.especificacion = store.especificacion
+        self.num_dados = store.num_dados
+        self.num_resultados = store.num_resultados
+        self._pesos_codigo = store._pesos_codigo
+        self._caras_por_resultado = store._caras_por_resultado
+        self._suma_por_resultado = store._suma_por_resultado
+        self.caras = store.caras.congelar()
+        self.seises = store.seises.congelar()
+        self.indice_conjunto = store.indice_conjunto
+        self.indice_caras = store.indice_caras
+        self.indice_seises = store.indice_seises
+        self.indice_sumas = store.indice_sumas
+        self.lanzamientos_agregados = store.lanzamientos_agregados
+        # Copias superficiales: acumulador y trayectoria reemplazan sus arreglos al agregar
+        self.estadisticas = copy.copy(store.estadisticas)
+        self.convergencia = copy.copy(store.convergencia)
+
+    def version(self) -> "VersionAlmacen":
+        return self
+
+
+class DetalleLanzamientos:
+    """Vista perezosa con el formato de dict por lanzamiento de resultados_detallados."""
+
+    def __init__(self, store: _LecturaAlmacen):
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __bool__(self) -> bool:
+        return len(self._store) > 0
+
+    def __getitem__(self, indice: Union[int, slice]):
+        if isinstance(indice, slice):
+            return [self._store.detalle(i) for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("índice fuera de rango")
+        return self._store.detalle(indice)
+
+    def __iter__(self):
+        inicio = 0
+        for caras, seises in zip(self._store.caras.iter_bloques(), self._store.seises.iter_bloques()):
+            for i, (dados, n_seises) in enumerate(zip(caras.tolist(), seises.tolist())):
+                yield {'lanzamiento': inicio + i + 1, 'dados': dados, 'seises': n_seises}
+            inicio += len(seises)
@@ -0,0 +1,69 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+
+from result_store import TAMANO_BLOQUE
+from especificacion import EspecificacionDados, como_especificacion
+from generadores import GENERADOR_POR_DEFECTO, crear_generador
+
+
+# Lanzamientos por fragmento. Fijo (no depende del número de procesos) para
+# que la misma semilla dé siempre los mismos fragmentos y el mismo resultado.
+TAMANO_FRAGMENTO = 1 << 24
+
+
+def _simular_fragmento(semilla: np.random.SeedSequence, lanzamientos: int, especificacion: EspecificacionDados,
+                       generador_bits: str = GENERADOR_POR_DEFECTO) -> np.ndarray:
+    """Histograma de resultados conjuntos de un fragmento, generado por bloques.
+
+    Se ejecuta en los procesos hijos: solo importa numpy y devuelve caras^n
+    contadores en lugar de los lanzamientos.
+    """
+    rng = crear_generador(semilla, generador_bits)
+    num_resultados = especificacion.num_resultados
+    conteos = np.zeros(num_resultados, dtype=np.int64)
+    for inicio in range(0, lanzamientos, TAMANO_BLOQUE):
+        n = min(TAMANO_BLOQUE, lanzamientos - inicio)
+        # Un código de resultado conjunto (base `caras`) equivale a n dados independientes
+        codigos = especificacion.muestrear_codigos(rng, n)
+        conteos += np.bincount(codigos, minlength=num_resultados)
+    return conteos
+
+
+def dividir_fragmentos(lanzamientos: int, tamano_fragmento: int = TAMANO_FRAGMENTO) -> List[int]:
+    """Tamaños de los fragmentos en que se reparte una simulación."""
+    completos, resto = divmod(lanzamientos, tamano_fragmento)
+    return [tamano_fragmento] * completos + ([resto] if resto else [])
+
+
+def simular_conteos_paralelo(lanzamientos: int, dados, semilla: np.random.SeedSequence,
+                             procesos: Optional[int] = None,
+                             tamano_fragmento: int = TAMANO_FRAGMENTO,
+                             generador_bits: str = GENERADOR_POR_DEFECTO) -> np.ndarray:
+    """Simula en paralelo y devuelve el histograma conjunto fusionado.
+
+    Cada fragmento recibe su propio flujo de semilla.spawn(); como la suma de
+    conteos es exacta y no depende del orden, el resultado es idéntico bit a
+    bit con cualquier número de procesos. `dados` es un número de dados de 6
+    caras o una EspecificacionDados con índice conjunto.
+    """
+    especificacion = como_especificacion(dados)
+    if not especificacion.con_indice_conjunto:
+        raise ValueError(f"{especificacion}: demasiados resultados conjuntos para el modo paralelo")
+    tamanos = dividir_fragmentos(lanzamientos, tamano_fragmento)
+    semillas = semilla.spawn(len(tamanos))
+    procesos = min(procesos or os.cpu_count() or 1, len(tamanos))
+    conteos = np.zeros(especificacion.num_resultados, dtype=np.int64)
+
+    if procesos <= 1:
+        for hija, n in zip(semillas, tamanos):
+            conteos += _simular_fragmento(hija, n, especificacion, generador_bits)
+        return conteos
+
+    with ProcessPoolExecutor(max_workers=procesos) as executor:
+        for parcial in executor.map(_simular_fragmento, semillas, tamanos, [especificacion] * len(tamanos),
+                                    [generador_bits] * len(tamanos)):
+            conteos += parcial
+    return conteos